@@ -1,3 +1,28 @@
-from aocpy.puzzle import Puzzle
-from aocpy.generate import generate_day
-from aocpy.templates.cli import input_cli
+import importlib
+
+# Public names are imported on first access (PEP 562) so that importing one of
+# them, e.g. `from aocpy import input_cli` in a solution, does not also import
+# the heavier network and parsing dependencies used by the others.
+_LAZY_ATTRS = {
+    "Puzzle": "aocpy.puzzle",
+    "generate_day": "aocpy.generate",
+    "input_cli": "aocpy.templates.cli",
+    "InputFile": "aocpy.loader",
+    "LineStream": "aocpy.stream",
+}
+
+__all__ = list(_LAZY_ATTRS)
+
+
+def __getattr__(name):
+    try:
+        module = _LAZY_ATTRS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,192 @@
+""" Asynchronous counterparts of `aocpy.web` and `get_puzzle_input`.
+
+Built on aiohttp, which is an optional dependency: install it with
+`pip install aocpy[async]`. Sessions must be created and used from within a
+running event loop.
+"""
+import asyncio
+import logging
+import time
+from typing import Optional, Tuple, Union
+
+from aocpy import metrics, web
+from aocpy.cache import InputCache, get_cache
+from aocpy.exception import AocpyException
+from aocpy.httpcache import HTTPCache, default_http_cache
+from aocpy.puzzle import Puzzle
+from aocpy.utils import account_key
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONCURRENCY = 10
+KEEPALIVE_TIMEOUT = 30
+
+
+class AsyncAuthSession:
+    """ Authenticated aiohttp session for adventofcode.com.
+
+    At most `concurrency` requests are in flight at once and every request is
+    first scheduled by `limiter`. Connections are kept alive and re-used, and a
+    `connector` may be shared between sessions for different accounts. Pages
+    changed by a submission are invalidated in `http_cache`, which is shared
+    with the synchronous sessions.
+    """
+
+    def __init__(
+        self,
+        session_cookie: str,
+        limiter: web.RateLimiter,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        connector: Optional["aiohttp.BaseConnector"] = None,
+        http_cache: Optional[HTTPCache] = None,
+    ):
+        if aiohttp is None:
+            raise AocpyException("aiohttp is required, install it with aocpy[async]")
+        self.limiter = limiter
+        self.http_cache = http_cache
+        self.account_key = account_key(session_cookie)
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._session = aiohttp.ClientSession(
+            cookies={"session": session_cookie},
+            connector=connector
+            or aiohttp.TCPConnector(
+                limit=concurrency, keepalive_timeout=KEEPALIVE_TIMEOUT
+            ),
+            connector_owner=connector is None,
+        )
+
+    async def request(self, method: str, url: str, **kwargs) -> Tuple[int, str, str]:
+        """ Returns the status code, text and final URL of the response.
+        """
+        endpoint = metrics.endpoint(url)
+        loop = asyncio.get_running_loop()
+        async with self._semaphore:
+            # The limiter locks its state file, which may block
+            delay = await loop.run_in_executor(None, self.limiter.reserve)
+            if delay:
+                logger.info(f"rate limited, waiting {delay:.2f}s")
+                metrics.inc(metrics.RATE_LIMIT_WAIT, delay, endpoint=endpoint)
+                await asyncio.sleep(delay)
+            start = time.perf_counter()
+            try:
+                async with self._session.request(method, url, **kwargs) as r:
+                    body = await r.read()
+                    text = body.decode(r.get_encoding())
+            except aiohttp.ClientError:
+                metrics.inc(metrics.RESPONSES, endpoint=endpoint, status="error")
+                raise
+            finally:
+                metrics.observe(
+                    metrics.REQUEST_DURATION,
+                    time.perf_counter() - start,
+                    endpoint=endpoint,
+                    method=method.upper(),
+                )
+            metrics.inc(metrics.RESPONSES, endpoint=endpoint, status=str(r.status))
+            metrics.inc(metrics.RESPONSE_BYTES, len(body), endpoint=endpoint)
+            return r.status, text, str(r.url)
+
+    async def close(self):
+        await self._session.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+
+def session(
+    session_cookie: str,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    limiter: Optional[web.RateLimiter] = None,
+    connector: Optional["aiohttp.BaseConnector"] = None,
+    http_cache: Optional[HTTPCache] = None,
+) -> AsyncAuthSession:
+    """ Create an asynchronous authenticated session for adventofcode.com.
+    `limiter` defaults to `web.default_rate_limiter()` and `http_cache` to
+    `default_http_cache()`.
+    """
+    return AsyncAuthSession(
+        session_cookie,
+        limiter or web.default_rate_limiter(),
+        concurrency,
+        connector,
+        http_cache or default_http_cache(),
+    )
+
+
+def _ok(status: int) -> bool:
+    # Redirects are followed, as by requests, so the final response of a
+    # successful request is never a 3xx
+    return 200 <= status < 300
+
+
+async def fetch_puzzle_input(session: AsyncAuthSession, puzzle_url: str) -> str:
+    status, text, _ = await session.request("GET", puzzle_url + "/input")
+    if not _ok(status):
+        msg = f"got {status} fetching {puzzle_url}"
+        logger.error(msg)
+        logger.error(text)
+        raise AocpyException(msg)
+
+    return text.rstrip("\r\r")
+
+
+async def submit_answer(
+    session: AsyncAuthSession, puzzle_url: str, answer: str, level: Union[int, str],
+) -> Tuple[str, str]:
+    """ Asynchronous `web.submit_answer`. The response text can be checked with
+    `check_submission_response_text`. Like the rate limiter, the submission
+    cooldown is read and written in the default executor.
+    """
+    if level not in [1, 2, "1", "2"]:
+        raise ValueError("Submit level must be 1 or 2")
+    loop = asyncio.get_running_loop()
+    wait = await loop.run_in_executor(
+        None, session.limiter.cooldown, session.account_key
+    )
+    if wait:
+        logger.info(f"waiting {wait:.0f}s for submission cooldown")
+        await asyncio.sleep(wait)
+    status, text, url = await session.request(
+        "POST", puzzle_url + "/answer", data={"level": str(level), "answer": answer}
+    )
+    if not _ok(status):
+        logger.error(f"got {status} status code")
+        logger.error(text)
+        raise AocpyException(f"Non-200 response for POST: {status}")
+    # A correct answer changes the puzzle page, i.e. part 2 is unlocked
+    await loop.run_in_executor(
+        None, session.http_cache.invalidate, session.account_key, puzzle_url
+    )
+    wait = web.parse_wait_time(text)
+    if wait is not None:
+        await loop.run_in_executor(
+            None, session.limiter.set_cooldown, session.account_key, wait
+        )
+    return text, url
+
+
+async def get_puzzle_input(
+    session: AsyncAuthSession, puzzle: Puzzle, cache: Optional[InputCache] = None
+) -> str:
+    """ Asynchronous `puzzle.get_puzzle_input`. Cache access runs in the
+    default executor so that it does not block the event loop.
+    """
+    loop = asyncio.get_running_loop()
+    if cache is None:
+        cache = await loop.run_in_executor(None, get_cache)
+    puzzle_input = await loop.run_in_executor(None, cache.get, puzzle)
+    if puzzle_input is None:
+        metrics.inc(metrics.CACHE_LOOKUPS, cache="input", result="miss")
+        puzzle_input = await fetch_puzzle_input(session, puzzle.url)
+        await loop.run_in_executor(None, cache.put, puzzle, puzzle_input)
+    else:
+        metrics.inc(metrics.CACHE_LOOKUPS, cache="input", result="hit")
+    return puzzle_input
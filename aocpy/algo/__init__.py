@@ -0,0 +1,31 @@
+""" Grid, graph search and interval primitives for solutions.
+"""
+from aocpy.algo.grid import DIAGONAL, ORTHOGONAL, Grid
+from aocpy.algo.intervals import IntervalSet
+from aocpy.algo.search import (
+    astar,
+    bfs,
+    bits,
+    bitset_bfs,
+    bitset_distance,
+    dijkstra,
+    flood_fill,
+    grid_bfs,
+    grid_mask,
+)
+
+__all__ = [
+    "DIAGONAL",
+    "ORTHOGONAL",
+    "Grid",
+    "IntervalSet",
+    "astar",
+    "bfs",
+    "bits",
+    "bitset_bfs",
+    "bitset_distance",
+    "dijkstra",
+    "flood_fill",
+    "grid_bfs",
+    "grid_mask",
+]
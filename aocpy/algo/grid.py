@@ -0,0 +1,158 @@
+from typing import Iterable, Iterator, List, Optional, Tuple, Union
+
+from aocpy.exception import AocpyException
+from aocpy.loader import InputFile
+from aocpy.stream import LineStream
+
+Rows = Union[InputFile, LineStream, Iterable[Union[str, bytes, memoryview]]]
+
+# (dx, dy) of the orthogonal neighbours, then the diagonal neighbours
+ORTHOGONAL = ((1, 0), (0, 1), (-1, 0), (0, -1))
+DIAGONAL = ((1, 1), (-1, 1), (-1, -1), (1, -1))
+
+
+class Grid:
+    """ Rectangular grid of byte values stored row by row in a flat
+    `bytearray`, i.e. `grid[x, y] == ord("#")`.
+
+    Cells are also addressed by their flat index `y * width + x`, which avoids
+    creating a tuple per cell in hot loops such as searches.
+    """
+
+    __slots__ = ("width", "height", "cells")
+
+    def __init__(self, width: int, height: int, cells: Optional[bytearray] = None):
+        if cells is None:
+            cells = bytearray(width * height)
+        elif len(cells) != width * height:
+            raise AocpyException(f"expected {width * height} cells, got {len(cells)}")
+        self.width = width
+        self.height = height
+        self.cells = cells
+
+    @classmethod
+    def from_input(cls, rows: Rows) -> "Grid":
+        """ Create a grid from the non-empty rows of an `InputFile`, a
+        `LineStream` or any iterable of rows.
+        """
+        if isinstance(rows, (InputFile, LineStream)):
+            rows = rows.raw_lines()
+        cells = bytearray()
+        width = None
+        height = 0
+        for row in rows:
+            row = row.encode() if isinstance(row, str) else row
+            if not len(row):
+                continue
+            if width is None:
+                width = len(row)
+            elif len(row) != width:
+                raise AocpyException("grid rows must all be the same length")
+            cells += row
+            height += 1
+        return cls(width or 0, height, cells)
+
+    @classmethod
+    def filled(cls, width: int, height: int, value: int = 0) -> "Grid":
+        return cls(width, height, bytearray([value]) * (width * height))
+
+    def copy(self) -> "Grid":
+        return Grid(self.width, self.height, bytearray(self.cells))
+
+    def index(self, x: int, y: int) -> int:
+        return y * self.width + x
+
+    def xy(self, i: int) -> Tuple[int, int]:
+        y, x = divmod(i, self.width)
+        return x, y
+
+    def __contains__(self, xy: Tuple[int, int]) -> bool:
+        x, y = xy
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def __getitem__(self, xy: Tuple[int, int]) -> int:
+        x, y = xy
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            raise IndexError(f"{xy} is outside the grid")
+        return self.cells[y * self.width + x]
+
+    def __setitem__(self, xy: Tuple[int, int], value: int):
+        x, y = xy
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            raise IndexError(f"{xy} is outside the grid")
+        self.cells[y * self.width + x] = value
+
+    def __len__(self) -> int:
+        return len(self.cells)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Grid):
+            return NotImplemented
+        return self.width == other.width and self.cells == other.cells
+
+    def neighbours(self, i: int, diagonal: bool = False) -> List[int]:
+        """ Returns the flat indices of the cells adjacent to the cell at flat
+        index `i`, orthogonal neighbours first.
+        """
+        w = self.width
+        x = i % w
+        east = x + 1 < w
+        south = i + w < len(self.cells)
+        result = []
+        if east:
+            result.append(i + 1)
+        if south:
+            result.append(i + w)
+        if x:
+            result.append(i - 1)
+        if i >= w:
+            result.append(i - w)
+        if diagonal:
+            if south:
+                if east:
+                    result.append(i + w + 1)
+                if x:
+                    result.append(i + w - 1)
+            if i >= w:
+                if x:
+                    result.append(i - w - 1)
+                if east:
+                    result.append(i - w + 1)
+        return result
+
+    def find(self, value: int) -> int:
+        """ Returns the flat index of the first cell containing `value`, or -1.
+        """
+        return self.cells.find(bytes([value]))
+
+    def find_all(self, value: int) -> Iterator[int]:
+        target = bytes([value])
+        i = self.cells.find(target)
+        while i != -1:
+            yield i
+            i = self.cells.find(target, i + 1)
+
+    def count(self, value: int) -> int:
+        return self.cells.count(bytes([value]))
+
+    def rows(self) -> Iterator[memoryview]:
+        view = memoryview(self.cells)
+        for y in range(self.height):
+            yield view[y * self.width : (y + 1) * self.width]
+
+    def to_numpy(self):
+        """ Returns a 2-D `uint8` array sharing the grid's memory, indexed as
+        `array[y, x]`.
+        """
+        from aocpy.parse import _require_numpy, np
+
+        _require_numpy()
+        return np.frombuffer(self.cells, dtype=np.uint8).reshape(
+            self.height, self.width
+        )
+
+    def __str__(self) -> str:
+        return "\n".join(str(row, "utf-8") for row in self.rows())
+
+    def __repr__(self) -> str:
+        return f"Grid(width={self.width}, height={self.height})"
@@ -0,0 +1,76 @@
+from bisect import bisect_left, bisect_right
+from typing import Iterable, Iterator, List, Tuple
+
+
+class IntervalSet:
+    """ Set of integers stored as sorted, disjoint half-open intervals
+    `[start, stop)`, so that large ranges take constant space.
+    """
+
+    __slots__ = ("_starts", "_stops")
+
+    def __init__(self, intervals: Iterable[Tuple[int, int]] = ()):
+        self._starts: List[int] = []
+        self._stops: List[int] = []
+        for start, stop in intervals:
+            self.add(start, stop)
+
+    def add(self, start: int, stop: int):
+        """ Add the integers in `[start, stop)`, merging it with any overlapping
+        or adjacent intervals.
+        """
+        if start >= stop:
+            return
+        # Intervals [lo, hi) touch the new interval
+        lo = bisect_left(self._stops, start)
+        hi = bisect_right(self._starts, stop)
+        if lo < hi:
+            start = min(start, self._starts[lo])
+            stop = max(stop, self._stops[hi - 1])
+        self._starts[lo:hi] = [start]
+        self._stops[lo:hi] = [stop]
+
+    def remove(self, start: int, stop: int):
+        """ Remove the integers in `[start, stop)`.
+        """
+        if start >= stop:
+            return
+        # Intervals [lo, hi) overlap the removed interval
+        lo = bisect_right(self._stops, start)
+        hi = bisect_left(self._starts, stop)
+        if lo >= hi:
+            return
+        starts, stops = [], []
+        if self._starts[lo] < start:
+            starts.append(self._starts[lo])
+            stops.append(start)
+        if self._stops[hi - 1] > stop:
+            starts.append(stop)
+            stops.append(self._stops[hi - 1])
+        self._starts[lo:hi] = starts
+        self._stops[lo:hi] = stops
+
+    def __contains__(self, x: int) -> bool:
+        i = bisect_right(self._starts, x) - 1
+        return i >= 0 and x < self._stops[i]
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        return zip(self._starts, self._stops)
+
+    def __len__(self) -> int:
+        """ Returns the number of intervals.
+        """
+        return len(self._starts)
+
+    def size(self) -> int:
+        """ Returns the number of integers in the set.
+        """
+        return sum(stop - start for start, stop in self)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, IntervalSet):
+            return NotImplemented
+        return list(self) == list(other)
+
+    def __repr__(self) -> str:
+        return f"IntervalSet({list(self)!r})"
@@ -0,0 +1,208 @@
+import heapq
+from array import array
+from collections import deque
+from itertools import count
+from typing import (
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+from aocpy.algo.grid import Grid
+
+Node = TypeVar("Node", bound=Hashable)
+Neighbours = Callable[[Node], Iterable[Node]]
+WeightedNeighbours = Callable[[Node], Iterable[Tuple[Node, float]]]
+
+
+def bfs(
+    start: Node, neighbours: Neighbours, goal: Optional[Node] = None
+) -> Dict[Node, int]:
+    """ Returns the number of steps from `start` to each reachable node, or to
+    the nodes up to `goal` if given.
+    """
+    dist = {start: 0}
+    queue = deque([start])
+    while queue:
+        node = queue.popleft()
+        if node == goal:
+            break
+        d = dist[node] + 1
+        for n in neighbours(node):
+            if n not in dist:
+                dist[n] = d
+                queue.append(n)
+    return dist
+
+
+def dijkstra(
+    start: Node, neighbours: WeightedNeighbours, goal: Optional[Node] = None
+) -> Dict[Node, float]:
+    """ Returns the cost of the cheapest path from `start` to each reachable
+    node, or to the nodes settled before `goal` if given. Costs must not be
+    negative.
+    """
+    dist = {start: 0}
+    done = set()
+    # The counter breaks ties so that nodes themselves are never compared
+    tie = count()
+    heap = [(0, next(tie), start)]
+    while heap:
+        d, _, node = heapq.heappop(heap)
+        if node in done:
+            continue
+        done.add(node)
+        if node == goal:
+            break
+        for n, cost in neighbours(node):
+            nd = d + cost
+            if nd < dist.get(n, nd + 1):
+                dist[n] = nd
+                heapq.heappush(heap, (nd, next(tie), n))
+    return {node: dist[node] for node in done} if goal is not None else dist
+
+
+def astar(
+    start: Node,
+    goal: Node,
+    neighbours: WeightedNeighbours,
+    heuristic: Callable[[Node], float],
+) -> Optional[float]:
+    """ Returns the cost of the cheapest path from `start` to `goal`, or None if
+    there is none. `heuristic` must never overestimate the remaining cost.
+    """
+    dist = {start: 0}
+    tie = count()
+    heap = [(heuristic(start), next(tie), 0, start)]
+    while heap:
+        _, _, d, node = heapq.heappop(heap)
+        if node == goal:
+            return d
+        if d > dist[node]:
+            continue
+        for n, cost in neighbours(node):
+            nd = d + cost
+            if nd < dist.get(n, nd + 1):
+                dist[n] = nd
+                heapq.heappush(heap, (nd + heuristic(n), next(tie), nd, n))
+    return None
+
+
+def grid_bfs(grid: Grid, start: int, passable: bytes, goal: int = -1) -> array:
+    """ Returns the number of steps from the cell at flat index `start` to each
+    cell of `grid`, moving between orthogonally adjacent cells containing a
+    byte value in `passable`. Unreachable cells, and cells not reached before
+    `goal` if given, are -1.
+    """
+    w = grid.width
+    size = len(grid)
+    cells = grid.cells
+    ok = bytes(b in passable for b in range(256))
+    dist = array("l", [-1]) * size
+    dist[start] = 0
+    queue = deque([start])
+    pop, push = queue.popleft, queue.append
+    while queue:
+        i = pop()
+        if i == goal:
+            break
+        d = dist[i] + 1
+        x = i % w
+        # Unrolled, this loop dominates the search
+        j = i + 1
+        if x + 1 < w and dist[j] < 0 and ok[cells[j]]:
+            dist[j] = d
+            push(j)
+        j = i + w
+        if j < size and dist[j] < 0 and ok[cells[j]]:
+            dist[j] = d
+            push(j)
+        j = i - 1
+        if x and dist[j] < 0 and ok[cells[j]]:
+            dist[j] = d
+            push(j)
+        j = i - w
+        if j >= 0 and dist[j] < 0 and ok[cells[j]]:
+            dist[j] = d
+            push(j)
+    return dist
+
+
+def grid_mask(grid: Grid, passable: bytes) -> int:
+    """ Returns a bitset of the cells of `grid` containing any of the byte
+    values in `passable`, where bit `i` is the cell at flat index `i`.
+    """
+    table = bytes(ord("1") if b in passable else ord("0") for b in range(256))
+    digits = grid.cells.translate(table)
+    # The first cell is the least significant bit
+    digits.reverse()
+    return int(digits, 2) if digits else 0
+
+
+def bitset_bfs(grid: Grid, starts: Iterable[int], passable: bytes) -> Iterator[int]:
+    """ Yields the bitset of cells first reached at each step of a breadth first
+    search of `grid` from the cells at flat indices `starts`, moving between
+    orthogonally adjacent cells containing a byte value in `passable`.
+
+    Each step expands the whole frontier with a few shifts of arbitrary
+    precision integers, so is much faster than visiting cells one at a time.
+    """
+    width = grid.width
+    open_cells = grid_mask(grid, passable)
+    cells = (1 << len(grid)) - 1
+    # Cells which may be moved to east or west without wrapping between rows
+    first_col = int(("0" * (width - 1) + "1") * grid.height or "0", 2)
+    not_first = cells & ~first_col
+    not_last = cells & ~(first_col << (width - 1))
+    frontier = 0
+    for i in starts:
+        frontier |= 1 << i
+    seen = frontier
+    while frontier:
+        yield frontier
+        frontier = (
+            (
+                ((frontier << 1) & not_first)
+                | ((frontier >> 1) & not_last)
+                | (frontier << width)
+                | (frontier >> width)
+            )
+            & open_cells
+            & ~seen
+        )
+        seen |= frontier
+
+
+def bitset_distance(grid: Grid, start: int, goal: int, passable: bytes) -> int:
+    """ Returns the number of steps between the cells at flat indices `start`
+    and `goal`, or -1 if `goal` is unreachable.
+    """
+    for steps, frontier in enumerate(bitset_bfs(grid, [start], passable)):
+        if frontier >> goal & 1:
+            return steps
+    return -1
+
+
+def flood_fill(grid: Grid, start: int, passable: bytes) -> int:
+    """ Returns the bitset of cells reachable from the cell at flat index
+    `start`, including itself.
+    """
+    reached = 0
+    for frontier in bitset_bfs(grid, [start], passable):
+        reached |= frontier
+    return reached
+
+
+def bits(bitset: int) -> Iterator[int]:
+    """ Yields the index of each set bit, e.g. the flat indices of the cells in
+    a bitset from `bitset_bfs`.
+    """
+    while bitset:
+        low = bitset & -bitset
+        yield low.bit_length() - 1
+        bitset ^= low
@@ -0,0 +1,128 @@
+import sqlite3
+import threading
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from aocpy.puzzle import CORRECT, INCORRECT, TOO_HIGH, TOO_LOW, Puzzle
+from aocpy.utils import account_key, get_config_dir
+
+ANSWERS_FNAME = "answers.sqlite3"
+
+
+def _as_int(answer: str) -> Optional[int]:
+    try:
+        return int(answer)
+    except ValueError:
+        return None
+
+
+class AnswerStore:
+    """ Local record of submitted answers per account, puzzle and level, used
+    to avoid submitting answers whose outcome is already known.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS answers (
+        account TEXT NOT NULL,
+        year INTEGER NOT NULL,
+        day INTEGER NOT NULL,
+        level INTEGER NOT NULL,
+        answer TEXT NOT NULL,
+        correct INTEGER NOT NULL,
+        hint TEXT,
+        PRIMARY KEY (account, year, day, level, answer)
+    );
+    """
+
+    def __init__(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(path), timeout=30, check_same_thread=False)
+        self._db.executescript(self.SCHEMA)
+
+    @classmethod
+    def default(cls) -> "AnswerStore":
+        return cls(get_config_dir() / ANSWERS_FNAME)
+
+    @staticmethod
+    def _key(puzzle: Puzzle, level: int) -> Tuple[str, int, int, int]:
+        return account_key(puzzle.session_cookie), puzzle.year, puzzle.day, level
+
+    def record(
+        self,
+        puzzle: Puzzle,
+        level: int,
+        answer: str,
+        correct: bool,
+        hint: Optional[str] = None,
+    ):
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO answers VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (*self._key(puzzle, level), answer, int(correct), hint),
+            )
+
+    def _answers(self, key: Tuple[str, int, int, int]) -> List[tuple]:
+        with self._lock:
+            return self._db.execute(
+                "SELECT answer, correct, hint FROM answers "
+                "WHERE account = ? AND year = ? AND day = ? AND level = ?",
+                key,
+            ).fetchall()
+
+    def accounts(self, year: int) -> List[str]:
+        """ Returns the key of each account with answers recorded for `year`.
+        """
+        with self._lock:
+            return [
+                account
+                for account, in self._db.execute(
+                    "SELECT DISTINCT account FROM answers WHERE year = ? "
+                    "ORDER BY account",
+                    (year,),
+                )
+            ]
+
+    def correct_answer(self, puzzle: Puzzle, level: int) -> Optional[str]:
+        return self.account_correct_answer(self._key(puzzle, level))
+
+    def account_correct_answer(self, key: Tuple[str, int, int, int]) -> Optional[str]:
+        """ `correct_answer` by `(account key, year, day, level)`, for when the
+        session cookie itself is not known.
+        """
+        for answer, correct, _ in self._answers(key):
+            if correct:
+                return answer
+        return None
+
+    def check(self, puzzle: Puzzle, level: int, answer: str) -> Optional[str]:
+        """ Returns the known outcome of submitting `answer`, one of `CORRECT`,
+        `INCORRECT`, `TOO_HIGH` or `TOO_LOW`, or None if it is unknown.
+        """
+        return self.account_check(self._key(puzzle, level), answer)
+
+    def account_check(
+        self, key: Tuple[str, int, int, int], answer: str
+    ) -> Optional[str]:
+        """ `check` by `(account key, year, day, level)`, for when the session
+        cookie itself is not known.
+        """
+        rows = self._answers(key)
+        for known, correct, hint in rows:
+            if correct:
+                return CORRECT if answer == known else INCORRECT
+            if answer == known:
+                return hint or INCORRECT
+        value = _as_int(answer)
+        if value is None:
+            return None
+        for known, _, hint in rows:
+            bound = _as_int(known)
+            if bound is None:
+                continue
+            if hint == TOO_HIGH and value >= bound:
+                return TOO_HIGH
+            if hint == TOO_LOW and value <= bound:
+                return TOO_LOW
+        return None
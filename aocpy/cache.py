@@ -0,0 +1,335 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, List, Optional
+
+from aocpy.exception import AocpyException
+from aocpy.utils import account_key, atomic_write
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+if TYPE_CHECKING:  # pragma: no cover
+    from aocpy.puzzle import Puzzle
+
+GLOBAL_CACHE_DIR = "~/.config/aocd"
+SQLITE_FNAME = "inputs.sqlite3"
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    entries: int
+    blobs: int
+    raw_bytes: int
+    stored_bytes: int
+
+
+class InputCache(ABC):
+    """ Storage for puzzle inputs, keyed by puzzle.
+    """
+
+    @abstractmethod
+    def get(self, puzzle: "Puzzle") -> Optional[str]:
+        """ Returns the cached input for `puzzle`, or None if not cached.
+        """
+
+    @abstractmethod
+    def put(self, puzzle: "Puzzle", puzzle_input: str):
+        """ Store `puzzle_input` as the input for `puzzle`.
+        """
+
+    @abstractmethod
+    def __contains__(self, puzzle: "Puzzle") -> bool:
+        """ Whether the input for `puzzle` is cached, without reading it.
+        """
+
+    @abstractmethod
+    def stats(self) -> CacheStats:
+        """ Returns the number and size of the cached inputs.
+        """
+
+    @abstractmethod
+    def prune(self, max_bytes: int) -> int:
+        """ Evict least recently used inputs until the cache stores at most
+        `max_bytes`. Returns the number of evicted inputs.
+        """
+
+    @abstractmethod
+    def verify(self) -> List[str]:
+        """ Check the integrity of the cache. Returns a description of each
+        problem found.
+        """
+
+
+class FileCache(InputCache):
+    """ One plain text file per input at `Puzzle.input_fname`. The access time
+    of a file is set whenever it is read or written, and inputs are evicted by
+    it.
+    """
+
+    def __init__(self, root: str = GLOBAL_CACHE_DIR, max_bytes: Optional[int] = None):
+        self.root = Path(os.path.expanduser(root))
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def _touch(fname: str):
+        # Set explicitly, as file systems mounted with noatime or relatime
+        # don't reliably record reads
+        try:
+            os.utime(fname, (time.time(), os.stat(fname).st_mtime))
+        except FileNotFoundError:
+            pass
+
+    def get(self, puzzle):
+        try:
+            with open(puzzle.input_fname) as f:
+                puzzle_input = f.read()
+        except FileNotFoundError:
+            return None
+        self._touch(puzzle.input_fname)
+        return puzzle_input
+
+    def put(self, puzzle, puzzle_input):
+        os.makedirs(os.path.dirname(puzzle.input_fname), exist_ok=True)
+        atomic_write(puzzle.input_fname, puzzle_input)
+        self._touch(puzzle.input_fname)
+        if self.max_bytes is not None:
+            self.prune(self.max_bytes)
+
+    def __contains__(self, puzzle):
+        return os.path.isfile(puzzle.input_fname)
+
+    def _files(self) -> List[Path]:
+        return sorted(self.root.glob("*/[0-9][0-9][0-9][0-9]/[0-9][0-9].txt"))
+
+    def stats(self):
+        files = self._files()
+        size = sum(f.stat().st_size for f in files)
+        return CacheStats(len(files), len(files), size, size)
+
+    def prune(self, max_bytes):
+        # Other threads or processes may prune the same files concurrently
+        stats = []
+        for f in self._files():
+            try:
+                stats.append((f, f.stat()))
+            except FileNotFoundError:
+                pass
+        stats.sort(key=lambda f_st: f_st[1].st_atime)
+        total = sum(st.st_size for _, st in stats)
+        evicted = 0
+        for f, st in stats:
+            if total <= max_bytes:
+                break
+            total -= st.st_size
+            try:
+                f.unlink()
+            except FileNotFoundError:
+                continue
+            evicted += 1
+        return evicted
+
+    def verify(self):
+        problems = []
+        for f in self._files():
+            try:
+                if not f.read_text():
+                    problems.append(f"{f}: empty input")
+            except (OSError, UnicodeDecodeError) as err:
+                problems.append(f"{f}: {err}")
+        return problems
+
+
+def _compress(data: bytes):
+    if zstandard is not None:
+        return "zstd", zstandard.ZstdCompressor(level=19).compress(data)
+    return "zlib", zlib.compress(data, 9)
+
+
+def _decompress(codec: str, data: bytes) -> bytes:
+    if codec == "zlib":
+        return zlib.decompress(data)
+    if codec == "zstd":
+        if zstandard is None:
+            raise AocpyException("zstandard is required to read zstd cache entries")
+        return zstandard.ZstdDecompressor().decompress(data)
+    raise AocpyException(f"unknown cache codec {codec}")
+
+
+class SQLiteCache(InputCache):
+    """ Single file SQLite store of compressed inputs, de-duplicated by content
+    hash. Entries are evicted least recently used first whenever the stored
+    size exceeds `max_bytes` (if given).
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS blobs (
+        hash TEXT PRIMARY KEY,
+        codec TEXT NOT NULL,
+        data BLOB NOT NULL,
+        raw_size INTEGER NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS entries (
+        account TEXT NOT NULL,
+        year INTEGER NOT NULL,
+        day INTEGER NOT NULL,
+        hash TEXT NOT NULL REFERENCES blobs (hash),
+        accessed REAL NOT NULL,
+        PRIMARY KEY (account, year, day)
+    );
+    CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed);
+    """
+
+    def __init__(self, path: Path, max_bytes: Optional[int] = None):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(path), timeout=30, check_same_thread=False)
+        self._migrate()
+        self._db.executescript(self.SCHEMA)
+
+    def _migrate(self):
+        # Entries were keyed by the session cookie itself, which should not be
+        # stored in plain text
+        columns = [row[1] for row in self._db.execute("PRAGMA table_info(entries)")]
+        if "session_cookie" in columns:
+            self._db.create_function("account_key", 1, account_key)
+            with self._db:
+                self._db.execute(
+                    "ALTER TABLE entries RENAME COLUMN session_cookie TO account"
+                )
+                self._db.execute("UPDATE entries SET account = account_key(account)")
+            # Rewrites the file, dropping pages which still held the cookies
+            self._db.execute("VACUUM")
+
+    @staticmethod
+    def _key(puzzle):
+        return account_key(puzzle.session_cookie), puzzle.year, puzzle.day
+
+    def get(self, puzzle):
+        with self._lock, self._db:
+            row = self._db.execute(
+                "SELECT b.codec, b.data FROM entries e JOIN blobs b USING (hash) "
+                "WHERE e.account = ? AND e.year = ? AND e.day = ?",
+                self._key(puzzle),
+            ).fetchone()
+            if row is None:
+                return None
+            self._db.execute(
+                "UPDATE entries SET accessed = ? "
+                "WHERE account = ? AND year = ? AND day = ?",
+                (time.time(), *self._key(puzzle)),
+            )
+        return _decompress(*row).decode()
+
+    def put(self, puzzle, puzzle_input):
+        raw = puzzle_input.encode()
+        digest = hashlib.sha256(raw).hexdigest()
+        codec, data = _compress(raw)
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR IGNORE INTO blobs (hash, codec, data, raw_size) "
+                "VALUES (?, ?, ?, ?)",
+                (digest, codec, data, len(raw)),
+            )
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)",
+                (*self._key(puzzle), digest, time.time()),
+            )
+            self._delete_orphans()
+        if self.max_bytes is not None:
+            self.prune(self.max_bytes)
+
+    def __contains__(self, puzzle):
+        with self._lock:
+            return (
+                self._db.execute(
+                    "SELECT 1 FROM entries "
+                    "WHERE account = ? AND year = ? AND day = ?",
+                    self._key(puzzle),
+                ).fetchone()
+                is not None
+            )
+
+    def _delete_orphans(self):
+        self._db.execute(
+            "DELETE FROM blobs WHERE hash NOT IN (SELECT hash FROM entries)"
+        )
+
+    def _stored_bytes(self) -> int:
+        return self._db.execute(
+            "SELECT COALESCE(SUM(LENGTH(data)), 0) FROM blobs"
+        ).fetchone()[0]
+
+    def stats(self):
+        with self._lock:
+            entries = self._db.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            blobs, raw_bytes = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(raw_size), 0) FROM blobs"
+            ).fetchone()
+            return CacheStats(entries, blobs, raw_bytes, self._stored_bytes())
+
+    def prune(self, max_bytes):
+        evicted = 0
+        with self._lock, self._db:
+            while self._stored_bytes() > max_bytes:
+                row = self._db.execute(
+                    "SELECT account, year, day FROM entries "
+                    "ORDER BY accessed LIMIT 1"
+                ).fetchone()
+                if row is None:
+                    break
+                self._db.execute(
+                    "DELETE FROM entries " "WHERE account = ? AND year = ? AND day = ?",
+                    row,
+                )
+                self._delete_orphans()
+                evicted += 1
+        return evicted
+
+    def verify(self):
+        problems = []
+        with self._lock:
+            for digest, codec, data, raw_size in self._db.execute(
+                "SELECT hash, codec, data, raw_size FROM blobs"
+            ):
+                try:
+                    raw = _decompress(codec, data)
+                except (AocpyException, zlib.error) as err:
+                    problems.append(f"blob {digest}: {err}")
+                    continue
+                if hashlib.sha256(raw).hexdigest() != digest or len(raw) != raw_size:
+                    problems.append(f"blob {digest}: content does not match hash")
+            for year, day in self._db.execute(
+                "SELECT year, day FROM entries "
+                "WHERE hash NOT IN (SELECT hash FROM blobs)"
+            ):
+                problems.append(f"{year} day {day:02}: missing blob")
+        return problems
+
+
+def get_cache() -> InputCache:
+    """ Create the input cache configured by the `AOC_CACHE` (`file` or
+    `sqlite`) and `AOC_CACHE_MAX_BYTES` environment variables.
+    """
+    backend = os.environ.get("AOC_CACHE", "file")
+    max_bytes = os.environ.get("AOC_CACHE_MAX_BYTES")
+    try:
+        max_bytes = int(max_bytes) if max_bytes else None
+    except ValueError:
+        raise AocpyException(f"invalid AOC_CACHE_MAX_BYTES: {max_bytes}")
+    if backend == "file":
+        return FileCache(max_bytes=max_bytes)
+    elif backend == "sqlite":
+        path = Path(os.path.expanduser(GLOBAL_CACHE_DIR)) / SQLITE_FNAME
+        return SQLiteCache(path, max_bytes)
+    raise AocpyException(f"unknown cache backend {backend}")
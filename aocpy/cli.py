@@ -1,39 +1,222 @@
+import contextlib
+import json
+import os
+import tempfile
+import time
 import webbrowser
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, List, Optional, Tuple
 
 import click
 
-from aocpy import web
-from aocpy.exception import (
-    IncorrectSubmissionError,
-    RateLimitError,
-    RepeatSubmissionError,
+from aocpy import metrics
+from aocpy.answers import AnswerStore
+from aocpy.cache import get_cache
+from aocpy.examples import (
+    EXAMPLE_INPUT_FNAME,
+    Example,
+    extract_examples,
+    extract_title,
+    run_examples,
+    watch_examples,
+    write_examples,
 )
-from aocpy.generate import generate_day
+from aocpy.exception import AocpyException
+from aocpy.fetch import DEFAULT_JOBS, fetch_inputs
+from aocpy.generate import FILE_MODE, generate_day, generate_days, load_templates
+from aocpy.leaderboard import MIN_POLL_INTERVAL, watch
+from aocpy.memo import ResultCache
+from aocpy.profiling import DEFAULT_TOP, MODES, profile_day
 from aocpy.puzzle import (
+    ALREADY_COMPLETE,
+    CORRECT,
+    INCORRECT,
+    RATE_LIMITED,
     Puzzle,
-    check_submission_response_text,
     get_puzzle_input,
+    parse_submission_response,
 )
-from aocpy.utils import current_day, current_year, get_session_cookie, get_config_dir, get_token_file
+from aocpy.runner import INPUT_FNAME, bench_day, find_days, run_days
+from aocpy.unlock import DEFAULT_RETRIES, WARM_AHEAD, StageTimer, sleep_until
+from aocpy.utils import (
+    account_key,
+    atomic_write,
+    available_days,
+    current_day,
+    current_year,
+    get_config_dir,
+    get_profiles,
+    get_session_cookie,
+    get_token_file,
+    next_unlock,
+    unlock_time,
+)
+
+
+if TYPE_CHECKING:  # pragma: no cover
+    from aocpy import web
+
+# Set by the daemon so that sessions, and their open connections, are re-used
+# by every command it runs
+SESSIONS: Optional["web.SessionPool"] = None
+
+
+def session_pool(jobs: int = DEFAULT_JOBS) -> "web.SessionPool":
+    from aocpy import web
+
+    return SESSIONS if SESSIONS is not None else web.SessionPool(pool_size=jobs)
+
+
+def open_session(session_cookie: str) -> "web.AuthSession":
+    from aocpy import web
 
+    if SESSIONS is not None:
+        return SESSIONS.session(session_cookie)
+    return web.session(session_cookie)
 
-def begin_day(session: web.AuthSession, p: Puzzle):
+
+def fetch_puzzle_details(
+    session: "web.AuthSession", p: Puzzle
+) -> Tuple[str, Optional[List[Example]], str]:
+    """ Returns the title and examples of `p` from its puzzle page, and a
+    description of the outcome. Examples are None if the page is unavailable.
+    """
+    from requests import RequestException
+
+    from aocpy import web
+
+    try:
+        html = web.fetch_puzzle_page(session, p.url)
+    except (AocpyException, RequestException) as err:
+        return "", None, f"Unable to fetch examples: {err}"
+    examples = extract_examples(html)
+    return extract_title(html), examples, f"Found {len(examples)} examples"
+
+
+def begin_day(session: "web.AuthSession", p: Puzzle, template: str = "default"):
     click.echo(f"Initialising {p.year}, day {p.day:02} puzzle...")
     puzzle_input = get_puzzle_input(session, p)
+    title, examples, outcome = fetch_puzzle_details(session, p)
     # TODO: handle already exists error better
-    generate_day(p.day, puzzle_input)
+    generate_day(p.day, puzzle_input, template, p.year, title, examples or ())
+    if examples is not None:
+        write_examples(Path(f"{p.day:02}"), examples)
+    click.echo(outcome)
     click.echo("Opening puzzle page in browser...")
     webbrowser.open(p.url)
 
 
+def begin_at_unlock(
+    session: "web.AuthSession",
+    p: Puzzle,
+    template: str = "default",
+    retries: int = DEFAULT_RETRIES,
+):
+    """ Generate the day of `p` ahead of its release, then fetch its input the
+    moment it is released over a connection opened just beforehand.
+    """
+    from requests import RequestException
+
+    from aocpy import web
+
+    timer = StageTimer()
+    release = unlock_time(p.year, p.day)
+    day_dir = Path(f"{p.day:02}")
+    with timer.stage("scaffold"):
+        if not (day_dir / "solution.py").exists():
+            generate_day(p.day, None, template, p.year)
+    if time.time() < release.timestamp():
+        click.echo(f"Waiting for {p.year} day {p.day:02} to be released at {release}")
+        sleep_until(release.timestamp() - WARM_AHEAD)
+        with timer.stage("warm"):
+            try:
+                web.warm_connection(session)
+            except RequestException as err:
+                click.echo(f"Unable to open a connection: {err}")
+        with timer.stage("wait"):
+            sleep_until(release.timestamp())
+    cache = get_cache()
+    with timer.stage("fetch"):
+        puzzle_input = cache.get(p)
+        if puzzle_input is None:
+            puzzle_input = web.fetch_puzzle_input(session, p.url, retries)
+            cache.put(p, puzzle_input)
+    with timer.stage("write"):
+        atomic_write(day_dir / "input.txt", puzzle_input, FILE_MODE)
+    click.echo(f"Input ready {time.time() - release.timestamp():.3f}s after release")
+    click.echo(timer.summary())
+    _, examples, outcome = fetch_puzzle_details(session, p)
+    if examples is not None:
+        write_examples(day_dir, examples)
+    click.echo(outcome)
+    click.echo("Opening puzzle page in browser...")
+    webbrowser.open(p.url)
+
+
+def begin_year(
+    sessions: "web.SessionPool",
+    year: int,
+    session_cookie: str,
+    template: str = "default",
+    jobs: int = DEFAULT_JOBS,
+):
+    """ Generate every released day of `year` that has not been generated yet,
+    fetching inputs and puzzle pages with up to `jobs` concurrent requests.
+    """
+    days = available_days(year)
+    missing = [d for d in days if not Path(f"{d:02}/solution.py").exists()]
+    click.echo(
+        f"Initialising {year}: {len(missing)} days to generate, "
+        f"{len(days) - len(missing)} already generated"
+    )
+    start = time.perf_counter()
+    puzzles = [Puzzle(year, day, session_cookie) for day in missing]
+    cache = get_cache()
+    inputs = {}
+    for r in fetch_inputs(sessions, puzzles, jobs, cache):
+        if r.error is not None:
+            click.echo(f"day {r.puzzle.day:02}: failed ({r.error})")
+        else:
+            inputs[r.puzzle.day] = cache.get(r.puzzle)
+    session = sessions.session(session_cookie)
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        details = dict(
+            zip(
+                inputs,
+                executor.map(
+                    lambda day: fetch_puzzle_details(
+                        session, Puzzle(year, day, session_cookie)
+                    ),
+                    inputs,
+                ),
+            )
+        )
+    generated = generate_days(
+        inputs,
+        template,
+        year,
+        {day: title for day, (title, _, _) in details.items()},
+        {day: examples or () for day, (_, examples, _) in details.items()},
+    )
+    for day in generated:
+        _, examples, outcome = details[day]
+        if examples is not None:
+            write_examples(Path(f"{day:02}"), examples)
+        click.echo(f"day {day:02}: generated. {outcome}")
+    click.echo(f"Generated {len(generated)} days in {time.perf_counter() - start:.2f}s")
+    if len(inputs) < len(missing):
+        raise SystemExit(1)
+
+
 @click.group()
 def cli():
     pass
 
 
 @cli.command()
-@click.option("-y", "--year", default=current_year, type=click.INT)
-@click.option("-d", "--day", default=current_day, type=click.IntRange(1, 25))
+@click.option("-y", "--year", type=click.INT, help="defaults to the puzzle year")
+@click.option("-d", "--day", type=click.IntRange(1, 25), help="defaults to today")
 @click.option(
     "-c",
     "--session-cookie",
@@ -41,9 +224,56 @@ def cli():
     type=click.STRING,
     envvar="AOC_SESSION_COOKIE",
 )
-def begin(year, day, session_cookie):
-    p = Puzzle(year, day, session_cookie)
-    begin_day(web.session(session_cookie), p)
+@click.option(
+    "-t",
+    "--template",
+    default="default",
+    help="built in or user template in ~/.config/aocpy/templates",
+)
+@click.option("-a", "--all", "all_days", is_flag=True, help="every released day")
+@click.option("-j", "--jobs", default=DEFAULT_JOBS, type=click.IntRange(1, None))
+@click.option("-w", "--wait", is_flag=True, help="wait for the puzzle's release")
+@click.option(
+    "-r",
+    "--retries",
+    default=DEFAULT_RETRIES,
+    type=click.IntRange(0, None),
+    help="with --wait, retries while the input is not found",
+)
+def begin(year, day, session_cookie, template, all_days, jobs, wait, retries):
+    """ Fetch the input and generate a solution for a puzzle, or with `--all`
+    for every released puzzle of the year that has not been generated yet.
+
+    With `--wait` the solution is generated straight away and the input is
+    fetched as soon as the puzzle is released, by default the next puzzle.
+    """
+    try:
+        load_templates(template)
+    except AocpyException as err:
+        raise click.BadParameter(str(err), param_hint="--template")
+    if all_days:
+        if day is not None or wait:
+            raise click.UsageError("--all can't be used with --day or --wait")
+        begin_year(
+            session_pool(jobs),
+            current_year() if year is None else year,
+            session_cookie,
+            template,
+            jobs,
+        )
+        return
+    if wait and day is None:
+        next_year, day = next_unlock()
+        year = next_year if year is None else year
+    p = Puzzle(
+        current_year() if year is None else year,
+        current_day() if day is None else day,
+        session_cookie,
+    )
+    if wait:
+        begin_at_unlock(open_session(session_cookie), p, template, retries)
+    else:
+        begin_day(open_session(session_cookie), p, template)
 
 
 @cli.command()
@@ -58,20 +288,662 @@ def begin(year, day, session_cookie):
     type=click.STRING,
     envvar="AOC_SESSION_COOKIE",
 )
-def submit(answer, level, year, day, session_cookie):
+@click.option("-f", "--force", is_flag=True, help="submit even if the outcome is known")
+def submit(answer, level, year, day, session_cookie, force):
     p = Puzzle(year, day, session_cookie)
-    text, redirect_url = web.submit_answer(
-        web.session(session_cookie), p.url, answer, level
+    store = AnswerStore.default()
+    known = None if force else store.check(p, level, answer)
+    if known == CORRECT:
+        click.echo(f"{p} level {level} is already complete")
+        return
+    elif known is not None:
+        click.echo(
+            f"Incorrect answer {answer} for {year} day {day} level {level} "
+            f"(known {known}, not submitted)"
+        )
+        return
+
+    from aocpy import web
+
+    session = open_session(session_cookie)
+    wait = web.submission_cooldown(session)
+    if wait:
+        click.echo(f"Waiting {wait:.0f}s before submitting...")
+    text, redirect_url = web.submit_answer(session, p.url, answer, level)
+    result = parse_submission_response(text)
+    if result.verdict == ALREADY_COMPLETE:
+        click.echo(f"{p} level {level} is already complete")
+    elif result.verdict == INCORRECT:
+        store.record(p, level, answer, False, result.hint)
+        click.echo(
+            f"Incorrect answer {answer} for {year} day {day} level {level}"
+            + (f" ({result.hint})" if result.hint else "")
+        )
+    elif result.verdict == RATE_LIMITED:
+        click.echo(
+            f"Answer submitted too recently, wait {result.wait_seconds}s "
+            "before trying again"
+        )
+    else:
+        store.record(p, level, answer, True)
+        click.echo(f"Correct answer {answer} for {year} day {day} level {level}")
+
+
+@cli.command()
+@click.argument("days", nargs=-1, type=click.IntRange(1, 25))
+@click.option("-y", "--year", default=current_year, type=click.INT)
+@click.option("-j", "--jobs", default=os.cpu_count() or 1, type=click.IntRange(1, None))
+@click.option("-t", "--timeout", type=click.FloatRange(0, None), help="seconds per day")
+@click.option(
+    "-c", "--session-cookie", type=click.STRING, envvar="AOC_SESSION_COOKIE",
+)
+def verify(days, year, jobs, timeout, session_cookie):
+    """ Check solution answers against previously submitted correct answers.
+
+    No session cookie is needed if answers have only been recorded for one
+    account.
+    """
+    store = AnswerStore.default()
+    account = verify_account(store, year, session_cookie)
+    failed = False
+    for result in run_days(find_days(Path("."), days), jobs, timeout):
+        day = result["day"]
+        if "error" in result:
+            click.echo(f"day {day:02}: failed ({result['error']})")
+            failed = True
+            continue
+        for level, answer in sorted(result["answers"].items()):
+            key = (account, year, day, int(level))
+            known = None
+            if answer is not None and account is not None:
+                known = store.account_check(key, answer)
+            label = f"day {day:02} level {level}: {answer}"
+            if known == CORRECT:
+                click.echo(f"{label} ok")
+            elif known is None:
+                click.echo(f"{label} unknown")
+            else:
+                expected = store.account_correct_answer(key)
+                click.echo(
+                    f"{label} {known}" + (f", expected {expected}" if expected else "")
+                )
+                failed = True
+    if failed:
+        raise SystemExit(1)
+
+
+def verify_account(
+    store: AnswerStore, year: int, session_cookie: Optional[str]
+) -> Optional[str]:
+    """ Returns the key of the account whose answers `verify` checks: that of
+    the configured session cookie if any, otherwise the only account with
+    answers recorded for `year`.
+    """
+    if session_cookie is None:
+        try:
+            session_cookie = get_session_cookie()
+        except AocpyException:
+            pass
+    if session_cookie is not None:
+        return account_key(session_cookie)
+    accounts = store.accounts(year)
+    if len(accounts) > 1:
+        click.echo(
+            f"answers are recorded for {len(accounts)} accounts, "
+            "give --session-cookie to choose one",
+            err=True,
+        )
+    return accounts[0] if len(accounts) == 1 else None
+
+
+def account_cookies(profiles, session_cookie):
+    """ Returns the session cookie for each account selected by the `--profiles`
+    and `--session-cookie` options, keyed by profile name.
+    """
+    if profiles:
+        try:
+            return get_profiles(profiles)
+        except AocpyException as err:
+            raise click.BadParameter(str(err), param_hint="--profiles")
+    return {"default": session_cookie or get_session_cookie()}
+
+
+def echo_matrix(rows, columns, cells):
+    """ Print a table of `cells[row][column]` values.
+    """
+    widths = [
+        max([len(str(c))] + [len(cells[r].get(c, "")) for r in rows]) for c in columns
+    ]
+    label_width = max(len(str(r)) for r in rows)
+    click.echo(
+        " " * label_width + "".join(f"  {str(c):>{w}}" for c, w in zip(columns, widths))
     )
+    for r in rows:
+        click.echo(
+            f"{r:<{label_width}}"
+            + "".join(f"  {cells[r].get(c, ''):>{w}}" for c, w in zip(columns, widths))
+        )
+
+
+@cli.command()
+@click.option("-y", "--year", "years", multiple=True, type=click.INT)
+@click.option("-d", "--day", "days", multiple=True, type=click.IntRange(1, 25))
+@click.option("-a", "--all-days", is_flag=True, help="fetch every released day")
+@click.option("-j", "--jobs", default=DEFAULT_JOBS, type=click.IntRange(1, None))
+@click.option("-p", "--profiles", help="'all' or comma separated profile names")
+@click.option(
+    "-c", "--session-cookie", type=click.STRING, envvar="AOC_SESSION_COOKIE",
+)
+def fetch(years, days, all_days, jobs, profiles, session_cookie):
+    """ Download puzzle inputs into the local cache.
+    """
+    if not days and not all_days:
+        raise click.UsageError("specify at least one --day or --all-days")
+    accounts = account_cookies(profiles, session_cookie)
+    names = {cookie: name for name, cookie in accounts.items()}
+    puzzles = [
+        Puzzle(year, day, cookie)
+        for cookie in accounts.values()
+        for year in years or [current_year()]
+        for day in (available_days(year) if all_days else days)
+    ]
+    start = time.perf_counter()
+    results = fetch_inputs(session_pool(jobs), puzzles, jobs)
+    elapsed = max(time.perf_counter() - start, 1e-9)
+
+    fetched = [r for r in results if not r.cached and r.error is None]
+    failed = [r for r in results if r.error is not None]
+    for r in results:
+        label = f"{r.puzzle.year} day {r.puzzle.day:02}"
+        if profiles:
+            label = f"{names[r.puzzle.session_cookie]} {label}"
+        if r.cached:
+            click.echo(f"{label}: cached")
+        elif r.error is not None:
+            click.echo(f"{label}: failed after {r.seconds:.2f}s ({r.error})")
+        else:
+            click.echo(f"{label}: {r.size} bytes in {r.seconds:.2f}s")
+
+    if profiles:
+        cells = {name: {} for name in accounts}
+        for r in results:
+            status = "cached" if r.cached else "failed" if r.error else "ok"
+            column = f"{r.puzzle.year}/{r.puzzle.day:02}"
+            cells[names[r.puzzle.session_cookie]][column] = status
+        columns = list(dict.fromkeys(f"{p.year}/{p.day:02}" for p in puzzles))
+        echo_matrix(list(accounts), columns, cells)
+
+    total_bytes = sum(r.size for r in fetched)
+    click.echo(
+        f"Fetched {len(fetched)} inputs ({total_bytes} bytes) in {elapsed:.2f}s "
+        f"({len(fetched) / elapsed:.1f} inputs/s, "
+        f"{total_bytes / 1024 / elapsed:.1f} KiB/s), "
+        f"{len(results) - len(fetched) - len(failed)} cached, {len(failed)} failed"
+    )
+    if failed:
+        raise SystemExit(1)
+
+
+@cli.command()
+@click.argument("days", nargs=-1, type=click.IntRange(1, 25))
+@click.option("-n", "--repeat", default=10, type=click.IntRange(1, None))
+@click.option("-o", "--output", default="bench.json", type=click.Path(dir_okay=False))
+def bench(days, repeat, output):
+    """ Benchmark generated solutions in the current directory.
+    """
+    results = []
+    for day_dir in find_days(Path("."), days):
+        result = bench_day(day_dir, repeat)
+        results.append(result)
+        if "error" in result:
+            click.echo(f"day {result['day']:02}: failed ({result['error']})")
+            continue
+        click.echo(f"day {result['day']:02}: peak RSS {result['peak_rss'] // 1024} KiB")
+        for name in ("parse", "part_1", "part_2"):
+            t = result[name]
+            click.echo(
+                f"  {name:<6} min {t['min'] * 1000:.3f}ms "
+                f"median {t['median'] * 1000:.3f}ms p95 {t['p95'] * 1000:.3f}ms"
+            )
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    click.echo(f"Results written to {output}")
+
+
+@cli.command()
+@click.argument("days", nargs=-1, type=click.IntRange(1, 25))
+@click.option("-y", "--year", default=current_year, type=click.INT)
+@click.option("-j", "--jobs", default=os.cpu_count() or 1, type=click.IntRange(1, None))
+@click.option("-t", "--timeout", type=click.FloatRange(0, None), help="seconds per day")
+@click.option(
+    "-m", "--memory-limit", type=click.IntRange(1, None), help="bytes per day"
+)
+@click.option("-o", "--output", type=click.Path(dir_okay=False))
+@click.option("-p", "--profiles", help="'all' or comma separated profile names")
+@click.option(
+    "-c", "--session-cookie", type=click.STRING, envvar="AOC_SESSION_COOKIE",
+)
+@click.option("--no-cache", is_flag=True, help="rerun solutions with cached results")
+def run(
+    days, year, jobs, timeout, memory_limit, output, profiles, session_cookie, no_cache
+):
+    """ Run generated solutions in the current directory in parallel.
+
+    With `--profiles` every solution is run against the input of each selected
+    account, fetching any inputs that are not already cached.
+
+    Results are cached by the solution's code and input, so unchanged solutions
+    are not rerun unless `--no-cache` is given.
+    """
+    day_dirs = find_days(Path("."), days)
+    results_cache = None if no_cache else ResultCache.default()
+    if not profiles:
+        start = time.perf_counter()
+        results = run_days(day_dirs, jobs, timeout, memory_limit, cache=results_cache)
+        elapsed = time.perf_counter() - start
+        report = {"year": year, "elapsed": elapsed, "days": results}
+    else:
+        accounts = account_cookies(profiles, session_cookie)
+        puzzles = [
+            Puzzle(year, int(d.name), cookie)
+            for cookie in accounts.values()
+            for d in day_dirs
+        ]
+        start = time.perf_counter()
+        fetch_inputs(session_pool(jobs), puzzles, jobs)
+        cache = get_cache()
+        all_results = [None] * len(puzzles)
+        with tempfile.TemporaryDirectory() as tmp:
+            tasks = []
+            for i, p in enumerate(puzzles):
+                puzzle_input = cache.get(p)
+                if puzzle_input is None:
+                    all_results[i] = {"day": p.day, "error": "input unavailable"}
+                    continue
+                path = Path(tmp) / account_key(p.session_cookie) / f"{p.day:02}.txt"
+                path.parent.mkdir(exist_ok=True)
+                path.write_text(puzzle_input)
+                tasks.append((i, path))
+            task_results = run_days(
+                [day_dirs[i % len(day_dirs)] for i, _ in tasks],
+                jobs,
+                timeout,
+                memory_limit,
+                [path for _, path in tasks],
+                results_cache,
+            )
+            for (i, _), result in zip(tasks, task_results):
+                all_results[i] = result
+        elapsed = time.perf_counter() - start
+        by_account = {
+            name: all_results[i * len(day_dirs) : (i + 1) * len(day_dirs)]
+            for i, name in enumerate(accounts)
+        }
+        results = all_results
+        report = {"year": year, "elapsed": elapsed, "accounts": by_account}
+
+    click.echo(f"{year}:")
+    if not profiles:
+        for result in results:
+            if "error" in result:
+                click.echo(f"day {result['day']:02}: failed ({result['error']})")
+                continue
+            answers = result["answers"]
+            cached = ", cached" if result.get("cached") else ""
+            click.echo(
+                f"day {result['day']:02}: part 1 {answers['1']}, "
+                f"part 2 {answers['2']} ({sum(result['times'].values()):.3f}s{cached})"
+            )
+    else:
+        cells = {
+            f"day {int(d.name):02}": {name: "" for name in accounts} for d in day_dirs
+        }
+        for name, account_results in by_account.items():
+            for result in account_results:
+                cells[f"day {result['day']:02}"][name] = (
+                    "failed"
+                    if "error" in result
+                    else f"{result['answers']['1']} / {result['answers']['2']}"
+                )
+        echo_matrix(list(cells), list(accounts), cells)
+    failed = sum("error" in r for r in results)
+    click.echo(
+        f"Ran {len(results)} solutions in {elapsed:.2f}s "
+        f"({sum(r.get('wall', 0) for r in results):.2f}s total), {failed} failed"
+    )
+    if output:
+        with open(output, "w") as f:
+            json.dump(report, f, indent=2)
+    if failed:
+        raise SystemExit(1)
+
+
+def echo_example_results(day_dir, results):
+    if not results:
+        click.echo(f"day {day_dir.name}: no examples with answers")
+    for r in results:
+        label = f"day {day_dir.name} part {r.example.part}:"
+        if r.passed:
+            click.echo(f"{label} ok ({r.seconds * 1000:.3f}ms)")
+        elif r.error is not None:
+            click.echo(f"{label} error {r.error}")
+        else:
+            click.echo(f"{label} expected {r.example.answer}, got {r.actual}")
+
+
+@cli.command()
+@click.argument("days", nargs=-1, type=click.IntRange(1, 25))
+@click.option("-w", "--watch", is_flag=True, help="re-run when files change")
+def test(days, watch):
+    """ Check solutions in the current directory against their examples.
+    """
+    day_dirs = find_days(Path("."), days)
+    if watch:
+        try:
+            watch_examples(day_dirs, echo_example_results)
+        except KeyboardInterrupt:
+            return
+    failed = False
+    for day_dir in day_dirs:
+        results = run_examples(day_dir)
+        echo_example_results(day_dir, results)
+        failed = failed or not all(r.passed for r in results)
+    if failed:
+        raise SystemExit(1)
+
+
+@cli.command()
+@click.argument("day", type=click.IntRange(1, 25))
+@click.argument("infile", required=False, type=click.Path(exists=True, dir_okay=False))
+@click.option("--part", default=1, type=click.IntRange(1, 2))
+@click.option("--mode", default="cprofile", type=click.Choice(MODES))
+@click.option("-e", "--example", is_flag=True, help="use example_input.txt")
+@click.option("-n", "--top", default=DEFAULT_TOP, type=click.IntRange(1, None))
+@click.option("-o", "--output-dir", type=click.Path(file_okay=False))
+def profile(day, infile, part, mode, example, top, output_dir):
+    """ Profile one part of a solution in the current directory.
+
+    The input is chosen the same way as when running `solution.py` directly.
+    The profile is written to the day directory, or `--output-dir`, as pstats
+    for `cprofile`, collapsed stacks for `sample` and a snapshot for
+    `tracemalloc`.
+    """
+    (day_dir,) = find_days(Path("."), [day])
+    if infile:
+        input_path = Path(infile)
+    else:
+        input_path = day_dir / (EXAMPLE_INPUT_FNAME if example else INPUT_FNAME)
+    if not input_path.is_file():
+        raise click.UsageError(f"no input file {input_path}")
+    report = profile_day(
+        day_dir, input_path, part, mode, Path(output_dir) if output_dir else None, top,
+    )
+    click.echo(f"day {day:02} part {part}: {report.answer} ({report.seconds:.3f}s)")
+    for location, value in report.top:
+        amount = f"{value * 1000:.3f}ms" if report.unit == "s" else f"{value}"
+        suffix = "" if report.unit == "s" else f" {report.unit}"
+        click.echo(f"  {amount:>12}{suffix}  {location}")
+    click.echo(f"Profile written to {report.output}")
+
+
+@cli.group()
+def leaderboard():
+    """ Follow private leaderboards.
+    """
+
+
+@leaderboard.command("watch")
+@click.argument("board_ids", nargs=-1, required=True)
+@click.option("-y", "--year", default=current_year, type=click.INT)
+@click.option(
+    "-i",
+    "--interval",
+    default=MIN_POLL_INTERVAL,
+    type=click.FloatRange(MIN_POLL_INTERVAL, None),
+    help="seconds between polls",
+)
+@click.option("--once", is_flag=True, help="poll each board once and exit")
+@click.option(
+    "-c",
+    "--session-cookie",
+    default=get_session_cookie,
+    type=click.STRING,
+    envvar="AOC_SESSION_COOKIE",
+)
+def leaderboard_watch(board_ids, year, interval, once, session_cookie):
+    """ Poll private leaderboards, printing each change as a line of JSON.
+    """
+    boards = [(year, board_id) for board_id in board_ids]
     try:
-        check_submission_response_text(text)
-    except RepeatSubmissionError:
-        click.echo(f"{p} level {level} is already complete")
-    except IncorrectSubmissionError:
-        click.echo(f"Incorrect answer {answer} for {year} day {day} level {level}")
-    except RateLimitError as err:
-        # TODO: Clean up this error message - remove '[Return to Day 13]' line
-        click.echo(err)
+        for event in watch(
+            open_session(session_cookie), boards, interval, rounds=1 if once else None
+        ):
+            click.echo(json.dumps(event))
+    except KeyboardInterrupt:
+        pass
+
+
+@cli.group()
+def cache():
+    """ Inspect and maintain the puzzle input cache.
+    """
+
+
+@cache.command("stats")
+def cache_stats():
+    s = get_cache().stats()
+    click.echo(f"Entries: {s.entries}")
+    click.echo(f"Unique inputs: {s.blobs}")
+    click.echo(f"Input bytes: {s.raw_bytes}")
+    click.echo(f"Stored bytes: {s.stored_bytes}")
+
+
+@cache.command("prune")
+@click.option("-m", "--max-bytes", required=True, type=click.IntRange(0, None))
+def cache_prune(max_bytes):
+    evicted = get_cache().prune(max_bytes)
+    click.echo(f"Evicted {evicted} inputs")
+
+
+@cache.command("verify")
+def cache_verify():
+    problems = get_cache().verify()
+    for problem in problems:
+        click.echo(problem)
+    if problems:
+        raise SystemExit(1)
+    click.echo("Cache OK")
+
+
+@cli.command()
+@click.option(
+    "-o",
+    "--openmetrics",
+    type=click.Path(dir_okay=False),
+    help="also write the totals in the OpenMetrics text format",
+)
+def stats(openmetrics):
+    """ Summarise the requests and cache lookups recorded with
+    `AOC_METRICS=jsonl`.
+    """
+    path = get_config_dir() / metrics.JSONL_FNAME
+    if not path.exists():
+        click.echo(f"No metrics in {path}, set AOC_METRICS=jsonl to record them")
+        return
+    summary = metrics.summarize(metrics.read_samples(path))
+    endpoints = sorted(summary.latencies)
+    columns = ["requests", "errors", "p50", "p95", "p99", "max", "bytes"]
+    cells = {}
+    for endpoint in endpoints:
+        latencies = summary.latencies[endpoint]
+        responses = summary.registry.counters.get(metrics.RESPONSES, {})
+        errors = sum(
+            value
+            for labels, value in responses.items()
+            if ("endpoint", endpoint) in labels
+            and not dict(labels)["status"].startswith(("2", "3"))
+        )
+        cells[endpoint] = {
+            "requests": str(len(latencies)),
+            "errors": f"{errors:.0f}",
+            "bytes": f"{summary.total(metrics.RESPONSE_BYTES, endpoint=endpoint):.0f}",
+        }
+        for q in (0.5, 0.95, 0.99, 1.0):
+            column = "max" if q == 1.0 else f"p{q * 100:.0f}"
+            cells[endpoint][column] = f"{metrics.quantile(latencies, q) * 1000:.0f}ms"
+    if endpoints:
+        echo_matrix(endpoints, columns, cells)
+    retries = summary.total(metrics.RETRIES)
+    waited = summary.total(metrics.RATE_LIMIT_WAIT)
+    click.echo(f"Retries: {retries:.0f}")
+    click.echo(f"Rate limited: {waited:.1f}s")
+    for cache_name in ("input", "http"):
+        lookups = summary.total(metrics.CACHE_LOOKUPS, cache=cache_name)
+        if not lookups:
+            continue
+        hits = lookups - summary.total(
+            metrics.CACHE_LOOKUPS, cache=cache_name, result="miss"
+        )
+        click.echo(
+            f"{cache_name.capitalize()} cache: {hits:.0f}/{lookups:.0f} hits "
+            f"({hits / lookups:.0%})"
+        )
+    if openmetrics:
+        atomic_write(Path(openmetrics), summary.registry.to_openmetrics())
+        click.echo(f"Wrote {openmetrics}")
+
+
+@cli.command()
+@click.option("-u", "--url", help="server to test, by default a local stand-in")
+@click.option("-n", "--requests", default=200, type=click.IntRange(1, None))
+@click.option("-j", "--concurrency", default=8, type=click.IntRange(1, None))
+@click.option("-a", "--accounts", default=1, type=click.IntRange(1, None))
+@click.option("--cached", is_flag=True, help="fetch through an input cache")
+@click.option("--latency", default=0.0, type=click.FloatRange(0, None), help="seconds")
+@click.option("--jitter", default=0.0, type=click.FloatRange(0, None), help="seconds")
+@click.option(
+    "--server-rate", type=click.FloatRange(0, None), help="requests/second per account"
+)
+@click.option("--client-rate", type=click.FloatRange(0, None), help="requests/second")
+@click.option("-o", "--output", type=click.Path(dir_okay=False))
+def loadtest(
+    url,
+    requests,
+    concurrency,
+    accounts,
+    cached,
+    latency,
+    jitter,
+    server_rate,
+    client_rate,
+    output,
+):
+    """ Fetch puzzle inputs concurrently and report throughput and latency.
+
+    Unless `--url` is given the requests are served by a local stand-in for
+    adventofcode.com with the given `--latency`, `--jitter` and
+    `--server-rate`, and are only limited by the client with `--client-rate`.
+    Requests to a `--url` are limited by `--client-rate` or otherwise by the
+    usual `AOC_RATE_LIMIT`. Never point this at adventofcode.com itself.
+    """
+    import logging
+
+    from aocpy import web
+    from aocpy.loadtest import run_load_test, unlimited_limiter
+    from aocpy.standin import StandinConfig, running
+
+    # Failed requests are counted in the report instead
+    logging.getLogger("aocpy.web").setLevel(logging.CRITICAL)
+    with contextlib.ExitStack() as stack:
+        server = None
+        if url is None:
+            config = StandinConfig(latency, jitter, server_rate)
+            server = stack.enter_context(running(config))
+            url = server.base_url
+        if client_rate:
+            limiter = web.RateLimiter(client_rate, concurrency)
+        elif server is not None:
+            limiter = unlimited_limiter(concurrency)
+        else:
+            limiter = web.default_rate_limiter()
+        report = run_load_test(
+            url, requests, concurrency, accounts, cached=cached, limiter=limiter
+        )
+    summary = report.summary()
+    click.echo(
+        f"{requests} requests at concurrency {concurrency} in "
+        f"{report.elapsed:.2f}s: {report.throughput:.1f} requests/s"
+    )
+    click.echo(
+        "latency "
+        + ", ".join(
+            f"{name} {summary[name] * 1000:.1f}ms"
+            for name in ("p50", "p95", "p99", "max")
+        )
+    )
+    if server is not None:
+        statuses = server.statuses()
+        summary["connections"] = server.connections
+        summary["statuses"] = statuses
+        click.echo(
+            f"{server.connections} connections opened, responses: "
+            + ", ".join(f"{status} x{n}" for status, n in sorted(statuses.items()))
+        )
+    for error, n in sorted(report.errors.items()):
+        click.echo(f"error: {error} x{n}")
+    if output:
+        with open(output, "w") as f:
+            json.dump({**summary, "errors": report.errors}, f, indent=2)
+
+
+@cli.group()
+def daemon():
+    """ Manage the background daemon which runs aocpy commands in a warm
+    interpreter. While it is running, commands are forwarded to it.
+    """
+
+
+@daemon.command("start")
+@click.option("-f", "--foreground", is_flag=True, help="run in this process")
+def daemon_start(foreground):
+    from aocpy import daemon as aocpy_daemon
+    from aocpy.client import socket_path
+
+    current = aocpy_daemon.status()
+    if current is not None:
+        click.echo(f"Daemon already running (pid {current['pid']})")
+        return
+    if foreground:
+        click.echo(f"Listening on {socket_path()}")
+        aocpy_daemon.Daemon(socket_path()).serve()
+        return
+    click.echo(f"Daemon started (pid {aocpy_daemon.start()['pid']})")
+
+
+@daemon.command("stop")
+def daemon_stop():
+    from aocpy import daemon as aocpy_daemon
+
+    try:
+        aocpy_daemon.stop()
+    except AocpyException:
+        click.echo("Daemon not running")
+        raise SystemExit(1)
+    click.echo("Daemon stopped")
+
+
+@daemon.command("status")
+def daemon_status():
+    from aocpy import daemon as aocpy_daemon
+
+    current = aocpy_daemon.status()
+    if current is None:
+        click.echo("Daemon not running")
+        raise SystemExit(1)
+    click.echo(
+        f"Daemon running (pid {current['pid']}) for {current['uptime']:.0f}s, "
+        f"{current['commands']} commands, {current['solutions']} solutions loaded"
+    )
 
 
 @cli.command()
@@ -0,0 +1,99 @@
+""" Entry point of the `aocpy` command.
+
+If the daemon is running (`aocpy daemon start`) commands are forwarded to it
+over a Unix socket, so that they run in an interpreter which has already
+imported aocpy and its dependencies. Otherwise, or if `AOC_NO_DAEMON` is set,
+they are run in this process. Only the standard library is imported before a
+command is forwarded.
+"""
+import json
+import os
+import socket
+import sys
+from typing import List, Optional
+
+from aocpy.utils import get_config_dir
+
+SOCKET_FNAME = "daemon.sock"
+# Commands run locally even with the daemon running: those which manage the
+# daemon, and those which may wait for hours and would block other commands
+LOCAL_COMMANDS = {"daemon", "leaderboard"}
+LOCAL_OPTIONS = {"-w", "--wait", "--watch"}
+
+
+def socket_path() -> str:
+    return str(get_config_dir() / SOCKET_FNAME)
+
+
+def connect(timeout: Optional[float] = None) -> socket.socket:
+    """ Returns a connection to the daemon, raising OSError if it is not
+    running.
+    """
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(socket_path())
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+def send(sock: socket.socket, message: dict):
+    sock.sendall(json.dumps(message).encode() + b"\n")
+
+
+def messages(sock: socket.socket):
+    """ Yields each message received from `sock` until it is closed.
+    """
+    with sock.makefile("rb") as f:
+        for line in f:
+            yield json.loads(line)
+
+
+def forward(argv: List[str]) -> int:
+    """ Run the command `argv` in the daemon, writing its output to this
+    process' stdout and stderr. Returns the command's exit code.
+    """
+    with connect() as sock:
+        send(sock, {"argv": argv, "cwd": os.getcwd(), "env": dict(os.environ)})
+        for message in messages(sock):
+            if "stdout" in message:
+                sys.stdout.write(message["stdout"])
+                sys.stdout.flush()
+            elif "stderr" in message:
+                sys.stderr.write(message["stderr"])
+                sys.stderr.flush()
+            elif "exit" in message:
+                return message["exit"]
+    # The daemon stopped part way through the command
+    return 1
+
+
+def runs_locally(argv: List[str]) -> bool:
+    command = next((arg for arg in argv if not arg.startswith("-")), None)
+    return (
+        bool(os.environ.get("AOC_NO_DAEMON"))
+        or command in LOCAL_COMMANDS
+        or bool(LOCAL_OPTIONS.intersection(argv))
+    )
+
+
+def main():
+    argv = sys.argv[1:]
+    if not runs_locally(argv):
+        try:
+            sys.exit(forward(argv))
+        except (FileNotFoundError, ConnectionRefusedError):
+            # Not running, or a socket left behind by a daemon that was killed
+            pass
+        except KeyboardInterrupt:
+            # The daemon abandons the command once it can't send its output
+            sys.exit(130)
+    from aocpy.cli import cli
+
+    cli()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+""" Background server running the aocpy commands forwarded by `aocpy.client`.
+
+The daemon keeps aocpy and its dependencies imported, pools of sessions with
+open connections to adventofcode.com (one for each rate limit and HTTP cache
+configuration used by clients) and the solution modules it has run, so
+a forwarded command only pays for the work it does. Commands run one at a time
+in the client's working directory and environment, and their output is
+streamed back to the client as it is written.
+
+Messages are lines of JSON. A client sends one request:
+
+- `{"argv": [...], "cwd": ..., "env": {...}}` to run a command, answered with
+  `{"stdout": ...}` and `{"stderr": ...}` messages and finally `{"exit": 0}`
+- `{"command": "status"}`, answered with `{"status": {...}}`
+- `{"command": "stop"}`, answered with `{"stopped": true}`
+"""
+import contextlib
+import io
+import json
+import os
+import socket
+import socketserver
+import subprocess
+import sys
+import threading
+import time
+import traceback
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from aocpy import cli as aocpy_cli, generate, runner, web
+from aocpy.client import connect, messages, send, socket_path
+from aocpy.exception import AocpyException
+from aocpy.utils import get_config_dir
+
+LOG_FNAME = "daemon.log"
+START_TIMEOUT = 10.0
+# Environment read when creating a session pool's rate limiter and HTTP cache
+SESSION_ENV = ("HOME", "AOC_RATE_LIMIT", "AOC_RATE_BURST", "AOC_HTTP_CACHE_TTL")
+
+
+class _MessageWriter(io.TextIOBase):
+    """ Text stream sending everything written to it to the client as `key`
+    messages.
+    """
+
+    def __init__(self, sock: socket.socket, key: str):
+        self._sock = sock
+        self._key = key
+
+    def writable(self):
+        return True
+
+    def write(self, text):
+        # click writes bytes to streams without a binary buffer
+        if isinstance(text, bytes):
+            text = text.decode(errors="replace")
+        if text:
+            send(self._sock, {self._key: text})
+        return len(text)
+
+
+class SessionPools:
+    """ Session pools shared by the commands run with the same rate limit and
+    HTTP cache configuration.
+    """
+
+    def __init__(self):
+        self._pools: Dict[Tuple[Optional[str], ...], web.SessionPool] = {}
+
+    def __len__(self):
+        return len(self._pools)
+
+    def get(self) -> web.SessionPool:
+        """ Returns the pool for the configuration in the current environment.
+        """
+        key = tuple(os.environ.get(name) for name in SESSION_ENV)
+        if key not in self._pools:
+            self._pools[key] = web.SessionPool()
+        return self._pools[key]
+
+
+@contextlib.contextmanager
+def _client_context(cwd: str, env: Dict[str, str]):
+    saved_cwd = os.getcwd()
+    saved_env = dict(os.environ)
+    os.environ.clear()
+    os.environ.update(env)
+    try:
+        os.chdir(cwd)
+        yield
+    finally:
+        os.chdir(saved_cwd)
+        os.environ.clear()
+        os.environ.update(saved_env)
+
+
+def _exit_code(code) -> int:
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    print(code, file=sys.stderr)
+    return 1
+
+
+def run_command(
+    sock: socket.socket,
+    argv: List[str],
+    cwd: str,
+    env: Dict[str, str],
+    sessions: SessionPools,
+):
+    """ Run the aocpy command `argv` as if run by the client, sending its output
+    to `sock`. Returns the command's exit code.
+    """
+    # User templates may have been edited since the last command
+    generate.load_templates.cache_clear()
+    stdout = _MessageWriter(sock, "stdout")
+    stderr = _MessageWriter(sock, "stderr")
+    with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+        try:
+            with _client_context(cwd, env):
+                aocpy_cli.SESSIONS = sessions.get()
+                aocpy_cli.cli.main(args=argv, prog_name="aocpy")
+        except SystemExit as err:
+            return _exit_code(err.code)
+        except Exception:
+            traceback.print_exc()
+            return 1
+        finally:
+            aocpy_cli.SESSIONS = None
+    return 0
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        try:
+            request = json.loads(self.rfile.readline())
+        except ValueError:
+            return
+        server: Daemon = self.server
+        try:
+            if request.get("command") == "status":
+                send(self.request, {"status": server.status()})
+            elif request.get("command") == "stop":
+                send(self.request, {"stopped": True})
+                # shutdown() waits for serve_forever(), which is running this
+                threading.Thread(target=server.shutdown).start()
+            elif "argv" in request:
+                server.commands += 1
+                code = run_command(
+                    self.request,
+                    request["argv"],
+                    request["cwd"],
+                    request["env"],
+                    server.sessions,
+                )
+                send(self.request, {"exit": code})
+        except OSError:
+            # The client has gone away
+            pass
+
+
+class Daemon(socketserver.UnixStreamServer):
+    """ Server handling one client at a time on the Unix socket `path`, with
+    the sessions and solutions shared by its commands.
+    """
+
+    def __init__(self, path: str):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(path)
+        # Only the user may connect, since commands run with their cookie
+        umask = os.umask(0o077)
+        try:
+            super().__init__(path, _Handler)
+        finally:
+            os.umask(umask)
+        self.started = time.time()
+        self.commands = 0
+        self.sessions = SessionPools()
+        self.solutions = runner.SolutionCache()
+
+    def status(self) -> dict:
+        return {
+            "pid": os.getpid(),
+            "uptime": time.time() - self.started,
+            "commands": self.commands,
+            "solutions": len(self.solutions),
+            "session_pools": len(self.sessions),
+        }
+
+    def serve(self):
+        runner.SOLUTIONS = self.solutions
+        try:
+            self.serve_forever()
+        finally:
+            runner.SOLUTIONS = None
+            self.server_close()
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(self.server_address)
+
+
+def request(message: dict, timeout: Optional[float] = 5.0) -> dict:
+    """ Send `message` to the running daemon, returning its reply. Raises
+    AocpyException if the daemon is not running.
+    """
+    try:
+        with connect(timeout) as sock:
+            send(sock, message)
+            return next(messages(sock))
+    except (OSError, StopIteration) as err:
+        raise AocpyException(f"daemon is not running ({err})")
+
+
+def status() -> Optional[dict]:
+    """ Returns the status of the running daemon, or None if not running.
+    """
+    try:
+        return request({"command": "status"})["status"]
+    except AocpyException:
+        return None
+
+
+def start(timeout: float = START_TIMEOUT) -> dict:
+    """ Start the daemon in the background, returning its status once it is
+    accepting commands.
+    """
+    get_config_dir().mkdir(parents=True, exist_ok=True)
+    with open(get_config_dir() / LOG_FNAME, "a") as log:
+        p = subprocess.Popen(
+            [sys.executable, "-m", "aocpy.daemon"],
+            stdin=subprocess.DEVNULL,
+            stdout=log,
+            stderr=log,
+            start_new_session=True,
+        )
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        current = status()
+        if current is not None:
+            return current
+        if p.poll() is not None:
+            break
+        time.sleep(0.05)
+    raise AocpyException(f"daemon failed to start, see {get_config_dir() / LOG_FNAME}")
+
+
+def stop():
+    request({"command": "stop"})
+
+
+def main():
+    Daemon(socket_path()).serve()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+""" Extraction of examples from puzzle pages and a fast local loop for
+checking solutions against them.
+"""
+import json
+import re
+import sys
+import time
+from dataclasses import asdict, dataclass
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from aocpy.generate import FILE_MODE
+from aocpy.runner import get_parse, get_part, input_type, load_solution
+from aocpy.utils import atomic_write
+
+EXAMPLES_FNAME = "examples.json"
+EXAMPLE_INPUT_FNAME = "example_input.txt"
+WATCH_INTERVAL = 0.2
+TITLE_RE = re.compile(r"\s*-+\s*Day \d+:\s*(.*?)\s*-+\s*$")
+
+
+@dataclass(frozen=True)
+class Example:
+    part: int
+    input: str
+    answer: Optional[str]
+
+
+@dataclass(frozen=True)
+class ExampleResult:
+    example: Example
+    actual: Optional[str]
+    seconds: float
+    error: Optional[str] = None
+
+    @property
+    def passed(self) -> bool:
+        return self.error is None and self.actual == self.example.answer
+
+
+class _PuzzlePageParser(HTMLParser):
+    """ Collects the `<pre><code>` blocks and emphasised code (`<code><em>`)
+    of each `<article>` in a puzzle page, and the heading of the first.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.articles: List[Dict[str, List[str]]] = []
+        self.heading: Optional[str] = None
+        self._open = {"article": 0, "h2": 0, "pre": 0, "code": 0, "em": 0}
+        self._pre: Optional[List[str]] = None
+        self._em: Optional[List[str]] = None
+        self._h2: Optional[List[str]] = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag not in self._open:
+            return
+        self._open[tag] += 1
+        if tag == "article":
+            self.articles.append({"pre": [], "em": []})
+        elif not self._open["article"]:
+            return
+        elif tag == "h2" and self.heading is None:
+            self._h2 = []
+        elif tag == "pre" and self._pre is None:
+            self._pre = []
+        elif self._open["code"] and self._open["em"] and self._em is None:
+            if not self._open["pre"]:
+                self._em = []
+
+    def handle_endtag(self, tag):
+        if tag not in self._open or not self._open[tag]:
+            return
+        self._open[tag] -= 1
+        if tag == "h2" and self._h2 is not None:
+            self.heading = "".join(self._h2)
+            self._h2 = None
+        elif tag == "pre" and self._pre is not None and not self._open["pre"]:
+            self.articles[-1]["pre"].append("".join(self._pre))
+            self._pre = None
+        elif tag in ("code", "em") and self._em is not None:
+            self.articles[-1]["em"].append("".join(self._em).strip())
+            self._em = None
+
+    def handle_data(self, data):
+        if self._h2 is not None:
+            self._h2.append(data)
+        if self._pre is not None:
+            self._pre.append(data)
+        if self._em is not None:
+            self._em.append(data)
+
+
+def extract_title(html: str) -> str:
+    """ Returns the title of the puzzle described in a puzzle page, e.g.
+    "Report Repair" from the heading "--- Day 1: Report Repair ---".
+    """
+    parser = _PuzzlePageParser()
+    parser.feed(html)
+    parser.close()
+    m = TITLE_RE.match(parser.heading or "")
+    return m.group(1) if m else (parser.heading or "").strip()
+
+
+def extract_examples(html: str) -> List[Example]:
+    """ Returns the example for each part described in a puzzle page.
+
+    The example input is taken to be the first `<pre><code>` block in a part's
+    description, falling back to the previous part's input if it has none, and
+    the expected answer the last emphasised `<code><em>` value.
+    """
+    parser = _PuzzlePageParser()
+    parser.feed(html)
+    parser.close()
+    examples = []
+    example_input = None
+    for part, article in enumerate(parser.articles[:2], 1):
+        if article["pre"]:
+            example_input = article["pre"][0]
+        if example_input is None:
+            continue
+        answer = article["em"][-1] if article["em"] else None
+        examples.append(Example(part, example_input, answer))
+    return examples
+
+
+def write_examples(day_dir: Path, examples: List[Example]):
+    """ Write `examples` to the day's `examples.json`, and the first example's
+    input to `example_input.txt` if not already present.
+    """
+    atomic_write(
+        day_dir / EXAMPLES_FNAME,
+        json.dumps([asdict(e) for e in examples], indent=2),
+        FILE_MODE,
+    )
+    example_input = day_dir / EXAMPLE_INPUT_FNAME
+    if examples and not example_input.exists():
+        atomic_write(example_input, examples[0].input, FILE_MODE)
+
+
+def load_examples(day_dir: Path) -> List[Example]:
+    try:
+        with open(day_dir / EXAMPLES_FNAME) as f:
+            return [Example(**e) for e in json.load(f)]
+    except FileNotFoundError:
+        return []
+
+
+def _forget_local_modules(day_dir: Path):
+    # Helper modules imported by the solution are re-imported on the next run
+    day_dir = str(day_dir.resolve())
+    for name, module in list(sys.modules.items()):
+        if (getattr(module, "__file__", None) or "").startswith(day_dir):
+            del sys.modules[name]
+
+
+def run_examples(day_dir: Path) -> List[ExampleResult]:
+    """ Check the solution in `day_dir` against each of its examples that has a
+    known answer, in the current interpreter. The solution is re-imported on
+    every call so changes to it are picked up.
+    """
+    examples = [e for e in load_examples(day_dir) if e.answer is not None]
+    if not examples:
+        return []
+    _forget_local_modules(day_dir)
+    try:
+        module = load_solution(day_dir)
+    except Exception as err:
+        return [ExampleResult(e, None, 0.0, repr(err)) for e in examples]
+    results = []
+    for e in examples:
+        start = time.perf_counter()
+        try:
+            with input_type(module).from_bytes(e.input) as f:
+                answer = get_part(module, e.part)(get_parse(module)(f))
+        except Exception as err:
+            results.append(
+                ExampleResult(e, None, time.perf_counter() - start, repr(err))
+            )
+            continue
+        results.append(
+            ExampleResult(
+                e, None if answer is None else str(answer), time.perf_counter() - start,
+            )
+        )
+    return results
+
+
+def _mtimes(day_dir: Path) -> Dict[Path, float]:
+    return {
+        p: p.stat().st_mtime
+        for p in day_dir.iterdir()
+        if p.suffix in (".py", ".json", ".txt") and p.is_file()
+    }
+
+
+def watch_examples(
+    day_dirs: List[Path],
+    report: Callable[[Path, List[ExampleResult]], None],
+    interval: float = WATCH_INTERVAL,
+):
+    """ Run the examples of each day in `day_dirs`, then re-run a day's
+    examples whenever one of its files changes. Runs until interrupted.
+    """
+    seen = {}
+    while True:
+        for day_dir in day_dirs:
+            mtimes = _mtimes(day_dir)
+            if seen.get(day_dir) != mtimes:
+                seen[day_dir] = mtimes
+                report(day_dir, run_examples(day_dir))
+        time.sleep(interval)
@@ -0,0 +1,76 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Iterable, List, Optional
+
+from aocpy import metrics
+from aocpy.cache import InputCache, get_cache
+from aocpy.exception import AocpyException
+from aocpy.puzzle import Puzzle, get_puzzle_input
+
+if TYPE_CHECKING:  # pragma: no cover
+    from aocpy import web
+
+DEFAULT_JOBS = 4
+
+
+@dataclass(frozen=True)
+class FetchResult:
+    puzzle: Puzzle
+    cached: bool
+    seconds: float = 0.0
+    size: int = 0
+    # An AocpyException or requests.RequestException
+    error: Optional[Exception] = None
+
+
+def _fetch_one(
+    session: "web.AuthSession", puzzle: Puzzle, cache: InputCache
+) -> FetchResult:
+    from requests import RequestException
+
+    start = time.perf_counter()
+    try:
+        puzzle_input = get_puzzle_input(session, puzzle, cache)
+    except (AocpyException, RequestException) as err:
+        # Reported for this puzzle alone, so the other fetches still complete
+        return FetchResult(puzzle, False, time.perf_counter() - start, error=err)
+    return FetchResult(
+        puzzle, False, time.perf_counter() - start, len(puzzle_input.encode())
+    )
+
+
+def fetch_inputs(
+    sessions: "web.SessionPool",
+    puzzles: Iterable[Puzzle],
+    jobs: int = DEFAULT_JOBS,
+    cache: Optional[InputCache] = None,
+) -> List[FetchResult]:
+    """ Fetch the input for each of `puzzles` into the local cache using up to
+    `jobs` concurrent requests, each made by the session in `sessions` for the
+    puzzle's account.
+
+    Puzzles whose input is already cached are skipped without any network
+    access. Results are returned in the same order as `puzzles`.
+    """
+    if cache is None:
+        cache = get_cache()
+    puzzles = list(puzzles)
+    results = {}
+    to_fetch = []
+    for p in puzzles:
+        if p in cache:
+            metrics.inc(metrics.CACHE_LOOKUPS, cache="input", result="hit")
+            results[p] = FetchResult(p, True)
+        else:
+            to_fetch.append(p)
+
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+        fetched = executor.map(
+            lambda p: _fetch_one(sessions.session(p.session_cookie), p, cache),
+            to_fetch,
+        )
+        for result in fetched:
+            results[result.puzzle] = result
+
+    return [results[p] for p in puzzles]
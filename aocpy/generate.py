@@ -1,12 +1,43 @@
+import functools
 from os import makedirs
-from os.path import dirname, exists, join
-from shutil import copyfile
-from typing import Iterable
+from os.path import exists, join
+from typing import Dict, List, Mapping, Optional, Sequence
 
 from aocpy.exception import AocpyException
+from aocpy.templating import Renderer, load_template
+from aocpy.utils import atomic_write, current_year
 
+FILE_MODE = 0o644
 
-def generate_day(day: int, puzzle_input: Iterable[str]):
+
+@functools.lru_cache(maxsize=None)
+def load_templates(template: str = "default") -> Dict[str, Renderer]:
+    """ Returns the renderer of each file generated for a day by `template`.
+    Templates are loaded once per process.
+    """
+    return load_template(template)
+
+
+def generate_day(
+    day: int,
+    puzzle_input: Optional[str],
+    template: str = "default",
+    year: Optional[int] = None,
+    title: str = "",
+    examples: Sequence = (),
+):
+    """ Generate the solution, tests and input of `day` from `template`, which
+    is rendered with the variables `year`, `day`, `title` and `examples`. The
+    input is not written if `puzzle_input` is None, e.g. when generating a day
+    ahead of its release.
+    """
+    renderers = load_templates(template)
+    variables = {
+        "year": current_year() if year is None else year,
+        "day": day,
+        "title": title,
+        "examples": list(examples),
+    }
     solution_dirname = f"{day:02}"
     solution_fname = join(solution_dirname, "solution.py")
 
@@ -15,11 +46,39 @@ def generate_day(day: int, puzzle_input: Iterable[str]):
 
     makedirs(solution_dirname, exist_ok=True)
 
-    copyfile(join(dirname(__file__), "templates/solution.py"), solution_fname)
-
+    # The solution is written last so that a day is only considered generated
+    # once all of its files exist
     test_fname = join(solution_dirname, f"test_day{solution_dirname}.py")
-    copyfile(join(dirname(__file__), "templates/test_solution.py"), test_fname)
+    atomic_write(test_fname, renderers["test"](variables), FILE_MODE)
+
+    if puzzle_input is not None:
+        puzzle_input_fname = join(solution_dirname, "input.txt")
+        atomic_write(puzzle_input_fname, puzzle_input, FILE_MODE)
+
+    atomic_write(solution_fname, renderers["solution"](variables), FILE_MODE)
+
 
-    puzzle_input_fname = join(solution_dirname, "input.txt")
-    with open(puzzle_input_fname, "w") as f:
-        f.write(puzzle_input)
+def generate_days(
+    puzzle_inputs: Mapping[int, str],
+    template: str = "default",
+    year: Optional[int] = None,
+    titles: Optional[Mapping[int, str]] = None,
+    examples: Optional[Mapping[int, Sequence]] = None,
+) -> List[int]:
+    """ Generate each day in `puzzle_inputs` that has not already been
+    generated, returning the days generated.
+    """
+    generated = []
+    for day, puzzle_input in sorted(puzzle_inputs.items()):
+        if exists(join(f"{day:02}", "solution.py")):
+            continue
+        generate_day(
+            day,
+            puzzle_input,
+            template,
+            year,
+            (titles or {}).get(day, ""),
+            (examples or {}).get(day, ()),
+        )
+        generated.append(day)
+    return generated
@@ -0,0 +1,74 @@
+import hashlib
+import json
+import os
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Optional
+
+from aocpy.cache import GLOBAL_CACHE_DIR
+from aocpy.exception import AocpyException
+from aocpy.utils import atomic_write
+
+HTTP_CACHE_DIRNAME = "http"
+DEFAULT_TTL = 300.0
+
+
+@dataclass
+class CachedResponse:
+    url: str
+    body: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    validated: float = 0.0
+
+
+class HTTPCache:
+    """ Persistent on-disk cache of GET response bodies, kept separately for
+    each account since pages differ between accounts.
+
+    Entries younger than `ttl` seconds are served without any request, older
+    entries are revalidated with a conditional request using their ETag and
+    Last-Modified validators.
+    """
+
+    def __init__(self, root: Path, ttl: float = DEFAULT_TTL):
+        self.root = root
+        self.ttl = ttl
+
+    def _path(self, account: str, url: str) -> Path:
+        return self.root / account / f"{hashlib.sha256(url.encode()).hexdigest()}.json"
+
+    def get(self, account: str, url: str) -> Optional[CachedResponse]:
+        try:
+            with open(self._path(account, url)) as f:
+                return CachedResponse(**json.load(f))
+        except (OSError, ValueError, TypeError):
+            return None
+
+    def put(self, account: str, entry: CachedResponse):
+        path = self._path(account, entry.url)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write(path, json.dumps(asdict(entry)))
+
+    def invalidate(self, account: str, url: str):
+        try:
+            self._path(account, url).unlink()
+        except FileNotFoundError:
+            pass
+
+    def is_fresh(self, entry: CachedResponse, ttl: Optional[float] = None) -> bool:
+        ttl = self.ttl if ttl is None else ttl
+        return time.time() - entry.validated < ttl
+
+
+def default_http_cache() -> HTTPCache:
+    """ Create an HTTPCache under the global cache directory with the TTL set
+    by the `AOC_HTTP_CACHE_TTL` environment variable (seconds).
+    """
+    try:
+        ttl = float(os.environ.get("AOC_HTTP_CACHE_TTL", DEFAULT_TTL))
+    except ValueError as err:
+        raise AocpyException(f"invalid AOC_HTTP_CACHE_TTL: {err}")
+    root = Path(os.path.expanduser(GLOBAL_CACHE_DIR)) / HTTP_CACHE_DIRNAME
+    return HTTPCache(root, ttl)
@@ -0,0 +1,209 @@
+""" Incremental polling of private leaderboards.
+
+Each poll revalidates the board through the HTTP cache and is compared with a
+local snapshot of the last poll, so an unchanged board costs one conditional
+request and is never re-parsed. Changes are reported as events:
+
+- `{"type": "star", "member": ..., "day": 1, "part": 2, "ts": ...}`
+- `{"type": "rank", "member": ..., "old": 3, "new": 2}`
+- `{"type": "join", "member": ...}` and `{"type": "leave", "member": ...}`
+- `{"type": "baseline", "members": 12}` on the first poll of a board
+- `{"type": "error", "error": ...}` if a poll fails
+
+Every event also has the `year` and `board` it came from and the `time` of
+the poll.
+"""
+import hashlib
+import json
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, List, Optional, Tuple
+
+from aocpy.exception import AocpyException
+from aocpy.utils import atomic_write, get_config_dir
+
+if TYPE_CHECKING:  # pragma: no cover
+    from aocpy import web
+
+# Advent of Code asks that private leaderboards are polled at most every 15
+# minutes
+MIN_POLL_INTERVAL = 900.0
+# A leaderboard is cached from when its response arrived, after the round that
+# fetched it started, so it must be treated as stale slightly before the next
+# round or it would only be fetched every other round
+POLL_LEEWAY = 30.0
+SNAPSHOTS_DIRNAME = "leaderboards"
+
+
+@dataclass
+class Member:
+    name: str
+    local_score: int = 0
+    last_star_ts: int = 0
+    # Completion time of each star, keyed by "day.part"
+    stars: Dict[str, int] = field(default_factory=dict)
+
+
+@dataclass
+class Snapshot:
+    digest: str
+    members: Dict[str, Member]
+
+
+def parse_leaderboard(text: str) -> Dict[str, Member]:
+    """ Returns the members of a leaderboard from its JSON, keyed by id.
+
+    Raises:
+        `AocpyException` if `text` is not a leaderboard
+    """
+    try:
+        members = json.loads(text)["members"]
+        return {
+            str(member_id): Member(
+                m.get("name") or f"(anonymous user #{member_id})",
+                int(m.get("local_score") or 0),
+                int(m.get("last_star_ts") or 0),
+                {
+                    f"{day}.{part}": int(star["get_star_ts"])
+                    for day, parts in m.get("completion_day_level", {}).items()
+                    for part, star in parts.items()
+                },
+            )
+            for member_id, m in members.items()
+        }
+    except (ValueError, KeyError, TypeError, AttributeError) as err:
+        raise AocpyException(f"invalid leaderboard: {err!r}")
+
+
+def ranks(members: Dict[str, Member]) -> Dict[str, int]:
+    """ Returns the position of each member on the leaderboard, ordered by
+    local score and then by who reached it first.
+    """
+    order = sorted(
+        members, key=lambda i: (-members[i].local_score, members[i].last_star_ts, i)
+    )
+    return {member_id: rank for rank, member_id in enumerate(order, 1)}
+
+
+def diff(old: Dict[str, Member], new: Dict[str, Member]) -> List[dict]:
+    """ Returns the events between two polls of a leaderboard.
+    """
+    events = []
+    for member_id in old.keys() - new.keys():
+        events.append({"type": "leave", "member": old[member_id].name})
+    for member_id, m in new.items():
+        if member_id not in old:
+            events.append({"type": "join", "member": m.name})
+        stars = old[member_id].stars if member_id in old else {}
+        for key in sorted(m.stars.keys() - stars.keys(), key=lambda k: m.stars[k]):
+            day, part = key.split(".")
+            events.append(
+                {
+                    "type": "star",
+                    "member": m.name,
+                    "day": int(day),
+                    "part": int(part),
+                    "ts": m.stars[key],
+                }
+            )
+    old_ranks = ranks(old)
+    for member_id, rank in sorted(ranks(new).items(), key=lambda item: item[1]):
+        if member_id in old_ranks and old_ranks[member_id] != rank:
+            events.append(
+                {
+                    "type": "rank",
+                    "member": new[member_id].name,
+                    "old": old_ranks[member_id],
+                    "new": rank,
+                }
+            )
+    return events
+
+
+class Snapshots:
+    """ The last poll of each leaderboard, stored as JSON under `root`.
+    """
+
+    def __init__(self, root: Path):
+        self.root = root
+
+    @classmethod
+    def default(cls) -> "Snapshots":
+        return cls(get_config_dir() / SNAPSHOTS_DIRNAME)
+
+    def _path(self, year: int, board_id: str) -> Path:
+        return self.root / str(year) / f"{board_id}.json"
+
+    def get(self, year: int, board_id: str) -> Optional[Snapshot]:
+        try:
+            with open(self._path(year, board_id)) as f:
+                data = json.load(f)
+            return Snapshot(
+                data["digest"], {i: Member(**m) for i, m in data["members"].items()},
+            )
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def put(self, year: int, board_id: str, snapshot: Snapshot):
+        path = self._path(year, board_id)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write(path, json.dumps(asdict(snapshot)))
+
+
+def poll(
+    session: "web.AuthSession",
+    year: int,
+    board_id: str,
+    snapshots: Snapshots,
+    interval: float = MIN_POLL_INTERVAL,
+) -> List[dict]:
+    """ Fetch a leaderboard, unless it was fetched less than `interval` seconds
+    ago, and return the events since the last poll.
+    """
+    from aocpy import web
+
+    text = web.fetch_leaderboard(session, year, board_id, ttl=interval)
+    digest = hashlib.sha256(text.encode()).hexdigest()
+    previous = snapshots.get(year, board_id)
+    if previous is not None and previous.digest == digest:
+        return []
+    members = parse_leaderboard(text)
+    snapshots.put(year, board_id, Snapshot(digest, members))
+    if previous is None:
+        return [{"type": "baseline", "members": len(members)}]
+    return diff(previous.members, members)
+
+
+def watch(
+    session: "web.AuthSession",
+    boards: List[Tuple[int, str]],
+    interval: float = MIN_POLL_INTERVAL,
+    snapshots: Optional[Snapshots] = None,
+    rounds: Optional[int] = None,
+    sleep: Callable[[float], None] = time.sleep,
+) -> Iterator[dict]:
+    """ Poll each `(year, board_id)` in `boards` every `interval` seconds, at
+    least `MIN_POLL_INTERVAL`, yielding the events of each poll. Stops after
+    `rounds` polls of every board if given.
+    """
+    from requests import RequestException
+
+    interval = max(interval, MIN_POLL_INTERVAL)
+    snapshots = snapshots or Snapshots.default()
+    polled = 0
+    while rounds is None or polled < rounds:
+        start = time.time()
+        for year, board_id in boards:
+            context = {"year": year, "board": board_id, "time": int(time.time())}
+            try:
+                events = poll(
+                    session, year, board_id, snapshots, interval - POLL_LEEWAY
+                )
+            except (AocpyException, RequestException) as err:
+                events = [{"type": "error", "error": str(err)}]
+            for event in events:
+                yield {**event, **context}
+        polled += 1
+        if rounds is None or polled < rounds:
+            sleep(max(0.0, start + interval - time.time()))
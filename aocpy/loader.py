@@ -0,0 +1,109 @@
+import io
+import mmap
+import os
+import re
+from typing import Iterator, List, Optional, Union
+
+INT_RE = re.compile(rb"-?\d+")
+
+
+class InputFile:
+    """ Read-only view of a puzzle input file.
+
+    The file is memory mapped rather than read into memory, and the iterators
+    read directly from the mapping so that large inputs are never copied in
+    full. `read`, `readlines` and iteration are provided for compatibility with
+    ordinary text files.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._f: Optional[io.BufferedReader] = open(path, "rb")
+        self._data: Union[mmap.mmap, bytes] = b""
+        self._closed = False
+        if os.fstat(self._f.fileno()).st_size:
+            self._data = mmap.mmap(self._f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    @classmethod
+    def from_bytes(cls, data: Union[bytes, str], path: str = "<input>"):
+        """ Create an InputFile over in-memory data, e.g. example input.
+        """
+        self = cls.__new__(cls)
+        self.path = path
+        self._f = None
+        self._data = data.encode() if isinstance(data, str) else bytes(data)
+        self._closed = False
+        return self
+
+    @property
+    def buffer(self) -> memoryview:
+        """ Zero-copy view of the whole input.
+        """
+        return memoryview(self._data)
+
+    def raw_lines(self) -> Iterator[memoryview]:
+        """ Yields a zero-copy view of each line, excluding line endings.
+        """
+        buf = self.buffer
+        data = self._data
+        start = 0
+        size = len(buf)
+        while start < size:
+            end = data.find(b"\n", start)
+            if end == -1:
+                end = size
+            stop = end - 1 if end > start and buf[end - 1] == ord("\r") else end
+            yield buf[start:stop]
+            start = end + 1
+
+    def lines(self) -> Iterator[str]:
+        """ Yields each line decoded and stripped of surrounding whitespace.
+        """
+        for line in self.raw_lines():
+            yield str(line, "utf-8").strip()
+
+    def ints(self) -> Iterator[int]:
+        """ Yields every integer in the input, in order.
+        """
+        for m in INT_RE.finditer(self._data):
+            yield int(m.group())
+
+    def grid(self) -> Iterator[memoryview]:
+        """ Yields each non-empty row of a character grid as a zero-copy view.
+        Cells are byte values i.e. `row[x] == ord("#")`.
+        """
+        for line in self.raw_lines():
+            if len(line):
+                yield line
+
+    def read(self) -> str:
+        return str(self.buffer, "utf-8")
+
+    def readlines(self) -> List[str]:
+        return self.read().splitlines(keepends=True)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.readlines())
+
+    def close(self):
+        if isinstance(self._data, mmap.mmap):
+            try:
+                self._data.close()
+            except BufferError:
+                # Views of the input are still in use, the mapping is released
+                # once they are garbage collected.
+                pass
+        self._data = b""
+        if self._f is not None:
+            self._f.close()
+        self._closed = True
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
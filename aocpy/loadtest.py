@@ -0,0 +1,136 @@
+""" Load testing of aocpy's network path against an Advent of Code server,
+normally the local stand-in of `aocpy.standin`.
+
+Puzzle inputs are fetched with `get_puzzle_input` through a `SessionPool`
+from several threads at once, as `aocpy fetch` and `aocpy begin --all` do,
+and the latency of each fetch is recorded.
+"""
+import os
+import re
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from aocpy import web
+from aocpy.cache import SQLiteCache
+from aocpy.exception import AocpyException
+from aocpy.metrics import quantile
+from aocpy.puzzle import Puzzle, get_puzzle_input
+
+# Effectively unlimited, so that only the server limits the request rate
+UNLIMITED_RATE = 1e9
+
+
+@dataclass
+class LoadTestReport:
+    requests: int
+    concurrency: int
+    elapsed: float
+    latencies: List[float] = field(repr=False)
+    errors: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def throughput(self) -> float:
+        """ Requests completed per second.
+        """
+        return self.requests / self.elapsed if self.elapsed else 0.0
+
+    def percentile(self, q: float) -> float:
+        return quantile(self.latencies, q)
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "requests": self.requests,
+            "concurrency": self.concurrency,
+            "errors": sum(self.errors.values()),
+            "elapsed": self.elapsed,
+            "throughput": self.throughput,
+            "p50": self.percentile(0.5),
+            "p95": self.percentile(0.95),
+            "p99": self.percentile(0.99),
+            "max": self.latencies[-1],
+        }
+
+
+@contextmanager
+def base_url(url: str) -> Iterator[None]:
+    """ Direct requests to `url` instead of adventofcode.com for the duration of
+    the context.
+    """
+    previous = os.environ.get("AOC_BASE_URL")
+    os.environ["AOC_BASE_URL"] = url
+    try:
+        yield
+    finally:
+        if previous is None:
+            del os.environ["AOC_BASE_URL"]
+        else:
+            os.environ["AOC_BASE_URL"] = previous
+
+
+def puzzles(requests: int, accounts: int, year: int) -> List[Puzzle]:
+    """ Returns `requests` puzzles, cycling through the days of `year` for each
+    of `accounts` session cookies.
+    """
+    return [
+        Puzzle(year, i % 25 + 1, f"loadtest-{i // 25 % accounts}")
+        for i in range(requests)
+    ]
+
+
+def unlimited_limiter(concurrency: int) -> web.RateLimiter:
+    return web.RateLimiter(UNLIMITED_RATE, concurrency)
+
+
+def run_load_test(
+    url: str,
+    requests: int,
+    concurrency: int,
+    accounts: int = 1,
+    year: int = 2020,
+    cached: bool = False,
+    limiter: Optional[web.RateLimiter] = None,
+) -> LoadTestReport:
+    """ Fetch `requests` puzzle inputs from the server at `url` using up to
+    `concurrency` connections.
+
+    With `cached` inputs are fetched through an empty input cache, so repeated
+    puzzles are not requested again. Requests are scheduled by `limiter`, which
+    defaults to `web.default_rate_limiter()`; against a stand-in an
+    `unlimited_limiter` leaves the server as the only limit.
+    """
+    pool = web.SessionPool(pool_size=concurrency, limiter=limiter)
+    with tempfile.TemporaryDirectory() as tmp, base_url(url):
+        cache = SQLiteCache(Path(tmp) / "inputs.sqlite3") if cached else None
+        # Created up front, since Puzzle URLs are taken from AOC_BASE_URL
+        work = puzzles(requests, accounts, year)
+
+        def fetch(p: Puzzle) -> Tuple[float, Optional[str]]:
+            session = pool.session(p.session_cookie)
+            start = time.perf_counter()
+            error = None
+            try:
+                if cache is None:
+                    web.fetch_puzzle_input(session, p.url)
+                else:
+                    get_puzzle_input(session, p, cache)
+            except Exception as err:
+                error = str(err) if isinstance(err, AocpyException) else repr(err)
+            return time.perf_counter() - start, error
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            results = list(executor.map(fetch, work))
+        elapsed = time.perf_counter() - start
+    errors: Dict[str, int] = {}
+    for _, error in results:
+        if error is not None:
+            # Errors are counted by kind rather than by puzzle
+            kind = re.sub(r" fetching \S+", "", error)
+            errors[kind] = errors.get(kind, 0) + 1
+    latencies = sorted(latency for latency, _ in results)
+    return LoadTestReport(requests, concurrency, elapsed, latencies, errors)
@@ -0,0 +1,181 @@
+""" Memoisation of solution results, keyed by a hash of the solution's
+bytecode, the bytecode of the local modules it imports and its input.
+"""
+import ast
+import functools
+import hashlib
+import io
+import json
+import marshal
+import os
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Set, Union
+
+from aocpy.exception import AocpyException
+from aocpy.utils import get_config_dir
+
+RESULTS_FNAME = "results.sqlite3"
+DEFAULT_MAX_ENTRIES = 1000
+
+
+def _local_imports(path: Path, tree: ast.AST) -> Set[Path]:
+    """ Returns the modules in the same directory as `path` imported by `tree`.
+    """
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(alias.name.split(".")[0] for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names.add(node.module.split(".")[0])
+    modules = set()
+    for name in names:
+        for candidate in (path.parent / f"{name}.py", path.parent / name):
+            if candidate.is_file() or (candidate / "__init__.py").is_file():
+                modules.add(candidate)
+    return modules
+
+
+def _hash_module(path: Path, digest, seen: Set[Path]):
+    if path in seen:
+        return
+    seen.add(path)
+    if path.is_dir():
+        for child in sorted(path.rglob("*.py")):
+            _hash_module(child, digest, seen)
+        return
+    source = path.read_bytes()
+    tree = ast.parse(source, str(path))
+    # Compiled with a relative filename so that copying or moving the day
+    # directory does not change the key
+    code = compile(tree, path.name, "exec")
+    digest.update(path.name.encode())
+    digest.update(marshal.dumps(code))
+    for module in sorted(_local_imports(path, tree)):
+        _hash_module(module, digest, seen)
+
+
+def solution_key(solution_path: Path, puzzle_input: Union[bytes, memoryview]) -> str:
+    """ Returns the memoisation key of running the solution at `solution_path`
+    with `puzzle_input`, which is hashed without being copied.
+    """
+    digest = hashlib.sha256()
+    digest.update(sys.implementation.cache_tag.encode())
+    try:
+        _hash_module(solution_path.resolve(), digest, set())
+    except (OSError, SyntaxError, ValueError) as err:
+        raise AocpyException(f"unable to hash {solution_path}: {err}")
+    digest.update(hashlib.sha256(puzzle_input).digest())
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """ SQLite store of solution results. The least recently used results are
+    evicted once there are more than `max_entries`.
+    """
+
+    SCHEMA = """
+    CREATE TABLE IF NOT EXISTS results (
+        key TEXT PRIMARY KEY,
+        value TEXT NOT NULL,
+        accessed REAL NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed);
+    """
+
+    def __init__(self, path: Path, max_entries: int = DEFAULT_MAX_ENTRIES):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(path), timeout=30, check_same_thread=False)
+        self._db.executescript(self.SCHEMA)
+
+    @classmethod
+    def default(cls) -> "ResultCache":
+        """ Create the result cache in the aocpy config directory, bounded by
+        the `AOC_RESULT_CACHE_SIZE` environment variable (number of results).
+        """
+        try:
+            max_entries = int(
+                os.environ.get("AOC_RESULT_CACHE_SIZE", DEFAULT_MAX_ENTRIES)
+            )
+        except ValueError as err:
+            raise AocpyException(f"invalid AOC_RESULT_CACHE_SIZE: {err}")
+        return cls(get_config_dir() / RESULTS_FNAME, max_entries)
+
+    def get(self, key: str):
+        with self._lock, self._db:
+            row = self._db.execute(
+                "SELECT value FROM results WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._db.execute(
+                "UPDATE results SET accessed = ? WHERE key = ?", (time.time(), key)
+            )
+        return json.loads(row[0])
+
+    def put(self, key: str, value):
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?)",
+                (key, json.dumps(value), time.time()),
+            )
+            self._db.execute(
+                "DELETE FROM results WHERE key IN ("
+                "SELECT key FROM results ORDER BY accessed DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+
+class _Tee(io.TextIOBase):
+    def __init__(self, stream):
+        self.stream = stream
+        self.captured = io.StringIO()
+
+    def write(self, s):
+        self.captured.write(s)
+        return self.stream.write(s)
+
+    def flush(self):
+        self.stream.flush()
+
+
+def memoize_main(main: Callable) -> Callable:
+    """ Decorator for a solution's `main(puzzle_input_f)` which replays the
+    output of a previous run with the same solution code and input instead of
+    running it again.
+
+    Memoisation is skipped if the `AOC_NO_CACHE` environment variable is set,
+    as it is by the `--no-cache` option of `input_cli`.
+    """
+
+    @functools.wraps(main)
+    def wrapper(puzzle_input_f):
+        if os.environ.get("AOC_NO_CACHE"):
+            return main(puzzle_input_f)
+        solution_path = Path(main.__code__.co_filename)
+        key = "main:" + solution_key(solution_path, puzzle_input_f.buffer)
+        cache = ResultCache.default()
+        output = cache.get(key)
+        if output is not None:
+            sys.stdout.write(output)
+            return None
+        tee = _Tee(sys.stdout)
+        sys.stdout = tee
+        try:
+            result = main(puzzle_input_f)
+        finally:
+            sys.stdout = tee.stream
+        cache.put(key, tee.captured.getvalue())
+        return result
+
+    return wrapper
@@ -0,0 +1,318 @@
+""" Counters and latency histograms of requests to adventofcode.com and of the
+caches in front of it.
+
+Metrics are only recorded if the `AOC_METRICS` environment variable lists one
+or more comma separated sinks:
+
+- `jsonl` appends every observation to `~/.config/aocpy/metrics.jsonl`, which
+  `aocpy stats` summarises across runs
+- `openmetrics` writes the totals of the process to
+  `~/.config/aocpy/metrics.prom` in the OpenMetrics text format when it exits
+
+Each observation is a JSON object such as
+`{"time": ..., "kind": "histogram", "name": "aocpy_http_request_duration_seconds",
+"labels": {"endpoint": "input", "method": "GET"}, "value": 0.21}`.
+"""
+import atexit
+import bisect
+import functools
+import json
+import math
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from aocpy.exception import AocpyException
+from aocpy.utils import atomic_write, get_config_dir
+
+JSONL_FNAME = "metrics.jsonl"
+OPENMETRICS_FNAME = "metrics.prom"
+# Upper bounds in seconds, spanning cache revalidations to slow input fetches
+DEFAULT_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+REQUEST_DURATION = "aocpy_http_request_duration_seconds"
+RESPONSES = "aocpy_http_responses"
+RESPONSE_BYTES = "aocpy_http_response_bytes"
+RETRIES = "aocpy_http_retries"
+RATE_LIMIT_WAIT = "aocpy_rate_limit_wait_seconds"
+CACHE_LOOKUPS = "aocpy_cache_lookups"
+
+_ENDPOINTS = (
+    (re.compile(r"/\d+/day/\d+/input$"), "input"),
+    (re.compile(r"/\d+/day/\d+/answer$"), "answer"),
+    (re.compile(r"/\d+/day/\d+$"), "puzzle"),
+    (re.compile(r"/\d+/leaderboard/private/view/"), "leaderboard"),
+)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def endpoint(url: str) -> str:
+    """ Returns the kind of adventofcode.com page `url` is, used to label its
+    metrics without a series per puzzle.
+    """
+    for pattern, name in _ENDPOINTS:
+        if pattern.search(url):
+            return name
+    return "other"
+
+
+class Histogram:
+    """ Counts of observations no greater than each of `buckets`, along with
+    their total and number.
+    """
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        # The final count is of observations above every bucket
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> Iterator[Tuple[str, int]]:
+        """ Yields each bucket's upper bound and the number of observations no
+        greater than it, ending with `+Inf`.
+        """
+        total = 0
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            yield repr(float(bound)), total
+        yield "+Inf", self.count
+
+
+class JSONLinesSink:
+    """ Appends every observation to `path` as a line of JSON.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def record(self, sample: Dict):
+        line = json.dumps(sample) + "\n"
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # A single small append is not interleaved with those of other
+            # processes
+            with open(self.path, "a") as f:
+                f.write(line)
+
+    def flush(self, registry: "Registry"):
+        pass
+
+
+class OpenMetricsSink:
+    """ Writes the totals of a registry to `path` in the OpenMetrics text
+    format, replacing any previous totals.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+
+    def record(self, sample: Dict):
+        pass
+
+    def flush(self, registry: "Registry"):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write(self.path, registry.to_openmetrics())
+
+
+SINKS = {"jsonl": JSONL_FNAME, "openmetrics": OPENMETRICS_FNAME}
+
+
+class Registry:
+    """ Thread-safe totals of counters and histograms, keyed by metric name and
+    labels. Every observation is also passed to each of `sinks`.
+    """
+
+    def __init__(self, sinks: Iterable = (), buckets=DEFAULT_BUCKETS):
+        self.sinks = list(sinks)
+        self.buckets = buckets
+        self.counters: Dict[str, Dict[Labels, float]] = {}
+        self.histograms: Dict[str, Dict[Labels, Histogram]] = {}
+        self._lock = threading.Lock()
+
+    def _record(self, kind: str, name: str, value: float, labels: Dict[str, str]):
+        for sink in self.sinks:
+            sink.record(
+                {
+                    "time": time.time(),
+                    "kind": kind,
+                    "name": name,
+                    "labels": labels,
+                    "value": value,
+                }
+            )
+
+    def inc(self, name: str, value: float = 1, **labels: str):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self.counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+        self._record("counter", name, value, labels)
+
+    def observe(self, name: str, value: float, **labels: str):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self.histograms.setdefault(name, {})
+            if key not in series:
+                series[key] = Histogram(self.buckets)
+            series[key].observe(value)
+        self._record("histogram", name, value, labels)
+
+    def add(self, sample: Dict):
+        """ Add an observation previously recorded by a `JSONLinesSink`.
+        """
+        labels = {k: str(v) for k, v in sample["labels"].items()}
+        if sample["kind"] == "histogram":
+            self.observe(sample["name"], sample["value"], **labels)
+        else:
+            self.inc(sample["name"], sample["value"], **labels)
+
+    def flush(self):
+        for sink in self.sinks:
+            sink.flush(self)
+
+    def to_openmetrics(self) -> str:
+        lines = []
+        with self._lock:
+            for name, series in sorted(self.counters.items()):
+                lines.append(f"# TYPE {name} counter")
+                for labels, value in sorted(series.items()):
+                    lines.append(
+                        f"{name}_total{_format_labels(labels)} {_format_value(value)}"
+                    )
+            for name, series in sorted(self.histograms.items()):
+                lines.append(f"# TYPE {name} histogram")
+                for labels, h in sorted(series.items()):
+                    for bound, count in h.cumulative():
+                        bucket_labels = _format_labels(labels + (("le", bound),))
+                        lines.append(f"{name}_bucket{bucket_labels} {count}")
+                    lines.append(
+                        f"{name}_sum{_format_labels(labels)} {_format_value(h.sum)}"
+                    )
+                    lines.append(f"{name}_count{_format_labels(labels)} {h.count}")
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    escaped = (
+        (k, v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for k, v in labels
+    )
+    return "{" + ",".join(f'{k}="{v}"' for k, v in escaped) + "}"
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+@functools.lru_cache(maxsize=None)
+def _registry(spec: str, config_dir: str) -> Optional[Registry]:
+    names = [name.strip() for name in spec.split(",") if name.strip()]
+    if not names:
+        return None
+    unknown = set(names) - set(SINKS)
+    if unknown:
+        raise AocpyException(f"invalid AOC_METRICS sinks: {', '.join(sorted(unknown))}")
+    sinks = []
+    for name in names:
+        path = Path(config_dir) / SINKS[name]
+        sinks.append(JSONLinesSink(path) if name == "jsonl" else OpenMetricsSink(path))
+    registry = Registry(sinks)
+    atexit.register(registry.flush)
+    return registry
+
+
+def default_registry() -> Optional[Registry]:
+    """ Returns the registry of the sinks listed by the `AOC_METRICS`
+    environment variable, or None if metrics are disabled.
+    """
+    return _registry(os.environ.get("AOC_METRICS", ""), str(get_config_dir()))
+
+
+def inc(name: str, value: float = 1, **labels: str):
+    """ Add `value` to a counter of the default registry, if enabled.
+    """
+    registry = default_registry()
+    if registry is not None:
+        registry.inc(name, value, **labels)
+
+
+def observe(name: str, value: float, **labels: str):
+    """ Add an observation to a histogram of the default registry, if enabled.
+    """
+    registry = default_registry()
+    if registry is not None:
+        registry.observe(name, value, **labels)
+
+
+def read_samples(path: Path) -> Iterator[Dict]:
+    """ Yields the observations recorded in a JSON lines file, skipping any
+    line left incomplete by an interrupted write.
+    """
+    with open(path) as f:
+        for line in f:
+            try:
+                sample = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(sample, dict) and {"kind", "name", "labels", "value"} <= set(
+                sample
+            ):
+                yield sample
+
+
+def quantile(values: List[float], q: float) -> float:
+    """ Returns the `q` quantile of sorted `values` by the nearest-rank method.
+    """
+    if not values:
+        raise ValueError("quantile of no values")
+    rank = math.ceil(q * len(values))
+    return values[min(max(rank, 1), len(values)) - 1]
+
+
+@dataclass
+class Summary:
+    """ Totals of recorded observations, along with every request latency by
+    endpoint in ascending order.
+    """
+
+    registry: Registry = field(default_factory=Registry)
+    latencies: Dict[str, List[float]] = field(default_factory=dict)
+
+    def total(self, name: str, **labels: str) -> float:
+        """ Returns the sum of the counters `name` with the given labels.
+        """
+        wanted = set(labels.items())
+        return sum(
+            value
+            for key, value in self.registry.counters.get(name, {}).items()
+            if wanted <= set(key)
+        )
+
+
+def summarize(samples: Iterable[Dict]) -> Summary:
+    summary = Summary()
+    for sample in samples:
+        summary.registry.add(sample)
+        if sample["name"] == REQUEST_DURATION:
+            endpoint = sample["labels"].get("endpoint", "other")
+            summary.latencies.setdefault(endpoint, []).append(sample["value"])
+    for values in summary.latencies.values():
+        values.sort()
+    return summary
@@ -0,0 +1,143 @@
+""" Vectorised puzzle input parsers backed by NumPy.
+
+NumPy is an optional dependency, install it with `pip install aocpy[numpy]`.
+Each parser accepts an `InputFile`, any bytes-like object or a `str`.
+"""
+import re
+from typing import List, Union
+
+from aocpy.exception import AocpyException
+from aocpy.loader import INT_RE, InputFile
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+BLANK_LINE_RE = re.compile(rb"\r?\n(?:[ \t]*\r?\n)+")
+# Any integer of up to 18 digits fits an int64
+MAX_INT_DIGITS = 18
+
+Data = Union[InputFile, bytes, bytearray, memoryview, str]
+
+
+def _require_numpy():
+    if np is None:
+        raise AocpyException("numpy is required, install it with aocpy[numpy]")
+
+
+def _buffer(data: Data) -> memoryview:
+    if isinstance(data, InputFile):
+        return data.buffer
+    if isinstance(data, str):
+        return memoryview(data.encode())
+    return memoryview(data).cast("B")
+
+
+def _rstrip(buf: memoryview) -> memoryview:
+    end = len(buf)
+    while end and buf[end - 1] in b"\r\n":
+        end -= 1
+    return buf[:end]
+
+
+def char_grid(data: Data) -> "np.ndarray":
+    """ Returns a read-only 2-D array of single byte characters (dtype `S1`)
+    from a rectangular grid, i.e. `grid[y, x] == b"#"`.
+
+    The array is a strided view of the input and shares its memory.
+    """
+    _require_numpy()
+    buf = _rstrip(_buffer(data))
+    if not len(buf):
+        return np.empty((0, 0), dtype="S1")
+    flat = np.frombuffer(buf, dtype=np.uint8)
+    newlines = np.flatnonzero(flat == ord("\n"))
+    if not len(newlines):
+        return flat.reshape(1, -1).view("S1")
+    width = int(newlines[0])
+    stride = width + 1
+    crlf = width and flat[width - 1] == ord("\r")
+    if crlf:
+        width -= 1
+    rows = len(newlines) + 1
+    # Every row must end at the same column, not only add up to the same total
+    if (
+        (rows - 1) * stride + width != len(flat)
+        or not np.array_equal(newlines, np.arange(1, rows) * stride - 1)
+        or (crlf and not (flat[newlines - 1] == ord("\r")).all())
+    ):
+        raise AocpyException("grid rows must all be the same length")
+    return np.lib.stride_tricks.as_strided(
+        flat, shape=(rows, width), strides=(stride, 1), writeable=False
+    ).view("S1")
+
+
+def digit_grid(data: Data) -> "np.ndarray":
+    """ Returns a 2-D `int8` array from a rectangular grid of digits.
+    """
+    return char_grid(data).view(np.uint8).astype(np.int8) - ord("0")
+
+
+def _ints_exact(buf: memoryview, dtype: "np.dtype") -> "np.ndarray":
+    # Integers too long for the vectorised parse are converted one at a time
+    try:
+        return np.fromiter((int(m.group()) for m in INT_RE.finditer(buf)), dtype=dtype)
+    except OverflowError as err:
+        raise AocpyException(f"integer in input does not fit {dtype}: {err}")
+
+
+def ints(data: Data, dtype=None) -> "np.ndarray":
+    """ Returns every integer in the input as a contiguous 1-D array.
+
+    Digits are located and converted with vectorised operations over the
+    input buffer, without creating a Python object per integer.
+
+    Raises:
+        `AocpyException` if an integer does not fit `dtype`
+    """
+    _require_numpy()
+    dtype = np.dtype(dtype or np.int64)
+    buf = _buffer(data)
+    flat = np.frombuffer(buf, dtype=np.uint8)
+    # Bytes below "0" wrap around, so only digits are less than 10
+    digits = flat - np.uint8(ord("0"))
+    is_digit = digits < 10
+    edges = np.diff(is_digit.view(np.int8), prepend=0, append=0)
+    starts = np.flatnonzero(edges == 1)
+    if not len(starts):
+        return np.empty(0, dtype=dtype)
+    lengths = np.flatnonzero(edges == -1) - starts
+    if lengths.max() > MAX_INT_DIGITS:
+        return _ints_exact(buf, dtype)
+    # Each digit is scaled by its place value within its run, and each run
+    # summed
+    run_ends = np.cumsum(lengths)
+    offsets = run_ends - lengths
+    places = np.repeat(run_ends, lengths) - 1 - np.arange(run_ends[-1])
+    values = np.add.reduceat(
+        digits[is_digit] * np.power(10, places, dtype=np.int64), offsets
+    )
+    negative = np.zeros(len(starts), dtype=bool)
+    negative[starts > 0] = flat[starts[starts > 0] - 1] == ord("-")
+    values[negative] *= -1
+    if dtype.kind in "iu":
+        info = np.iinfo(dtype)
+        if values.min() < info.min or values.max() > info.max:
+            raise AocpyException(f"integer in input does not fit {dtype}")
+    return values.astype(dtype, copy=False)
+
+
+def blocks(data: Data) -> List[memoryview]:
+    """ Splits the input into blank line separated blocks, returning a
+    zero-copy view of each block.
+    """
+    buf = _rstrip(_buffer(data))
+    result = []
+    start = 0
+    for m in BLANK_LINE_RE.finditer(buf):
+        result.append(buf[start : m.start()])
+        start = m.end()
+    if start < len(buf):
+        result.append(buf[start:])
+    return result
@@ -0,0 +1,175 @@
+""" Profiling of a single part of a generated solution.
+
+Three profilers are supported:
+
+- `cprofile`: deterministic profiling with `cProfile`, written as pstats
+- `sample`: statistical profiling of the stack every `interval` seconds,
+  written in the collapsed stack format read by flamegraph tools
+- `tracemalloc`: allocation tracing, written as a `tracemalloc` snapshot
+"""
+import cProfile
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+
+from aocpy.exception import AocpyException
+from aocpy.runner import get_parse, get_part, input_type, load_solution
+
+MODES = ("cprofile", "sample", "tracemalloc")
+DEFAULT_TOP = 20
+DEFAULT_INTERVAL = 0.001
+
+
+@dataclass
+class ProfileReport:
+    mode: str
+    part: int
+    answer: object
+    seconds: float
+    output: Path
+    unit: str
+    # Hottest functions, or allocation sites, and their cost in `unit`
+    top: List[Tuple[str, float]] = field(default_factory=list)
+
+
+def _location(code) -> str:
+    return f"{Path(code.co_filename).name}:{code.co_name}"
+
+
+class Sampler:
+    """ Records the stack of the calling thread every `interval` seconds from a
+    background thread. Only frames called from the frame that started the
+    sampler are recorded, excluding those of this module.
+    """
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL):
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self._target = threading.get_ident()
+        self._root = sys._getframe(1)
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._target)
+            stack = []
+            while frame is not None and frame is not self._root:
+                if frame.f_code.co_filename != __file__:
+                    stack.append(_location(frame.f_code))
+                frame = frame.f_back
+            if frame is not None and stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def write_collapsed(self, path: Path):
+        with open(path, "w") as f:
+            for stack, count in sorted(self.stacks.items()):
+                f.write(f"{stack} {count}\n")
+
+    def top(self, n: int) -> List[Tuple[str, float]]:
+        """ Returns the `n` functions with the most samples at the top of the
+        stack.
+        """
+        leaves: Counter = Counter()
+        for stack, count in self.stacks.items():
+            leaves[stack.rsplit(";", 1)[-1]] += count
+        return leaves.most_common(n)
+
+
+def _run_cprofile(run: Callable[[], object], output: Path, top: int):
+    profiler = cProfile.Profile()
+    answer = profiler.runcall(run)
+    profiler.dump_stats(str(output))
+    stats = pstats.Stats(profiler).stats
+    # Each entry is (call count, primitive calls, own time, cumulative time, callers)
+    hottest = sorted(stats.items(), key=lambda item: item[1][2], reverse=True)
+    return (
+        answer,
+        "s",
+        [(f"{Path(f).name}:{name}", entry[2]) for (f, _, name), entry in hottest[:top]],
+    )
+
+
+def _run_sample(run: Callable[[], object], output: Path, top: int):
+    sampler = Sampler()
+    sampler.start()
+    try:
+        answer = run()
+    finally:
+        sampler.stop()
+    sampler.write_collapsed(output)
+    return answer, "samples", sampler.top(top)
+
+
+def _run_tracemalloc(run: Callable[[], object], output: Path, top: int):
+    tracemalloc.start(25)
+    try:
+        answer = run()
+        snapshot = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+    snapshot = snapshot.filter_traces(
+        [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ]
+    )
+    snapshot.dump(str(output))
+    sites = snapshot.statistics("lineno")[:top]
+    return (
+        answer,
+        "B",
+        [
+            (f"{Path(s.traceback[0].filename).name}:{s.traceback[0].lineno}", s.size)
+            for s in sites
+        ],
+    )
+
+
+PROFILERS = {
+    "cprofile": (_run_cprofile, "pstats"),
+    "sample": (_run_sample, "collapsed"),
+    "tracemalloc": (_run_tracemalloc, "tracemalloc"),
+}
+
+
+def profile_day(
+    day_dir: Path,
+    input_path: Path,
+    part: int = 1,
+    mode: str = "cprofile",
+    output_dir: Optional[Path] = None,
+    top: int = DEFAULT_TOP,
+) -> ProfileReport:
+    """ Parse `input_path` and run `part` of the solution in `day_dir` under the
+    profiler selected by `mode`, writing the profile to `output_dir`, which
+    defaults to `day_dir`.
+    """
+    if mode not in PROFILERS:
+        raise AocpyException(f"unknown profiler {mode!r}, expected one of {MODES}")
+    module = load_solution(day_dir)
+    parse = get_parse(module)
+    solve = get_part(module, part)
+    runner, extension = PROFILERS[mode]
+    output_dir = output_dir or day_dir
+    output_dir.mkdir(parents=True, exist_ok=True)
+    output = output_dir / f"part_{part}.{extension}"
+    with input_type(module)(str(input_path)) as f:
+        start = time.perf_counter()
+        answer, unit, hottest = runner(lambda: solve(parse(f)), output, top)
+        seconds = time.perf_counter() - start
+    return ProfileReport(mode, part, answer, seconds, output, unit, hottest)
@@ -1,11 +1,11 @@
 import logging
 import os
+import re
 from dataclasses import dataclass, field
-from typing import TypeVar
+from html.parser import HTMLParser
+from typing import TYPE_CHECKING, Optional, TypeVar
 
-from bs4 import BeautifulSoup
-
-from aocpy import web
+from aocpy.cache import GLOBAL_CACHE_DIR, InputCache, get_cache
 from aocpy.exception import (
     IncorrectSubmissionError,
     RateLimitError,
@@ -14,16 +14,57 @@ from aocpy.exception import (
 )
 from aocpy.utils import current_day, current_year
 
+if TYPE_CHECKING:  # pragma: no cover
+    from aocpy import web
+
 logger = logging.getLogger(__name__)
 
-URL = "https://adventofcode.com/{year}/day/{day}"
+DEFAULT_BASE_URL = "https://adventofcode.com"
+URL = "{base}/{year}/day/{day}"
+LEADERBOARD_URL = "{base}/{year}/leaderboard/private/view/{id}.json"
 INPUT_FNAME = "{session_cookie}/{year}/{day:02}.txt"
-GLOBAL_CACHE_DIR = "~/.config/aocd"
 
 
+CORRECT = "correct"
+ALREADY_COMPLETE = "already complete"
+INCORRECT = "incorrect"
+RATE_LIMITED = "rate limited"
+TOO_HIGH = "too high"
+TOO_LOW = "too low"
+
+_VERDICT_PHRASES = (
+    (CORRECT, "Thats the right answer!"),
+    (ALREADY_COMPLETE, "Did you already complete it"),
+    (INCORRECT, "That's not the right answer"),
+    (RATE_LIMITED, "You gave an answer too recently"),
+)
+_ARTICLE_RE = re.compile(r"<article\b[^>]*>", re.IGNORECASE)
+_HINT_RE = re.compile(r"your answer is (too high|too low)")
+_WAIT_LEFT_RE = re.compile(r"You have (?:(\d+)m ?)?(\d+)s left to wait")
+_WAIT_BEFORE_RE = re.compile(r"wait (\w+) minutes? before trying again", re.IGNORECASE)
+_NUMBER_WORDS = {
+    "one": 1,
+    "two": 2,
+    "three": 3,
+    "four": 4,
+    "five": 5,
+    "six": 6,
+    "seven": 7,
+    "eight": 8,
+    "nine": 9,
+    "ten": 10,
+}
+
 T = TypeVar("T", bound="Puzzle")
 
 
+def base_url() -> str:
+    """ Returns the root URL of Advent of Code, which the `AOC_BASE_URL`
+    environment variable overrides, e.g. to use a local `aocpy.standin` server.
+    """
+    return os.environ.get("AOC_BASE_URL", DEFAULT_BASE_URL).rstrip("/")
+
+
 @dataclass(frozen=True)
 class Puzzle:
     year: int
@@ -33,7 +74,9 @@ class Puzzle:
     input_fname: str = field(init=False)
 
     def __post_init__(self):
-        object.__setattr__(self, "url", URL.format(year=self.year, day=self.day))
+        object.__setattr__(
+            self, "url", URL.format(base=base_url(), year=self.year, day=self.day)
+        )
         object.__setattr__(
             self,
             "input_fname",
@@ -54,32 +97,108 @@ class Puzzle:
         return Puzzle(year, day, session_cookie)
 
 
-def check_submission_response_text(text: str):
-    soup = BeautifulSoup(text, "html.parser")
-    try:
-        message = soup.article.text
-    except AttributeError:
+class _TextParser(HTMLParser):
+    """ Collects the text content of an HTML fragment.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts = []
+
+    def handle_data(self, data):
+        self.parts.append(data)
+
+
+def article_text(text: str) -> Optional[str]:
+    """ Returns the text content of the first `<article>` element in `text`,
+    or None if there is no such element.
+    """
+    m = _ARTICLE_RE.search(text)
+    if m is None:
+        return None
+    end = text.find("</article>", m.end())
+    parser = _TextParser()
+    parser.feed(text[m.end() : end if end != -1 else len(text)])
+    parser.close()
+    return "".join(parser.parts)
+
+
+def parse_wait_time(text: str) -> Optional[int]:
+    """ Returns the number of seconds a submission response asks to wait
+    before trying again, or None if it does not say.
+    """
+    m = _WAIT_LEFT_RE.search(text)
+    if m is not None:
+        minutes, seconds = m.groups()
+        return int(minutes or 0) * 60 + int(seconds)
+    m = _WAIT_BEFORE_RE.search(text)
+    if m is not None:
+        word = m.group(1).lower()
+        minutes = int(word) if word.isdigit() else _NUMBER_WORDS.get(word)
+        if minutes is not None:
+            return minutes * 60
+    return None
+
+
+def parse_hint(message: str) -> Optional[str]:
+    """ Returns `TOO_HIGH` or `TOO_LOW` if an incorrect submission response
+    says so, otherwise None.
+    """
+    m = _HINT_RE.search(message)
+    return m.group(1) if m else None
+
+
+@dataclass(frozen=True)
+class SubmissionResult:
+    verdict: str
+    message: str
+    wait_seconds: Optional[int] = None
+    hint: Optional[str] = None
+
+
+def parse_submission_response(text: str) -> SubmissionResult:
+    """ Parse the response page to an answer submission.
+
+    Raises:
+        `SubmissionError` if the response is not recognised
+    """
+    message = article_text(text)
+    if message is None:
         raise SubmissionError(f"Unable to parse submission response text: {text}")
-    else:
-        if "Thats the right answer!" in message:
-            return
-        elif "Did you already complete it" in message:
-            raise RepeatSubmissionError(message)
-        elif "That's not the right answer" in message:
-            raise IncorrectSubmissionError(message)
-        elif "You gave an answer too recently" in message:
-            raise RateLimitError(message)
-        else:
-            raise SubmissionError(f"Unable to parse submission response text: {text}")
-
-
-def get_puzzle_input(session: web.AuthSession, puzzle: Puzzle):
-    if os.path.isfile(puzzle.input_fname):
-        with open(puzzle.input_fname) as f:
-            return f.read()
-    else:
+    for verdict, phrase in _VERDICT_PHRASES:
+        if phrase in message:
+            return SubmissionResult(
+                verdict, message, parse_wait_time(message), parse_hint(message)
+            )
+    raise SubmissionError(f"Unable to parse submission response text: {text}")
+
+
+def check_submission_response_text(text: str) -> SubmissionResult:
+    result = parse_submission_response(text)
+    if result.verdict == ALREADY_COMPLETE:
+        raise RepeatSubmissionError(result.message)
+    elif result.verdict == INCORRECT:
+        raise IncorrectSubmissionError(result.message)
+    elif result.verdict == RATE_LIMITED:
+        raise RateLimitError(result.message)
+    return result
+
+
+def get_puzzle_input(
+    session: "web.AuthSession", puzzle: Puzzle, cache: Optional[InputCache] = None
+):
+    """ Returns the input for `puzzle`, fetching it only if it is not already
+    in `cache` (defaults to `get_cache()`).
+    """
+    from aocpy import metrics, web
+
+    if cache is None:
+        cache = get_cache()
+    puzzle_input = cache.get(puzzle)
+    if puzzle_input is None:
+        metrics.inc(metrics.CACHE_LOOKUPS, cache="input", result="miss")
         puzzle_input = web.fetch_puzzle_input(session, puzzle.url)
-        os.makedirs(os.path.dirname(puzzle.input_fname), exist_ok=True)
-        with open(puzzle.input_fname, "w") as f:
-            f.write(puzzle_input)
-        return puzzle_input
+        cache.put(puzzle, puzzle_input)
+    else:
+        metrics.inc(metrics.CACHE_LOOKUPS, cache="input", result="hit")
+    return puzzle_input
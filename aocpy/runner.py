@@ -0,0 +1,384 @@
+""" Execution of generated solutions, each in a fresh interpreter unless run
+by the daemon.
+
+A solution module is a `solution.py` generated by `generate_day`. It must
+define `part_1` and `part_2` functions and may define `parse`, which converts
+an `InputFile` into the data passed to each part. Solutions which set
+`STREAMING = True` are given a `LineStream` instead.
+"""
+import argparse
+import contextlib
+import importlib.util
+import json
+import math
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from types import ModuleType
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+)
+
+from aocpy.exception import AocpyException
+from aocpy.loader import InputFile
+from aocpy.stream import LineStream
+
+if TYPE_CHECKING:
+    from aocpy.memo import ResultCache
+
+SOLUTION_FNAME = "solution.py"
+INPUT_FNAME = "input.txt"
+PARTS = (1, 2)
+
+
+def find_days(base_dir: Path, days: Optional[Iterable[int]] = None) -> List[Path]:
+    """ Returns the day directories generated by `generate_day` in `base_dir`,
+    optionally restricted to `days`.
+    """
+    if days:
+        dirs = [base_dir / f"{day:02}" for day in days]
+        missing = [d for d in dirs if not (d / SOLUTION_FNAME).is_file()]
+        if missing:
+            raise AocpyException(f"no solution found in {missing[0]}")
+        return dirs
+    return sorted(
+        d
+        for d in base_dir.iterdir()
+        if d.name.isdigit() and len(d.name) == 2 and (d / SOLUTION_FNAME).is_file()
+    )
+
+
+def load_solution(day_dir: Path) -> ModuleType:
+    """ Import the solution module from `day_dir`. The directory is added to
+    `sys.path` so that the solution can import its own helper modules.
+    """
+    day_dir = day_dir.resolve()
+    if str(day_dir) not in sys.path:
+        sys.path.insert(0, str(day_dir))
+    spec = importlib.util.spec_from_file_location(
+        f"aocpy_solution_{day_dir.name}", str(day_dir / SOLUTION_FNAME)
+    )
+    module = importlib.util.module_from_spec(spec)
+    # Registered so that functions in the solution can be pickled, e.g. to pass
+    # them to worker processes
+    sys.modules[spec.name] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        del sys.modules[spec.name]
+        raise
+    return module
+
+
+class SolutionCache:
+    """ Solution modules kept loaded between runs. A solution is re-imported,
+    along with the helper modules in its directory, only once one of the
+    Python files in its directory has changed.
+    """
+
+    def __init__(self):
+        self._modules: Dict[Path, Tuple[tuple, ModuleType]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _signature(day_dir: Path) -> tuple:
+        return tuple(
+            (p.name, s.st_mtime_ns, s.st_size)
+            for p, s in sorted((p, p.stat()) for p in day_dir.glob("*.py"))
+        )
+
+    @staticmethod
+    def _forget_helpers():
+        # Days commonly have helper modules of the same name, so any imported
+        # from a day directory are re-imported by the next solution loaded
+        for name, module in list(sys.modules.items()):
+            path = getattr(module, "__file__", None)
+            if (
+                path
+                and not name.startswith("aocpy_solution_")
+                and (Path(path).parent / SOLUTION_FNAME).is_file()
+            ):
+                del sys.modules[name]
+
+    def load(self, day_dir: Path) -> ModuleType:
+        day_dir = day_dir.resolve()
+        with self._lock:
+            signature = self._signature(day_dir)
+            cached = self._modules.get(day_dir)
+            if cached is not None and cached[0] == signature:
+                return cached[1]
+            self._forget_helpers()
+            # Helper modules are imported from this day rather than another
+            # loaded earlier
+            if str(day_dir) in sys.path:
+                sys.path.remove(str(day_dir))
+            module = load_solution(day_dir)
+            self._modules[day_dir] = (signature, module)
+            return module
+
+    def __len__(self):
+        return len(self._modules)
+
+
+# Set by the daemon to run solutions in its own interpreter rather than a new
+# one for each run
+SOLUTIONS: Optional[SolutionCache] = None
+
+
+def input_type(module: ModuleType) -> Type[Union[InputFile, LineStream]]:
+    """ Returns the type of input `module` expects to be passed to `parse`.
+    """
+    return LineStream if getattr(module, "STREAMING", False) else InputFile
+
+
+def default_parse(puzzle_input_f: InputFile) -> List[str]:
+    return list(puzzle_input_f.lines())
+
+
+def get_parse(module: ModuleType) -> Callable[[InputFile], object]:
+    return getattr(module, "parse", default_parse)
+
+
+def get_part(module: ModuleType, part: int) -> Callable[[object], object]:
+    return getattr(module, f"part_{part}")
+
+
+def peak_rss() -> int:
+    """ Returns the peak resident set size of the current process in bytes.
+    """
+    import resource
+
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+def summarise(times: List[float]) -> Dict[str, float]:
+    ordered = sorted(times)
+    return {
+        "min": ordered[0],
+        "median": statistics.median(ordered),
+        "p95": ordered[max(0, math.ceil(len(ordered) * 0.95) - 1)],
+    }
+
+
+def bench_solution(day_dir: Path, input_path: Path, repeat: int) -> dict:
+    """ Time parsing and each part of the solution in `day_dir` over `repeat`
+    runs, following one untimed warm up run. Input is re-parsed for every part
+    so that parts which mutate their data do not affect each other.
+    """
+    module = load_solution(day_dir)
+    parse = get_parse(module)
+    open_input = input_type(module)
+    times = {"parse": [], "part_1": [], "part_2": []}
+    for i in range(repeat + 1):
+        for part in PARTS:
+            with open_input(str(input_path)) as f:
+                start = time.perf_counter()
+                data = parse(f)
+                parsed = time.perf_counter()
+                get_part(module, part)(data)
+                end = time.perf_counter()
+                del data
+            if i:
+                times["parse"].append(parsed - start)
+                times[f"part_{part}"].append(end - parsed)
+    result = {name: summarise(t) for name, t in times.items()}
+    result["peak_rss"] = peak_rss()
+    return result
+
+
+def run_solution(
+    day_dir: Path, input_path: Path, module: Optional[ModuleType] = None
+) -> dict:
+    """ Run the solution in `day_dir` the same way as its `main` function,
+    returning the answer to each part and the time taken. `module` is used
+    instead of importing the solution if given.
+    """
+    if module is None:
+        module = load_solution(day_dir)
+    result = {"answers": {}, "times": {}}
+    with input_type(module)(str(input_path)) as f:
+        start = time.perf_counter()
+        data = get_parse(module)(f)
+        result["times"]["parse"] = time.perf_counter() - start
+        for part in PARTS:
+            start = time.perf_counter()
+            answer = get_part(module, part)(data)
+            result["times"][f"part_{part}"] = time.perf_counter() - start
+            result["answers"][str(part)] = None if answer is None else str(answer)
+        del data
+    result["peak_rss"] = peak_rss()
+    return result
+
+
+def _run_worker(args: List[str], timeout: Optional[float] = None) -> dict:
+    try:
+        p = subprocess.run(
+            [sys.executable, "-m", "aocpy.runner", *args],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            universal_newlines=True,
+            timeout=timeout,
+        )
+    except subprocess.TimeoutExpired:
+        return {"error": f"timed out after {timeout}s"}
+    if p.returncode != 0:
+        lines = p.stderr.strip().splitlines()
+        return {"error": lines[-1] if lines else f"exit code {p.returncode}"}
+    return json.loads(p.stdout)
+
+
+def _run_loaded(solutions: SolutionCache, day_dir: Path, input_path: Path) -> dict:
+    # Output is discarded, as it is by a worker's `main`, rather than sent to
+    # the daemon's client
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(
+        devnull
+    ), contextlib.redirect_stderr(devnull):
+        try:
+            return run_solution(day_dir, input_path, solutions.load(day_dir))
+        except Exception as err:
+            return {"error": f"{type(err).__name__}: {err}"}
+
+
+def bench_day(day_dir: Path, repeat: int) -> dict:
+    """ Benchmark the solution in `day_dir` in a fresh interpreter.
+    """
+    result = _run_worker(
+        ["bench", str(day_dir), str(day_dir / INPUT_FNAME), str(repeat)]
+    )
+    return {"day": int(day_dir.name), "repeat": repeat, **result}
+
+
+def run_day(
+    day_dir: Path,
+    input_path: Optional[Path] = None,
+    timeout: Optional[float] = None,
+    memory_limit: Optional[int] = None,
+    cache: Optional["ResultCache"] = None,
+    in_process: bool = True,
+) -> dict:
+    """ Run the solution in `day_dir` in a fresh interpreter, killing it after
+    `timeout` seconds or if it allocates more than `memory_limit` bytes. Within
+    the daemon, solutions without limits are run in its interpreter instead,
+    unless `in_process` is False.
+
+    If `cache` is given the result of a previous run of the same solution code
+    with the same input is returned instead, marked as `cached`.
+    """
+    input_path = input_path or day_dir / INPUT_FNAME
+    start = time.perf_counter()
+    key = None
+    if cache is not None:
+        from aocpy.memo import solution_key
+
+        try:
+            key = "run:" + solution_key(
+                day_dir / SOLUTION_FNAME, input_path.read_bytes()
+            )
+        except (AocpyException, OSError):
+            # Let the worker report the problem
+            pass
+        else:
+            cached = cache.get(key)
+            if cached is not None:
+                return {
+                    "day": int(day_dir.name),
+                    "wall": time.perf_counter() - start,
+                    "cached": True,
+                    **cached,
+                }
+    if (
+        in_process
+        and SOLUTIONS is not None
+        and timeout is None
+        and memory_limit is None
+    ):
+        result = _run_loaded(SOLUTIONS, day_dir, input_path)
+    else:
+        args = ["run", str(day_dir), str(input_path)]
+        if memory_limit is not None:
+            args += ["--memory-limit", str(memory_limit)]
+        result = _run_worker(args, timeout)
+    if key is not None and "error" not in result:
+        cache.put(key, result)
+    return {"day": int(day_dir.name), "wall": time.perf_counter() - start, **result}
+
+
+def run_days(
+    day_dirs: Iterable[Path],
+    jobs: int = 1,
+    timeout: Optional[float] = None,
+    memory_limit: Optional[int] = None,
+    input_paths: Optional[Iterable[Optional[Path]]] = None,
+    cache: Optional["ResultCache"] = None,
+) -> List[dict]:
+    """ Run each solution in `day_dirs`, up to `jobs` at a time. Results are
+    returned in the same order as `day_dirs`.
+
+    Each solution is run with the corresponding path in `input_paths`, or with
+    its own `input.txt` if not given.
+    """
+    day_dirs = list(day_dirs)
+    inputs = list(input_paths) if input_paths is not None else [None] * len(day_dirs)
+    # Solutions run concurrently in the daemon's interpreter would contend for
+    # the GIL, so they only run there one at a time
+    in_process = min(jobs, len(day_dirs)) <= 1
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+        return list(
+            executor.map(
+                lambda d, i: run_day(d, i, timeout, memory_limit, cache, in_process),
+                day_dirs,
+                inputs,
+            )
+        )
+
+
+def _limit_memory(limit: int):
+    import resource
+
+    resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(prog="python -m aocpy.runner")
+    subparsers = parser.add_subparsers(dest="command")
+    bench = subparsers.add_parser("bench")
+    bench.add_argument("day_dir", type=Path)
+    bench.add_argument("input_path", type=Path)
+    bench.add_argument("repeat", type=int)
+    run = subparsers.add_parser("run")
+    run.add_argument("day_dir", type=Path)
+    run.add_argument("input_path", type=Path)
+    run.add_argument("--memory-limit", type=int)
+    args = parser.parse_args(argv)
+
+    stdout = sys.stdout
+    # Solutions are free to print, keep their output out of the results
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        if args.command == "bench":
+            result = bench_solution(args.day_dir, args.input_path, args.repeat)
+        elif args.command == "run":
+            if args.memory_limit is not None:
+                _limit_memory(args.memory_limit)
+            result = run_solution(args.day_dir, args.input_path)
+        else:
+            parser.error("a command is required")
+    json.dump(result, stdout)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,377 @@
+""" Local stand-in for adventofcode.com, to exercise the network path of aocpy
+offline, e.g. with `aocpy loadtest` or by pointing `AOC_BASE_URL` at it.
+
+The server implements the endpoints aocpy uses:
+
+- `GET /{year}/day/{day}/input`, a list of integers generated from the
+  session cookie, year and day
+- `GET /{year}/day/{day}`, the puzzle page, with part 2 once part 1 is solved
+- `POST /{year}/day/{day}/answer`, where part 1 is the sum and part 2 the
+  maximum of the input, answered with the same texts as adventofcode.com
+- `GET /{year}/leaderboard/private/view/{id}.json`
+- `HEAD /`
+
+Responses are delayed by a configurable latency, pages carry ETags, and each
+session cookie's requests beyond a configurable rate are answered with 429 Too
+Many Requests.
+Connections are kept alive as they are by adventofcode.com.
+"""
+import argparse
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qs
+
+DEFAULT_INPUT_LINES = 1000
+# Seconds a wrong answer locks out further submissions for, as on the site
+WRONG_ANSWER_COOLDOWN = 60
+
+_INPUT_RE = re.compile(r"^/(\d+)/day/(\d+)/input$")
+_PAGE_RE = re.compile(r"^/(\d+)/day/(\d+)$")
+_ANSWER_RE = re.compile(r"^/(\d+)/day/(\d+)/answer$")
+_LEADERBOARD_RE = re.compile(r"^/(\d+)/leaderboard/private/view/(\d+)\.json$")
+
+CORRECT_TEXT = (
+    'Thats the right answer! You are <span class="day-success">one gold '
+    "star</span> closer to rescuing Santa."
+)
+ALREADY_COMPLETE_TEXT = (
+    "You don't seem to be solving the right level. Did you already complete it?"
+)
+INCORRECT_TEXT = (
+    "That's not the right answer; your answer is {hint}. Please wait one minute "
+    "before trying again. (You guessed <code>{answer}</code>.)"
+)
+RATE_LIMITED_TEXT = (
+    "You gave an answer too recently; you have to wait after submitting an "
+    "answer before trying again. You have {wait}s left to wait."
+)
+NO_SESSION_TEXT = (
+    "Puzzle inputs differ by user.  Please log in to get your puzzle input."
+)
+NOT_RELEASED_TEXT = "Please don't repeatedly request this endpoint before it unlocks!"
+
+
+@dataclass
+class StandinConfig:
+    """ Behaviour of the stand-in server. Each response is delayed by `latency`
+    plus up to `jitter` seconds, and at most `rate` requests per second are
+    served to each session cookie with bursts of up to `burst` (unlimited if
+    `rate` is None). Days
+    after `released` respond as if not yet unlocked.
+    """
+
+    latency: float = 0.0
+    jitter: float = 0.0
+    rate: Optional[float] = None
+    burst: int = 10
+    input_lines: int = DEFAULT_INPUT_LINES
+    released: int = 25
+
+
+def puzzle_input(session_cookie: str, year: int, day: int, lines: int) -> str:
+    """ Returns the input the stand-in serves to `session_cookie`.
+    """
+    rng = random.Random(f"{session_cookie}:{year}:{day}")
+    return "".join(f"{rng.randint(1, 10 ** 6)}\n" for _ in range(lines))
+
+
+def answers(text: str) -> Tuple[str, str]:
+    """ Returns the answers to both parts of a stand-in puzzle with input
+    `text`.
+    """
+    values = [int(line) for line in text.split()]
+    return str(sum(values)), str(max(values))
+
+
+def puzzle_page(year: int, day: int, solved: int) -> str:
+    example = "1\n2\n3\n"
+    articles = [
+        f'<article class="day-desc"><h2>--- Day {day}: Stand-in ---</h2>'
+        f"<p>Add up the numbers. For example:</p>"
+        f"<pre><code>{example}</code></pre>"
+        f"<p>The answer is <code><em>6</em></code>.</p></article>"
+    ]
+    if solved >= 1:
+        articles.append(
+            '<article class="day-desc"><h2 id="part2">--- Part Two ---</h2>'
+            "<p>Find the largest number, here <code><em>3</em></code>.</p>"
+            "</article>"
+        )
+    return (
+        f"<!DOCTYPE html><html><head><title>Day {day} - Advent of Code {year}"
+        f"</title></head><body><main>{''.join(articles)}</main></body></html>"
+    )
+
+
+class _TokenBucket:
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def take(self) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+
+@dataclass
+class _Account:
+    solved: Dict[Tuple[int, int], int] = field(default_factory=dict)
+    cooldown_until: float = 0.0
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately, which Nagle's algorithm would
+    # delay until the client's delayed ACK
+    disable_nagle_algorithm = True
+    server: "StandinServer"
+
+    def setup(self):
+        super().setup()
+        self.server.record_connection()
+
+    def log_message(self, format, *args):
+        pass
+
+    def _cookie(self) -> Optional[str]:
+        cookie = SimpleCookie(self.headers.get("Cookie", ""))
+        return cookie["session"].value if "session" in cookie else None
+
+    def _send(self, status: int, body: str = "", content_type="text/plain", etag=None):
+        data = body.encode()
+        if etag is not None and self.headers.get("If-None-Match") == etag:
+            status, data = 304, b""
+        self.send_response(status)
+        self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        if etag is not None:
+            self.send_header("ETag", etag)
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(data)
+        self.server.record(self.command, self.path, status)
+
+    def _handle(self, method: str):
+        config = self.server.config
+        if config.latency or config.jitter:
+            time.sleep(config.latency + random.uniform(0, config.jitter))
+        cookie = self._cookie()
+        if not self.server.allow(cookie):
+            return self._send(429, "Too Many Requests")
+        if method == "HEAD" and self.path == "/":
+            return self._send(200)
+        if method == "POST":
+            m = _ANSWER_RE.match(self.path)
+            if m is not None:
+                return self._answer(cookie, int(m.group(1)), int(m.group(2)))
+            return self._send(404, "Not Found")
+        for pattern, endpoint in (
+            (_INPUT_RE, self._input),
+            (_PAGE_RE, self._page),
+            (_LEADERBOARD_RE, self._leaderboard),
+        ):
+            m = pattern.match(self.path)
+            if m is not None:
+                return endpoint(cookie, int(m.group(1)), int(m.group(2)))
+        self._send(404, "Not Found")
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_HEAD(self):
+        self._handle("HEAD")
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        self.form = parse_qs(self.rfile.read(length).decode())
+        self._handle("POST")
+
+    def _input(self, cookie: Optional[str], year: int, day: int):
+        if cookie is None:
+            return self._send(400, NO_SESSION_TEXT)
+        if day > self.server.config.released:
+            return self._send(404, NOT_RELEASED_TEXT)
+        self._send(200, self.server.puzzle_input(cookie, year, day))
+
+    def _page(self, cookie: Optional[str], year: int, day: int):
+        if day > self.server.config.released:
+            return self._send(404, "Not Found")
+        solved = self.server.account(cookie).solved.get((year, day), 0)
+        html = puzzle_page(year, day, solved)
+        etag = '"' + hashlib.sha256(html.encode()).hexdigest()[:16] + '"'
+        self._send(200, html, "text/html", etag)
+
+    def _leaderboard(self, cookie: Optional[str], year: int, board_id: int):
+        body = json.dumps(
+            {"event": str(year), "owner_id": board_id, "members": {}}, sort_keys=True
+        )
+        etag = '"' + hashlib.sha256(body.encode()).hexdigest()[:16] + '"'
+        self._send(200, body, "application/json", etag)
+
+    def _answer(self, cookie: Optional[str], year: int, day: int):
+        if cookie is None:
+            return self._send(400, NO_SESSION_TEXT)
+        level = int(self.form.get("level", ["1"])[0])
+        answer = self.form.get("answer", [""])[0]
+        with self.server.lock:
+            account = self.server.account(cookie)
+            solved = account.solved.get((year, day), 0)
+            wait = account.cooldown_until - time.time()
+            if level != solved + 1:
+                message = ALREADY_COMPLETE_TEXT
+            elif wait > 0:
+                message = RATE_LIMITED_TEXT.format(wait=int(wait) + 1)
+            else:
+                expected = answers(self.server.puzzle_input(cookie, year, day))
+                if answer == expected[level - 1]:
+                    account.solved[(year, day)] = level
+                    message = CORRECT_TEXT
+                else:
+                    account.cooldown_until = time.time() + WRONG_ANSWER_COOLDOWN
+                    too_low = answer.isdigit() and int(answer) < int(
+                        expected[level - 1]
+                    )
+                    message = INCORRECT_TEXT.format(
+                        hint="too low" if too_low else "too high", answer=answer
+                    )
+        html = f"<html><body><main><article><p>{message}</p></article></main></body></html>"
+        self._send(200, html, "text/html")
+
+
+class StandinServer(ThreadingHTTPServer):
+    """ Threaded stand-in server. Requests served are recorded in `requests`
+    as `(method, path, status)` and the number of connections accepted in
+    `connections`.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self, address=("127.0.0.1", 0), config: Optional[StandinConfig] = None
+    ):
+        super().__init__(address, _Handler)
+        self.config = config or StandinConfig()
+        # Re-entrant since answering holds it while looking up the account
+        self.lock = threading.RLock()
+        self.requests: List[Tuple[str, str, int]] = []
+        self.connections = 0
+        self._accounts: Dict[str, _Account] = {}
+        self._buckets: Dict[str, _TokenBucket] = {}
+        self._inputs: Dict[Tuple[str, int, int], str] = {}
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def record(self, method: str, path: str, status: int):
+        with self.lock:
+            self.requests.append((method, path, status))
+
+    def record_connection(self):
+        with self.lock:
+            self.connections += 1
+
+    def account(self, cookie: Optional[str]) -> _Account:
+        with self.lock:
+            return self._accounts.setdefault(cookie or "", _Account())
+
+    def allow(self, cookie: Optional[str]) -> bool:
+        """ Whether a request from the account with `cookie` is within its rate
+        limit.
+        """
+        if self.config.rate is None:
+            return True
+        with self.lock:
+            bucket = self._buckets.get(cookie or "")
+            if bucket is None:
+                bucket = _TokenBucket(self.config.rate, self.config.burst)
+                self._buckets[cookie or ""] = bucket
+        return bucket.take()
+
+    def puzzle_input(self, cookie: str, year: int, day: int) -> str:
+        key = (cookie, year, day)
+        with self.lock:
+            cached = self._inputs.get(key)
+        if cached is not None:
+            return cached
+        # Generated without the lock, so requests for other inputs aren't held
+        # up. Inputs are deterministic, so a concurrent duplicate is harmless.
+        text = puzzle_input(cookie, year, day, self.config.input_lines)
+        with self.lock:
+            return self._inputs.setdefault(key, text)
+
+    def statuses(self) -> Dict[int, int]:
+        counts: Dict[int, int] = {}
+        with self.lock:
+            for _, _, status in self.requests:
+                counts[status] = counts.get(status, 0) + 1
+        return counts
+
+
+@contextmanager
+def running(
+    config: Optional[StandinConfig] = None, host: str = "127.0.0.1", port: int = 0
+) -> Iterator[StandinServer]:
+    """ Run a stand-in server in a background thread for the duration of the
+    context, on a free port unless `port` is given.
+    """
+    server = StandinServer((host, port), config)
+    # Polled frequently so that leaving the context is quick
+    thread = threading.Thread(
+        target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+    )
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="seconds")
+    parser.add_argument("--rate", type=float, help="requests per second per account")
+    parser.add_argument("--burst", type=int, default=10)
+    parser.add_argument("--input-lines", type=int, default=DEFAULT_INPUT_LINES)
+    args = parser.parse_args(argv)
+    config = StandinConfig(
+        args.latency, args.jitter, args.rate, args.burst, args.input_lines
+    )
+    server = StandinServer((args.host, args.port), config)
+    print(f"Serving on {server.base_url}, use AOC_BASE_URL={server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
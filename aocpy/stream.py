@@ -0,0 +1,175 @@
+""" Streaming puzzle input, for inputs too large to hold in memory.
+
+Solutions opt in by setting `STREAMING = True`, in which case they receive a
+`LineStream` in place of an `InputFile`.
+"""
+import io
+import queue
+import threading
+from typing import BinaryIO, Callable, Iterable, Iterator, List, Optional, Union
+
+from aocpy.loader import INT_RE
+
+DEFAULT_CHUNK_SIZE = 1 << 16
+# Number of chunks each consumer of `fan_out` may fall behind the reader
+DEFAULT_MAX_PENDING = 8
+
+_DONE = object()
+
+
+class LineStream:
+    """ Lazy, re-iterable source of the lines of a puzzle input.
+
+    Every iteration reads the file again in chunks of `chunk_size` bytes, so
+    memory use is bounded by the chunk size and the longest line rather than
+    by the size of the input.
+    """
+
+    def __init__(self, path: str, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self.path = path
+        self.chunk_size = chunk_size
+        self._data: Optional[bytes] = None
+        self._closed = False
+
+    @classmethod
+    def from_bytes(cls, data: Union[bytes, str], path: str = "<input>"):
+        """ Create a LineStream over in-memory data, e.g. example input.
+        """
+        self = cls(path)
+        self._data = data.encode() if isinstance(data, str) else bytes(data)
+        return self
+
+    def _open(self) -> BinaryIO:
+        if self._closed:
+            raise ValueError("I/O operation on closed stream")
+        if self._data is not None:
+            return io.BytesIO(self._data)
+        return open(self.path, "rb")
+
+    def raw_batches(self) -> Iterator[List[bytes]]:
+        """ Yields the complete lines in each chunk read, excluding line endings.
+        """
+        with self._open() as f:
+            tail = b""
+            while True:
+                chunk = f.read(self.chunk_size)
+                if not chunk:
+                    break
+                lines = (tail + chunk).split(b"\n")
+                tail = lines.pop()
+                yield lines
+            if tail:
+                yield [tail]
+
+    def raw_lines(self) -> Iterator[bytes]:
+        """ Yields each line, excluding line endings.
+        """
+        for batch in self.raw_batches():
+            for line in batch:
+                yield line[:-1] if line.endswith(b"\r") else line
+
+    def batches(self) -> Iterator[List[str]]:
+        """ Yields the lines in each chunk read, decoded and stripped of
+        surrounding whitespace.
+        """
+        for batch in self.raw_batches():
+            yield [str(line, "utf-8").strip() for line in batch]
+
+    def lines(self) -> Iterator[str]:
+        """ Yields each line decoded and stripped of surrounding whitespace.
+        """
+        for batch in self.batches():
+            yield from batch
+
+    def ints(self) -> Iterator[int]:
+        """ Yields every integer in the input, in order.
+        """
+        for batch in self.raw_batches():
+            for line in batch:
+                for m in INT_RE.finditer(line):
+                    yield int(m.group())
+
+    def __iter__(self) -> Iterator[str]:
+        return self.lines()
+
+    def close(self):
+        self._closed = True
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _batched(lines: Iterable[str], size: int = 1024) -> Iterator[List[str]]:
+    batch = []
+    for line in lines:
+        batch.append(line)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def fan_out(
+    source: Union[LineStream, Iterable[str]],
+    *consumers: Callable[[Iterator[str]], object],
+    max_pending: int = DEFAULT_MAX_PENDING,
+) -> List[object]:
+    """ Pass the lines of `source` to every consumer from a single read of the
+    input, returning each consumer's result.
+
+    Each consumer runs in its own thread and receives an iterator over the
+    lines. A consumer that stops early does not hold up the others.
+    """
+    batches = source.batches() if isinstance(source, LineStream) else _batched(source)
+    queues = [queue.Queue(max_pending) for _ in consumers]
+    results: List[object] = [None] * len(consumers)
+    errors: List[Optional[BaseException]] = [None] * len(consumers)
+
+    def consume(i: int, consumer: Callable, q: queue.Queue):
+        done = False
+
+        def lines() -> Iterator[str]:
+            nonlocal done
+            while True:
+                batch = q.get()
+                if batch is _DONE:
+                    done = True
+                    return
+                yield from batch
+
+        try:
+            results[i] = consumer(lines())
+        except BaseException as err:
+            errors[i] = err
+        finally:
+            # Keep draining so that the reader is never blocked on this queue
+            while not done:
+                done = q.get() is _DONE
+
+    threads = [
+        threading.Thread(target=consume, args=(i, c, q), daemon=True)
+        for i, (c, q) in enumerate(zip(consumers, queues))
+    ]
+    for t in threads:
+        t.start()
+    try:
+        for batch in batches:
+            for q in queues:
+                q.put(batch)
+    finally:
+        for q in queues:
+            q.put(_DONE)
+        for t in threads:
+            t.join()
+    for err in errors:
+        if err is not None:
+            raise err
+    return results
@@ -1,8 +1,15 @@
 import argparse
 import os
+from typing import Union
 
+from aocpy.loader import InputFile
+from aocpy.stream import LineStream
 
-def input_cli(base_dir):
+
+def input_cli(base_dir, stream: bool = False) -> Union[InputFile, LineStream]:
+    """ Parse the command line of a solution and open the selected input, as a
+    `LineStream` if `stream` is set.
+    """
     default_input = os.path.join(base_dir, "input.txt")
     parser = argparse.ArgumentParser()
     group = parser.add_mutually_exclusive_group()
@@ -10,14 +17,25 @@ def input_cli(base_dir):
         "infile",
         help="specify non-default puzzle input file",
         nargs="?",
-        type=argparse.FileType(),
         default=default_input,
     )
     group.add_argument(
         "-e", "--example", help="use example_input.txt if present", action="store_true"
     )
+    parser.add_argument(
+        "--no-cache", help="rerun even if the result is cached", action="store_true"
+    )
     args = parser.parse_args()
-    if args.example:
-        return open(os.path.join(base_dir, "example_input.txt"))
-    else:
-        return args.infile
+    if args.no_cache:
+        os.environ["AOC_NO_CACHE"] = "1"
+    infile = (
+        os.path.join(base_dir, "example_input.txt") if args.example else args.infile
+    )
+    try:
+        if stream:
+            # Fail early, the stream only opens the file when iterated
+            open(infile, "rb").close()
+            return LineStream(infile)
+        return InputFile(infile)
+    except OSError as err:
+        parser.error(f"can't open '{infile}': {err}")
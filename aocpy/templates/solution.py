@@ -1,3 +1,13 @@
+""" {{ year }} day {{ day }}: {{ title }}
+"""
+from aocpy.algo import Grid, IntervalSet, bfs, dijkstra, grid_bfs  # noqa: F401
+from aocpy.memo import memoize_main
+
+
+def parse(puzzle_input_f):
+    return list(puzzle_input_f.lines())
+
+
 def part_1(data):
     pass
 
@@ -5,10 +15,12 @@ def part_1(data):
 def part_2(data):
     pass
 
+
+@memoize_main
 def main(puzzle_input_f):
-    lines = [l.strip() for l in puzzle_input_f.readlines() if l]
-    print("Part 1: ", part_1(lines))
-    print("Part 2: ", part_2(lines))
+    data = parse(puzzle_input_f)
+    print("Part 1: ", part_1(data))
+    print("Part 2: ", part_2(data))
 
 
 if __name__ == "__main__":
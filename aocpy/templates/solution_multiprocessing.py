@@ -0,0 +1,57 @@
+""" {{ year }} day {{ day }}: {{ title }}
+"""
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from aocpy.memo import memoize_main
+
+
+def executor():
+    # Forked workers inherit the solution module however it was imported,
+    # including by `aocpy run`
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context("fork" if "fork" in methods else None)
+    return ProcessPoolExecutor(mp_context=context)
+
+
+def parse(puzzle_input_f):
+    return list(puzzle_input_f.lines())
+
+
+def solve_1(line):
+    pass
+
+
+def solve_2(line):
+    pass
+
+
+def map_lines(solve, data):
+    # Each line is solved in a pool of processes, e.g.
+    # `return sum(map_lines(solve_1, data))` in `part_1`
+    with executor() as pool:
+        return list(pool.map(solve, data, chunksize=max(1, len(data) // 64)))
+
+
+def part_1(data):
+    pass
+
+
+def part_2(data):
+    pass
+
+
+@memoize_main
+def main(puzzle_input_f):
+    data = parse(puzzle_input_f)
+    print("Part 1: ", part_1(data))
+    print("Part 2: ", part_2(data))
+
+
+if __name__ == "__main__":
+    import os
+    from aocpy import input_cli
+
+    base_dir = os.path.dirname(__file__)
+    with input_cli(base_dir) as f:
+        main(f)
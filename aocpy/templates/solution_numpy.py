@@ -0,0 +1,35 @@
+""" {{ year }} day {{ day }}: {{ title }}
+"""
+import numpy as np  # noqa: F401
+
+from aocpy.memo import memoize_main
+from aocpy.parse import char_grid
+
+
+def parse(puzzle_input_f):
+    # grid[y, x] == b"#", a zero-copy view of the input
+    return char_grid(puzzle_input_f)
+
+
+def part_1(grid):
+    pass
+
+
+def part_2(grid):
+    pass
+
+
+@memoize_main
+def main(puzzle_input_f):
+    data = parse(puzzle_input_f)
+    print("Part 1: ", part_1(data))
+    print("Part 2: ", part_2(data))
+
+
+if __name__ == "__main__":
+    import os
+    from aocpy import input_cli
+
+    base_dir = os.path.dirname(__file__)
+    with input_cli(base_dir) as f:
+        main(f)
@@ -0,0 +1,36 @@
+""" {{ year }} day {{ day }}: {{ title }}
+"""
+from aocpy.stream import fan_out
+
+# Parts are passed a lazy, re-iterable LineStream rather than a list of lines
+STREAMING = True
+
+
+def parse(puzzle_input_f):
+    return puzzle_input_f
+
+
+def part_1(lines):
+    for line in lines:
+        pass
+
+
+def part_2(lines):
+    for line in lines:
+        pass
+
+
+def main(puzzle_input_f):
+    # Both parts consume a single read of the input at the same time
+    answer_1, answer_2 = fan_out(parse(puzzle_input_f), part_1, part_2)
+    print("Part 1: ", answer_1)
+    print("Part 2: ", answer_2)
+
+
+if __name__ == "__main__":
+    import os
+    from aocpy import input_cli
+
+    base_dir = os.path.dirname(__file__)
+    with input_cli(base_dir, stream=True) as f:
+        main(f)
@@ -1,18 +1,39 @@
 #!/usr/bin/python
+import json
+import os
+
 import pytest
 import solution
+from aocpy.runner import input_type
+
+EXAMPLES_FNAME = os.path.join(os.path.dirname(__file__), "examples.json")
+
+
+def examples(part):
+    """ (input, answer) pairs for `part` extracted from the puzzle page by
+    `aocpy begin`. Add more to examples.json as needed.
+    """
+    try:
+        with open(EXAMPLES_FNAME) as f:
+            return [
+                (e["input"], e["answer"])
+                for e in json.load(f)
+                if e["part"] == part and e["answer"] is not None
+            ]
+    except FileNotFoundError:
+        return []
+
+
+def run(part, data):
+    with input_type(solution).from_bytes(data) as f:
+        return getattr(solution, f"part_{part}")(solution.parse(f))
+
 
-@pytest.mark.parametrize('data,expect',
-    [('sample_input_1', 'sample_output_1'),
-     ('sample_input_2', 'sample_output_2')]
-)
+@pytest.mark.parametrize("data,expect", examples(1))
 def test_part_1(data, expect):
-    assert solution.part_1(data) == expect
+    assert str(run(1, data)) == expect
 
-@pytest.mark.parametrize('data,expect', 
-    [('sample_input_1', 'sample_output_1'),
-     ('sample_input_2', 'sample_output_2')]
-)
-def test_part_2(data, expect)
-    assert solution.part_2(data) == expect
 
+@pytest.mark.parametrize("data,expect", examples(2))
+def test_part_2(data, expect):
+    assert str(run(2, data)) == expect
@@ -0,0 +1,135 @@
+""" Rendering of solution templates.
+
+Templates are text with `{{ expression }}` placeholders, where each expression
+is evaluated with the template's variables in scope, e.g. `{{ title }}` or
+`{{ len(examples) }}`. A template is compiled to a Python code object once and
+the compiled form is cached on disk, keyed by a hash of the template source,
+so rendering never re-parses an unchanged template.
+"""
+import builtins
+import hashlib
+import marshal
+import re
+import sys
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+from aocpy.exception import AocpyException
+from aocpy.utils import atomic_write, get_config_dir
+
+PLACEHOLDER_RE = re.compile(r"{{(.*?)}}", re.DOTALL)
+COMPILED_CACHE_DIRNAME = "compiled-templates"
+USER_TEMPLATES_DIRNAME = "templates"
+BUILTIN_TEMPLATES_DIR = Path(__file__).parent / "templates"
+
+# Solution file of each built in template variant. Every variant shares the
+# built in test template.
+BUILTIN_TEMPLATES = {
+    "default": "solution.py",
+    "stream": "solution_stream.py",
+    "numpy": "solution_numpy.py",
+    "multiprocessing": "solution_multiprocessing.py",
+}
+SOLUTION_TEMPLATE = "solution.py"
+TEST_TEMPLATE = "test_solution.py"
+
+Renderer = Callable[[Dict[str, object]], str]
+
+
+def to_python(source: str) -> str:
+    """ Returns a Python expression which evaluates to the rendered template.
+    """
+    parts = []
+    for i, piece in enumerate(PLACEHOLDER_RE.split(source)):
+        if i % 2:
+            parts.append(f"str(({piece.strip()}))")
+        elif piece:
+            parts.append(repr(piece))
+    return "''.join((" + "".join(f"{p}, " for p in parts) + "))"
+
+
+def compile_template(source: str, name: str = "<template>"):
+    """ Compile the template `source`, using the on-disk cache of previously
+    compiled templates.
+
+    Raises:
+        `AocpyException` if an expression in the template is invalid
+    """
+    key = hashlib.sha256(
+        f"{sys.implementation.cache_tag}\0{source}".encode()
+    ).hexdigest()
+    cached = get_config_dir() / COMPILED_CACHE_DIRNAME / key
+    try:
+        return marshal.loads(cached.read_bytes())
+    except (OSError, EOFError, ValueError, TypeError):
+        pass
+    try:
+        code = compile(to_python(source), name, "eval")
+    except SyntaxError as err:
+        raise AocpyException(f"invalid template {name}: {err.msg}")
+    try:
+        cached.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write(cached, marshal.dumps(code))
+    except OSError:
+        # Caching is only an optimisation
+        pass
+    return code
+
+
+def renderer(source: str, name: str = "<template>") -> Renderer:
+    """ Returns a function rendering the template `source` with a mapping of
+    variables.
+    """
+    code = compile_template(source, name)
+
+    def render(variables: Dict[str, object]) -> str:
+        # Variables are globals so that they are visible inside comprehensions
+        try:
+            return eval(code, {"__builtins__": builtins, **variables})
+        except Exception as err:
+            raise AocpyException(f"unable to render {name}: {err!r}")
+
+    return render
+
+
+def get_user_templates_dir() -> Path:
+    return get_config_dir() / USER_TEMPLATES_DIRNAME
+
+
+def available_templates() -> Dict[str, Path]:
+    """ Returns the solution template file of each template, including those
+    in the user templates directory, i.e. `~/.config/aocpy/templates/<name>/`.
+    User templates override built in templates of the same name.
+    """
+    templates = {
+        name: BUILTIN_TEMPLATES_DIR / fname for name, fname in BUILTIN_TEMPLATES.items()
+    }
+    user_dir = get_user_templates_dir()
+    if user_dir.is_dir():
+        for d in sorted(user_dir.iterdir()):
+            if (d / SOLUTION_TEMPLATE).is_file():
+                templates[d.name] = d / SOLUTION_TEMPLATE
+    return templates
+
+
+def load_template(name: str) -> Dict[str, Renderer]:
+    """ Returns the renderer of each file generated for a day by the template
+    `name`, keyed by the kind of file: "solution" or "test". A user template
+    without its own `test_solution.py` uses the built in one.
+
+    Raises:
+        `AocpyException` if the template is not found or invalid
+    """
+    solution_path: Optional[Path] = available_templates().get(name)
+    if solution_path is None:
+        raise AocpyException(f"unknown template {name!r}")
+    test_path = solution_path.parent / TEST_TEMPLATE
+    if not test_path.is_file():
+        test_path = BUILTIN_TEMPLATES_DIR / TEST_TEMPLATE
+    try:
+        return {
+            kind: renderer(path.read_text(), str(path))
+            for kind, path in (("solution", solution_path), ("test", test_path))
+        }
+    except OSError as err:
+        raise AocpyException(f"unable to read template {name!r}: {err}")
@@ -0,0 +1,45 @@
+""" Precise waiting for puzzle releases.
+"""
+import time
+from contextlib import contextmanager
+from typing import Dict
+
+# Seconds before a release to open a connection to adventofcode.com
+WARM_AHEAD = 5.0
+# Final seconds of a wait that are busy-waited rather than slept, since sleeps
+# may overshoot by a scheduler tick
+SPIN = 0.005
+DEFAULT_RETRIES = 20
+
+
+def sleep_until(deadline: float, spin: float = SPIN):
+    """ Returns once `time.time()` reaches `deadline`, sleeping until shortly
+    before and then spinning so that it returns as close to it as possible.
+    """
+    while True:
+        remaining = deadline - time.time()
+        if remaining <= 0:
+            return
+        if remaining > spin:
+            time.sleep(remaining - spin)
+
+
+class StageTimer:
+    """ Records how long each named stage of a task takes, in order.
+    """
+
+    def __init__(self):
+        self.timings: Dict[str, float] = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = time.perf_counter() - start
+
+    def summary(self) -> str:
+        return ", ".join(
+            f"{name} {seconds * 1000:.1f}ms" for name, seconds in self.timings.items()
+        )
@@ -1,27 +1,127 @@
+import configparser
+import hashlib
 import os
+import tempfile
 from datetime import datetime
 from pathlib import Path
-
-import pytz
+from typing import Dict, Optional, Tuple, Union
 
 from aocpy.exception import AocpyException
 
-AOC_TZ = pytz.timezone("America/New_York")
+AOC_TZ_NAME = "America/New_York"
 CONFIG_DIRNAME = "~/.config/aocpy"
 
 
+def __getattr__(name):
+    # pytz is only imported once the puzzle timezone is needed
+    if name == "AOC_TZ":
+        return aoc_tz()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def aoc_tz():
+    """ Returns the timezone puzzles are released in.
+    """
+    import pytz
+
+    return pytz.timezone(AOC_TZ_NAME)
+
+
 def get_config_dir():
     return Path(os.path.expanduser(CONFIG_DIRNAME))
 
 
 def get_token_file():
-    return get_config_dir() / 'token'
+    return get_config_dir() / "token"
+
+
+def get_profiles_file():
+    return get_config_dir() / "profiles"
+
+
+def get_profiles(spec: str = "all") -> Dict[str, str]:
+    """ Returns the session cookie of each profile selected by `spec`, either
+    `all` or a comma separated list of profile names.
+
+    Profiles are read from an INI style file of named sections, i.e.
+    ```
+    # ~/.config/aocpy/profiles
+    [alice]
+    cookie = <1234mycookie>
+    ```
+
+    Raises:
+        `AocpyException` if a selected profile is not found
+    """
+    config = configparser.ConfigParser()
+    try:
+        config.read(get_profiles_file())
+    except configparser.Error as err:
+        raise AocpyException(f"unable to read profiles: {err}")
+    profiles = {
+        name: config[name]["cookie"].strip()
+        for name in config.sections()
+        if config[name].get("cookie", "").strip()
+    }
+    if spec == "all":
+        if not profiles:
+            raise AocpyException(f"no profiles found in {get_profiles_file()}")
+        return profiles
+    selected = {}
+    for name in (n.strip() for n in spec.split(",")):
+        if name not in profiles:
+            raise AocpyException(f"profile {name} not found")
+        selected[name] = profiles[name]
+    return selected
+
+
+def atomic_write(
+    path: Union[str, Path], data: Union[str, bytes], mode: Optional[int] = None
+):
+    """ Write `data` to `path` via a temporary file in the same directory, so
+    that readers see either the old contents or the new, never a partial file.
+    The file is only readable by the owner unless `mode` is given.
+    """
+    path = Path(path)
+    fd, tmp = tempfile.mkstemp(dir=str(path.parent), suffix=".tmp")
+    try:
+        if mode is not None:
+            os.fchmod(fd, mode)
+        with os.fdopen(fd, "wb") as f:
+            f.write(data.encode() if isinstance(data, str) else data)
+        os.replace(tmp, str(path))
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def account_key(session_cookie: str) -> str:
+    """ Returns a stable identifier for the account owning `session_cookie`
+    that is safe to store without revealing the cookie.
+    """
+    return hashlib.sha256(session_cookie.encode()).hexdigest()[:16]
+
+
+def unlock_time(year: int, day: int) -> datetime:
+    """ Returns the instant the puzzle for `day` of `year` is released, midnight
+    in the puzzle timezone.
+    """
+    return aoc_tz().localize(datetime(year, 12, day))
+
+
+def next_unlock() -> Tuple[int, int]:
+    """ Returns the year and day of the next puzzle to be released.
+    """
+    now = datetime.now(tz=aoc_tz())
+    if now.month == 12 and now.day < 25:
+        return now.year, now.day + 1
+    return (now.year + 1 if now.month == 12 else now.year), 1
 
 
 def current_year():
     """ Returns the most recent AOC year available
     """
-    now = datetime.now(tz=AOC_TZ)
+    now = datetime.now(tz=aoc_tz())
     year = now.year
     return year - 1 if now.month < 12 else year
 
@@ -33,13 +133,22 @@ def current_day():
     Raises:
         `AocpyException` if not currently December
     """
-    now = datetime.now(tz=AOC_TZ)
+    now = datetime.now(tz=aoc_tz())
     if now.month != 12:
         raise AocpyException("must be December")
 
     return min(now.day, 25)
 
 
+def available_days(year):
+    """ Returns the puzzle day numbers that have been released for `year`.
+    """
+    now = datetime.now(tz=aoc_tz())
+    if year < now.year or (year == now.year and now.month == 12):
+        return list(range(1, current_day() + 1 if year == now.year else 26))
+    return []
+
+
 def get_session_cookie():
     cookie = os.environ.get("AOC_SESSION_COOKIE")
     if cookie is not None:
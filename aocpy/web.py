@@ -1,24 +1,259 @@
+import json
 import logging
-from typing import NewType, Union, Tuple
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
 
 import requests
+from requests.adapters import HTTPAdapter
 
+from aocpy import metrics
 from aocpy.exception import AocpyException
+from aocpy.httpcache import CachedResponse, HTTPCache, default_http_cache
+from aocpy.puzzle import LEADERBOARD_URL, base_url, parse_wait_time
+from aocpy.utils import account_key, get_config_dir
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_POOL_SIZE = 10
+DEFAULT_RATE = 1.0
+DEFAULT_BURST = 5
+RATE_LIMIT_FNAME = "ratelimit.json"
+DEFAULT_RETRY_DELAY = 0.25
+
+
+class RateLimiter:
+    """ Token bucket allowing `rate` requests per second with bursts of up to
+    `burst` requests.
+
+    If `state_file` is given the bucket is persisted there (under an exclusive
+    file lock where supported) so that separate aocpy processes share a single
+    request budget. The limiter also tracks per-key cooldowns for answer
+    submissions.
+    """
+
+    def __init__(
+        self,
+        rate: float = DEFAULT_RATE,
+        burst: int = DEFAULT_BURST,
+        state_file: Optional[Path] = None,
+    ):
+        if rate <= 0 or burst < 1:
+            raise ValueError("rate must be positive and burst at least 1")
+        self.rate = rate
+        self.burst = burst
+        self.state_file = state_file
+        self._lock = threading.Lock()
+        self._tokens = float(burst)
+        self._updated = time.time()
+        self._cooldowns: Dict[str, float] = {}
+
+    @contextmanager
+    def _state(self):
+        with self._lock:
+            if self.state_file is None:
+                yield
+                return
+            self.state_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.state_file, "a+") as f:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_EX)
+                f.seek(0)
+                try:
+                    state = json.loads(f.read())
+                    self._tokens = min(float(state["tokens"]), self.burst)
+                    self._updated = float(state["updated"])
+                    self._cooldowns = dict(state["cooldowns"])
+                except (ValueError, KeyError, TypeError):
+                    pass
+                yield
+                now = time.time()
+                self._cooldowns = {
+                    k: until for k, until in self._cooldowns.items() if until > now
+                }
+                f.seek(0)
+                f.truncate()
+                json.dump(
+                    {
+                        "tokens": self._tokens,
+                        "updated": self._updated,
+                        "cooldowns": self._cooldowns,
+                    },
+                    f,
+                )
+
+    def reserve(self, tokens: float = 1) -> float:
+        """ Take `tokens` from the bucket, returning the number of seconds the
+        caller must wait before using them.
+        """
+        with self._state():
+            now = time.time()
+            elapsed = max(0.0, now - self._updated)
+            self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            return max(0.0, -self._tokens / self.rate)
+
+    def acquire(self, tokens: float = 1) -> float:
+        """ Block until `tokens` are available, returning the time waited.
+        """
+        delay = self.reserve(tokens)
+        if delay:
+            logger.info(f"rate limited, waiting {delay:.2f}s")
+            time.sleep(delay)
+        return delay
+
+    def set_cooldown(self, key: str, seconds: float):
+        with self._state():
+            self._cooldowns[key] = time.time() + seconds
 
-AuthSession = NewType("AuthSession", requests.Session)
+    def cooldown(self, key: str) -> float:
+        """ Returns the number of seconds remaining in the cooldown for `key`.
+        """
+        with self._state():
+            return max(0.0, self._cooldowns.get(key, 0.0) - time.time())
 
 
-def session(session_cookie) -> AuthSession:
-    s = requests.Session()
-    s.cookies["session"] = session_cookie
+def default_rate_limiter() -> RateLimiter:
+    """ Create a persistent RateLimiter configured by the `AOC_RATE_LIMIT`
+    (requests per second) and `AOC_RATE_BURST` environment variables.
+    """
+    try:
+        rate = float(os.environ.get("AOC_RATE_LIMIT", DEFAULT_RATE))
+        burst = int(os.environ.get("AOC_RATE_BURST", DEFAULT_BURST))
+    except ValueError as err:
+        raise AocpyException(f"invalid rate limit configuration: {err}")
+    return RateLimiter(rate, burst, get_config_dir() / RATE_LIMIT_FNAME)
+
+
+class AuthSession(requests.Session):
+    """ Authenticated session for adventofcode.com. Every request made through
+    the session is first scheduled by its `limiter`, and pages fetched with
+    `cached_get` are stored in its `http_cache`.
+    """
+
+    def __init__(
+        self,
+        session_cookie: str,
+        limiter: RateLimiter,
+        http_cache: Optional[HTTPCache] = None,
+    ):
+        super().__init__()
+        self.cookies["session"] = session_cookie
+        self.limiter = limiter
+        self.http_cache = http_cache
+        self.account_key = account_key(session_cookie)
+
+    def request(self, method, url, *args, **kwargs):
+        waited = self.limiter.acquire()
+        endpoint = metrics.endpoint(url)
+        if waited:
+            metrics.inc(metrics.RATE_LIMIT_WAIT, waited, endpoint=endpoint)
+        start = time.perf_counter()
+        try:
+            r = super().request(method, url, *args, **kwargs)
+        except requests.RequestException:
+            metrics.inc(metrics.RESPONSES, endpoint=endpoint, status="error")
+            raise
+        finally:
+            metrics.observe(
+                metrics.REQUEST_DURATION,
+                time.perf_counter() - start,
+                endpoint=endpoint,
+                method=method.upper(),
+            )
+        metrics.inc(metrics.RESPONSES, endpoint=endpoint, status=str(r.status_code))
+        if not kwargs.get("stream"):
+            metrics.inc(metrics.RESPONSE_BYTES, len(r.content), endpoint=endpoint)
+        return r
+
+
+def session(
+    session_cookie,
+    pool_size: int = DEFAULT_POOL_SIZE,
+    limiter: Optional[RateLimiter] = None,
+    adapter: Optional[HTTPAdapter] = None,
+    http_cache: Optional[HTTPCache] = None,
+) -> AuthSession:
+    """ Create an authenticated session for adventofcode.com.
+
+    `pool_size` is the maximum number of connections kept alive for re-use,
+    which bounds how many requests can share the session concurrently without
+    opening throwaway connections. `limiter` defaults to
+    `default_rate_limiter()` and `http_cache` to `default_http_cache()`. If
+    `adapter` is given its connection pool is used instead of creating a new
+    one.
+    """
+    s = AuthSession(
+        session_cookie,
+        limiter or default_rate_limiter(),
+        http_cache or default_http_cache(),
+    )
+    adapter = adapter or HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    # Plain HTTP is used by a local stand-in server set with AOC_BASE_URL
+    for prefix in ("https://", "http://"):
+        s.mount(prefix, adapter)
     return s
 
 
-def fetch_puzzle_input(session: AuthSession, puzzle_url: str) -> str:
+class SessionPool:
+    """ Authenticated sessions for several accounts which share a single
+    connection pool, rate limiter and HTTP cache.
+    """
+
+    def __init__(
+        self, pool_size: int = DEFAULT_POOL_SIZE, limiter: Optional[RateLimiter] = None
+    ):
+        self.limiter = limiter or default_rate_limiter()
+        self.adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.http_cache = default_http_cache()
+        self._sessions: Dict[str, AuthSession] = {}
+        self._lock = threading.Lock()
+
+    def session(self, session_cookie: str) -> AuthSession:
+        with self._lock:
+            if session_cookie not in self._sessions:
+                self._sessions[session_cookie] = session(
+                    session_cookie,
+                    limiter=self.limiter,
+                    adapter=self.adapter,
+                    http_cache=self.http_cache,
+                )
+            return self._sessions[session_cookie]
+
+
+def submission_cooldown(session: AuthSession) -> float:
+    """ Returns the number of seconds until `session` may submit an answer.
+    """
+    return session.limiter.cooldown(session.account_key)
+
+
+def fetch_puzzle_input(
+    session: AuthSession,
+    puzzle_url: str,
+    retries: int = 0,
+    retry_delay: float = DEFAULT_RETRY_DELAY,
+) -> str:
+    """ Fetch the input of a puzzle. A 404 response, i.e. the puzzle has not
+    been released yet, is retried up to `retries` times every `retry_delay`
+    seconds.
+    """
     r = session.get(puzzle_url + "/input")
+    for attempt in range(retries):
+        if r.status_code != 404:
+            break
+        logger.info(f"{puzzle_url} not released yet, retry {attempt + 1}")
+        metrics.inc(metrics.RETRIES, endpoint="input")
+        time.sleep(retry_delay)
+        r = session.get(puzzle_url + "/input")
     if not r.ok:
         msg = f"got {r.status_code} fetching {puzzle_url}"
         logger.error(msg)
@@ -28,14 +263,94 @@ def fetch_puzzle_input(session: AuthSession, puzzle_url: str) -> str:
     return r.text.rstrip("\r\r")
 
 
+def warm_connection(session: AuthSession):
+    """ Open a pooled connection to adventofcode.com, so that the DNS lookup and
+    TLS handshake are not paid by the next request.
+    """
+    session.head(base_url() + "/")
+
+
+def cached_get(session: AuthSession, url: str, ttl: Optional[float] = None) -> str:
+    """ GET `url` through the session's HTTP cache, returning the response text.
+
+    A cached response younger than `ttl` seconds (defaults to the cache's TTL)
+    is returned without a request. Otherwise the request is made conditional on
+    the cached response's ETag/Last-Modified, re-using the cached body if the
+    server responds 304 Not Modified.
+    """
+    entry = session.http_cache.get(session.account_key, url)
+    if entry is not None and session.http_cache.is_fresh(entry, ttl):
+        metrics.inc(metrics.CACHE_LOOKUPS, cache="http", result="hit")
+        return entry.body
+    headers = {}
+    if entry is not None:
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+    r = session.get(url, headers=headers)
+    if r.status_code == 304 and entry is not None:
+        metrics.inc(metrics.CACHE_LOOKUPS, cache="http", result="revalidated")
+        entry.validated = time.time()
+    elif r.ok:
+        metrics.inc(metrics.CACHE_LOOKUPS, cache="http", result="miss")
+        entry = CachedResponse(
+            url,
+            r.text,
+            r.headers.get("ETag"),
+            r.headers.get("Last-Modified"),
+            time.time(),
+        )
+    else:
+        msg = f"got {r.status_code} fetching {url}"
+        logger.error(msg)
+        raise AocpyException(msg)
+    session.http_cache.put(session.account_key, entry)
+    return entry.body
+
+
+def fetch_puzzle_page(
+    session: AuthSession, puzzle_url: str, ttl: Optional[float] = None
+) -> str:
+    """ Returns the HTML of a puzzle's description page, served from the HTTP
+    cache where possible. Submitting an answer invalidates the cached page,
+    so part 2 appears once it has been unlocked.
+    """
+    return cached_get(session, puzzle_url, ttl)
+
+
+def fetch_leaderboard(
+    session: AuthSession, year: int, board_id: str, ttl: Optional[float] = None
+) -> str:
+    """ Returns the JSON of a private leaderboard, served from the HTTP cache
+    if fetched less than `ttl` seconds ago and otherwise revalidated with a
+    conditional request.
+    """
+    url = LEADERBOARD_URL.format(base=base_url(), year=year, id=board_id)
+    return cached_get(session, url, ttl)
+
+
 def submit_answer(
     session: AuthSession, puzzle_url: str, answer: str, level: Union[int, str]
 ) -> Tuple[str, str]:
+    """ Submit `answer` for `level` of a puzzle, first waiting out any cooldown
+    from a previous submission. Any wait time given in the response is
+    recorded as the cooldown for subsequent submissions.
+    """
     if level not in [1, 2, "1", "2"]:
         raise ValueError("Submit level must be 1 or 2")
+    wait = submission_cooldown(session)
+    if wait:
+        logger.info(f"waiting {wait:.0f}s for submission cooldown")
+        time.sleep(wait)
     r = session.post(puzzle_url + "/answer", data={"level": level, "answer": answer},)
     if not r.ok:
         logger.error(f"got {r.status_code} status code")
         logger.error(r.content)
         raise AocpyException(f"Non-200 response for POST: {r}")
+    # A correct answer changes the puzzle page, i.e. part 2 is unlocked
+    session.http_cache.invalidate(session.account_key, puzzle_url)
+    wait = parse_wait_time(r.text)
+    if wait is not None:
+        session.limiter.set_cooldown(session.account_key, wait)
     return r.text, r.url
@@ -0,0 +1,146 @@
+""" Benchmark `aocpy.algo` against the naive implementations it replaces.
+
+Searches run over a random maze given as puzzle input text, and interval sets
+are compared with a plain set of integers.
+
+    $ python benchmarks/bench_algo.py
+"""
+import argparse
+import random
+import timeit
+from collections import deque
+
+from aocpy.algo import Grid, IntervalSet, bfs, bitset_distance, dijkstra, grid_bfs
+from aocpy.loader import InputFile
+
+
+def make_maze(size: int, seed: int = 0) -> bytes:
+    rng = random.Random(seed)
+    rows = ["".join(rng.choice("...#") for _ in range(size)) for _ in range(size)]
+    rows[0] = "." + rows[0][1:]
+    rows[-1] = rows[-1][:-1] + "."
+    return "\n".join(rows).encode() + b"\n"
+
+
+def naive_grid(text: bytes) -> dict:
+    return {
+        (x, y): c
+        for y, line in enumerate(text.decode().splitlines())
+        for x, c in enumerate(line)
+    }
+
+
+def naive_bfs(grid: dict, start, goal):
+    dist = {start: 0}
+    queue = deque([start])
+    while queue:
+        x, y = node = queue.popleft()
+        if node == goal:
+            return dist[node]
+        for n in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+            if grid.get(n) == "." and n not in dist:
+                dist[n] = dist[node] + 1
+                queue.append(n)
+    return -1
+
+
+def naive_dijkstra(grid: dict, start, goal):
+    # Selects the closest unvisited node by a linear scan
+    dist = {start: 0}
+    done = set()
+    while True:
+        pending = [(d, n) for n, d in dist.items() if n not in done]
+        if not pending:
+            return -1
+        d, node = min(pending)
+        if node == goal:
+            return d
+        done.add(node)
+        x, y = node
+        for n in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+            if grid.get(n) == "." and d + 1 < dist.get(n, d + 2):
+                dist[n] = d + 1
+
+
+def generic_bfs(text: bytes) -> int:
+    grid = Grid.from_input(InputFile.from_bytes(text))
+    cells, dot = grid.cells, ord(".")
+    goal = len(grid) - 1
+    dist = bfs(0, lambda i: [n for n in grid.neighbours(i) if cells[n] == dot], goal)
+    return dist.get(goal, -1)
+
+
+def grid_flat_bfs(text: bytes) -> int:
+    grid = Grid.from_input(InputFile.from_bytes(text))
+    goal = len(grid) - 1
+    return grid_bfs(grid, 0, b".", goal)[goal]
+
+
+def grid_dijkstra(text: bytes) -> int:
+    grid = Grid.from_input(InputFile.from_bytes(text))
+    cells, dot = grid.cells, ord(".")
+    goal = len(grid) - 1
+    dist = dijkstra(
+        0, lambda i: [(n, 1) for n in grid.neighbours(i) if cells[n] == dot], goal,
+    )
+    return dist.get(goal, -1)
+
+
+def grid_bitset_bfs(text: bytes) -> int:
+    grid = Grid.from_input(InputFile.from_bytes(text))
+    return bitset_distance(grid, 0, len(grid) - 1, b".")
+
+
+def naive_intervals(ranges) -> int:
+    covered = set()
+    for start, stop in ranges:
+        covered.update(range(start, stop))
+    return len(covered)
+
+
+def interval_set(ranges) -> int:
+    s = IntervalSet()
+    for start, stop in ranges:
+        s.add(start, stop)
+    return s.size()
+
+
+def report(name, fn, number):
+    seconds = min(timeit.repeat(fn, number=number, repeat=3)) / number
+    print(f"{name:<24} {seconds * 1e3:10.3f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-s", "--size", type=int, default=141)
+    parser.add_argument("-n", "--number", type=int, default=5)
+    args = parser.parse_args()
+
+    text = make_maze(args.size)
+    goal = (args.size - 1, args.size - 1)
+    answers = {
+        "naive bfs": lambda: naive_bfs(naive_grid(text), (0, 0), goal),
+        "Grid + bfs": lambda: generic_bfs(text),
+        "Grid + grid_bfs": lambda: grid_flat_bfs(text),
+        "Grid + bitset_bfs": lambda: grid_bitset_bfs(text),
+        "naive dijkstra": lambda: naive_dijkstra(naive_grid(text), (0, 0), goal),
+        "Grid + dijkstra": lambda: grid_dijkstra(text),
+    }
+    print(f"{args.size}x{args.size} maze, path length {generic_bfs(text)}")
+    for name, fn in answers.items():
+        # The naive Dijkstra is quadratic, so only run it once
+        report(name, fn, 1 if name == "naive dijkstra" else args.number)
+
+    rng = random.Random(0)
+    ranges = [
+        (start, start + rng.randrange(1, 10000))
+        for start in (rng.randrange(10 ** 6) for _ in range(1000))
+    ]
+    assert naive_intervals(ranges) == interval_set(ranges)
+    print(f"{len(ranges)} ranges")
+    report("naive set", lambda: naive_intervals(ranges), args.number)
+    report("IntervalSet", lambda: interval_set(ranges), args.number)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+""" Benchmark parsing of recorded answer submission response pages.
+
+Compares `aocpy.puzzle.parse_submission_response` with the BeautifulSoup based
+parsing it replaced, if beautifulsoup4 is installed.
+
+    $ python benchmarks/bench_submission_parse.py
+"""
+import argparse
+import timeit
+from pathlib import Path
+
+from aocpy.puzzle import parse_submission_response
+
+RESPONSES_DIR = (
+    Path(__file__).resolve().parent.parent / "tests/data/submission-responses"
+)
+
+
+def bs4_article_text(text):
+    from bs4 import BeautifulSoup
+
+    return BeautifulSoup(text, "html.parser").article.text
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--number", type=int, default=2000)
+    args = parser.parse_args()
+
+    candidates = {"aocpy": parse_submission_response}
+    try:
+        import bs4  # noqa: F401
+
+        candidates["bs4"] = bs4_article_text
+    except ImportError:
+        print("beautifulsoup4 not installed, skipping comparison")
+
+    for path in sorted(RESPONSES_DIR.glob("*.html")):
+        text = path.read_text()
+        for name, fn in candidates.items():
+            seconds = min(timeit.repeat(lambda: fn(text), number=args.number, repeat=5))
+            print(f"{path.name:<24} {name:<6} {seconds / args.number * 1e6:8.1f}us")
+
+
+if __name__ == "__main__":
+    main()
@@ -15,7 +15,9 @@ AUTHOR = "Ben Steadman"
 REQUIRES_PYTHON = ">=3.6.0"
 VERSION = "0.0.1"
 
-REQUIRED = ["requests", "beautifulsoup4", "click", "pytz"]
+REQUIRED = ["requests", "click", "pytz"]
+
+EXTRAS = {"numpy": ["numpy"], "async": ["aiohttp"]}
 
 here = os.path.abspath(os.path.dirname(__file__))
 
@@ -76,8 +78,9 @@ setup(
     python_requires=REQUIRES_PYTHON,
     url=URL,
     packages=find_packages(exclude=("tests",)),
-    entry_points={"console_scripts": ["aocpy=aocpy.cli:cli"]},
+    entry_points={"console_scripts": ["aocpy=aocpy.client:main"]},
     install_requires=REQUIRED,
+    extras_require=EXTRAS,
     include_package_data=True,
     license="MIT",
     classifiers=[
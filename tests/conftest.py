@@ -0,0 +1,19 @@
+import pytest
+from requests.adapters import HTTPAdapter
+
+# Captured before any test patches it. Stopping the default responses mock
+# while a test's `responses` fixture is also active leaves the adapter patched
+# for every later test, including those marked withoutresponses.
+_SEND = HTTPAdapter.send
+
+
+@pytest.fixture(autouse=True)
+def _real_requests(request, monkeypatch):
+    if request.node.get_closest_marker("withoutresponses"):
+        monkeypatch.setattr(HTTPAdapter, "send", _SEND)
+
+
+@pytest.fixture
+def home_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    return tmp_path
@@ -0,0 +1,148 @@
+import asyncio
+import threading
+from pathlib import Path
+
+import pytest
+
+from aocpy import web
+from aocpy.cache import SQLiteCache
+from aocpy.exception import AocpyException, IncorrectSubmissionError
+from aocpy.httpcache import CachedResponse, HTTPCache
+from aocpy.puzzle import Puzzle, check_submission_response_text
+
+aiohttp = pytest.importorskip("aiohttp")
+aio = pytest.importorskip("aocpy.aio")
+
+from aiohttp import web as aiohttp_web  # noqa: E402
+from aiohttp.test_utils import TestServer  # noqa: E402
+
+TEST_DATA_DIR = Path(__file__).resolve().parent / "data"
+
+
+def run_with_server(routes, coro_fn, http_cache=None):
+    """ Run `coro_fn(session, base_url)` against a local server for `routes`.
+    """
+
+    async def main():
+        app = aiohttp_web.Application()
+        app.add_routes(routes)
+        async with TestServer(app) as server:
+            limiter = web.RateLimiter(1000, 1000)
+            async with aio.session(
+                "12345", limiter=limiter, http_cache=http_cache
+            ) as s:
+                return await coro_fn(s, str(server.make_url("")).rstrip("/"))
+
+    return asyncio.run(main())
+
+
+async def puzzle_input(request):
+    if request.cookies.get("session") != "12345":
+        return aiohttp_web.Response(status=400)
+    return aiohttp_web.Response(text=f"input {request.match_info['day']}")
+
+
+def test_fetch_puzzle_input():
+    routes = [aiohttp_web.get("/2019/day/{day}/input", puzzle_input)]
+    text = run_with_server(
+        routes, lambda s, url: aio.fetch_puzzle_input(s, url + "/2019/day/1")
+    )
+    assert text == "input 1"
+
+
+def test_fetch_puzzle_input_error():
+    with pytest.raises(AocpyException):
+        run_with_server(
+            [], lambda s, url: aio.fetch_puzzle_input(s, url + "/2019/day/1")
+        )
+
+
+@pytest.mark.parametrize("status", [304, 300])
+def test_fetch_puzzle_input_unfollowed_redirect(status):
+    async def redirect(request):
+        return aiohttp_web.Response(status=status)
+
+    with pytest.raises(AocpyException):
+        run_with_server(
+            [aiohttp_web.get("/2019/day/1/input", redirect)],
+            lambda s, url: aio.fetch_puzzle_input(s, url + "/2019/day/1"),
+        )
+
+
+def test_get_puzzle_input_concurrently(tmp_path, monkeypatch):
+    cache = SQLiteCache(tmp_path / "inputs.sqlite3")
+    cache.put(Puzzle(2019, 1, "12345"), "cached")
+
+    async def get_all(s, url):
+        monkeypatch.setenv("AOC_BASE_URL", url)
+        puzzles = [Puzzle(2019, day, "12345") for day in range(1, 26)]
+        return await asyncio.gather(
+            *(aio.get_puzzle_input(s, p, cache) for p in puzzles)
+        )
+
+    routes = [aiohttp_web.get("/2019/day/{day}/input", puzzle_input)]
+    inputs = run_with_server(routes, get_all)
+    assert inputs == ["cached"] + [f"input {day}" for day in range(2, 26)]
+    assert all(Puzzle(2019, day, "12345") in cache for day in range(1, 26))
+
+
+def test_submit_answer():
+    async def answer(request):
+        data = await request.post()
+        assert data["level"] == "1"
+        assert data["answer"] == "1234"
+        return aiohttp_web.Response(
+            text=(TEST_DATA_DIR / "submission-responses/incorrect.html").read_text()
+        )
+
+    async def submit(s, url):
+        text, _ = await aio.submit_answer(s, url + "/2016/day/8", "1234", 1)
+        return text, s.limiter.cooldown(s.account_key)
+
+    routes = [aiohttp_web.post("/2016/day/8/answer", answer)]
+    text, cooldown = run_with_server(routes, submit)
+    with pytest.raises(IncorrectSubmissionError):
+        check_submission_response_text(text)
+    assert cooldown == pytest.approx(60, abs=1)
+
+
+def test_submit_answer_invalidates_puzzle_page(tmp_path):
+    http_cache = HTTPCache(tmp_path)
+
+    async def answer(request):
+        return aiohttp_web.Response(
+            text=(TEST_DATA_DIR / "submission-responses/incorrect.html").read_text()
+        )
+
+    async def submit(s, url):
+        http_cache.put(s.account_key, CachedResponse(url + "/2016/day/8", "page"))
+        await aio.submit_answer(s, url + "/2016/day/8", "1234", 1)
+        return http_cache.get(s.account_key, url + "/2016/day/8")
+
+    routes = [aiohttp_web.post("/2016/day/8/answer", answer)]
+    assert run_with_server(routes, submit, http_cache) is None
+
+
+def test_limiter_runs_in_executor(mocker):
+    """ The limiter locks its state file, so must not block the event loop.
+    """
+    threads = []
+
+    def record(*args):
+        threads.append(threading.current_thread())
+        return 0
+
+    async def submit(s, url):
+        mocker.patch.object(s.limiter, "reserve", side_effect=record)
+        mocker.patch.object(s.limiter, "cooldown", side_effect=record)
+        mocker.patch.object(s.limiter, "set_cooldown", side_effect=record)
+        return await aio.submit_answer(s, url + "/2016/day/8", "1234", 1)
+
+    async def answer(request):
+        return aiohttp_web.Response(
+            text=(TEST_DATA_DIR / "submission-responses/incorrect.html").read_text()
+        )
+
+    run_with_server([aiohttp_web.post("/2016/day/8/answer", answer)], submit)
+    assert len(threads) == 3
+    assert threading.main_thread() not in threads
@@ -0,0 +1,162 @@
+import random
+
+import pytest
+
+from aocpy.algo import (
+    Grid,
+    IntervalSet,
+    astar,
+    bfs,
+    bits,
+    bitset_bfs,
+    bitset_distance,
+    dijkstra,
+    flood_fill,
+    grid_bfs,
+    grid_mask,
+)
+from aocpy.exception import AocpyException
+from aocpy.loader import InputFile
+from aocpy.stream import LineStream
+
+MAZE = b"""\
+#.###
+#...#
+###.#
+#...#
+"""
+
+
+@pytest.fixture
+def maze():
+    return Grid.from_input(InputFile.from_bytes(MAZE))
+
+
+def test_grid_from_input(maze):
+    assert (maze.width, maze.height) == (5, 4)
+    assert maze[1, 0] == ord(".")
+    assert maze.xy(maze.index(3, 2)) == (3, 2)
+    assert Grid.from_input(LineStream.from_bytes(MAZE.replace(b"\n", b"\r\n"))) == maze
+    assert Grid.from_input(MAZE.decode().splitlines()) == maze
+    assert str(maze) == MAZE.decode().rstrip()
+    with pytest.raises(AocpyException):
+        Grid.from_input(["##", "#"])
+
+
+def test_grid_access(maze):
+    assert (4, 3) in maze and (5, 0) not in maze
+    with pytest.raises(IndexError):
+        maze[-1, 0]
+    copy = maze.copy()
+    copy[1, 0] = ord("#")
+    assert maze[1, 0] == ord(".")
+    assert copy.count(ord(".")) == maze.count(ord(".")) - 1
+    assert maze.find(ord(".")) == 1
+    assert list(maze.find_all(ord("."))) == [1, 6, 7, 8, 13, 16, 17, 18]
+
+
+def test_grid_neighbours(maze):
+    assert sorted(maze.neighbours(0)) == [1, 5]
+    assert sorted(maze.neighbours(0, diagonal=True)) == [1, 5, 6]
+    assert len(maze.neighbours(maze.index(2, 2), diagonal=True)) == 8
+
+
+def test_grid_to_numpy(maze):
+    np = pytest.importorskip("numpy")
+    array = maze.to_numpy()
+    assert array.shape == (4, 5)
+    assert np.count_nonzero(array == ord(".")) == maze.count(ord("."))
+
+
+def test_bfs_and_dijkstra_agree(maze):
+    def neighbours(i):
+        return [n for n in maze.neighbours(i) if maze.cells[n] == ord(".")]
+
+    start, goal = 1, maze.index(1, 3)
+    assert bfs(start, neighbours)[goal] == 7
+    assert grid_bfs(maze, start, b".")[goal] == 7
+    assert grid_bfs(maze, start, b".", goal=maze.index(3, 2))[goal] == -1
+    assert bfs(start, neighbours, goal)[goal] == 7
+    assert dijkstra(start, lambda i: ((n, 1) for n in neighbours(i)))[goal] == 7
+    assert dijkstra(start, lambda i: ((n, 2) for n in neighbours(i)), goal)[goal] == 14
+
+
+def test_astar():
+    walls = {(1, y) for y in range(-5, 5)}
+
+    def neighbours(p):
+        x, y = p
+        for q in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+            if q not in walls and all(-10 <= c <= 10 for c in q):
+                yield q, 1
+
+    goal = (3, 0)
+    cost = astar((0, 0), goal, neighbours, lambda p: abs(p[0] - 3) + abs(p[1]))
+    assert cost == dijkstra((0, 0), neighbours)[goal] == 13
+    assert astar((0, 0), (20, 0), neighbours, lambda p: 0) is None
+
+
+def test_grid_mask(maze):
+    mask = grid_mask(maze, b".")
+    assert list(bits(mask)) == list(maze.find_all(ord(".")))
+
+
+def test_bitset_bfs(maze):
+    layers = [list(bits(layer)) for layer in bitset_bfs(maze, [1], b".")]
+    assert layers == [[1], [6], [7], [8], [13], [18], [17], [16]]
+    assert bitset_distance(maze, 1, maze.index(1, 3), b".") == 7
+    assert bitset_distance(maze, 1, 0, b".") == -1
+    assert bin(flood_fill(maze, 1, b".")).count("1") == 8
+
+
+def test_bitset_bfs_matches_bfs():
+    rng = random.Random(0)
+    width, height = 37, 23
+    grid = Grid(
+        width, height, bytearray(rng.choice(b"..#") for _ in range(width * height)),
+    )
+    start = grid.find(ord("."))
+
+    def neighbours(i):
+        return [n for n in grid.neighbours(i) if grid.cells[n] == ord(".")]
+
+    expected = bfs(start, neighbours)
+    dist = grid_bfs(grid, start, b".")
+    assert {i: d for i, d in enumerate(dist) if d >= 0} == expected
+    for steps, layer in enumerate(bitset_bfs(grid, [start], b".")):
+        assert sorted(bits(layer)) == sorted(
+            i for i, d in expected.items() if d == steps
+        )
+
+
+def test_interval_set():
+    s = IntervalSet([(0, 5), (10, 15)])
+    assert 4 in s and 5 not in s and 10 in s and -1 not in s
+    s.add(5, 10)
+    assert list(s) == [(0, 15)]
+    s.add(20, 25)
+    s.add(-5, -2)
+    assert list(s) == [(-5, -2), (0, 15), (20, 25)]
+    s.remove(3, 22)
+    assert list(s) == [(-5, -2), (0, 3), (22, 25)]
+    s.remove(-10, 1)
+    assert s == IntervalSet([(1, 3), (22, 25)])
+    assert len(s) == 2
+    assert s.size() == 5
+
+
+def test_interval_set_matches_set():
+    rng = random.Random(1)
+    s = IntervalSet()
+    expected = set()
+    for _ in range(500):
+        start = rng.randrange(-50, 50)
+        stop = start + rng.randrange(0, 10)
+        if rng.random() < 0.6:
+            s.add(start, stop)
+            expected.update(range(start, stop))
+        else:
+            s.remove(start, stop)
+            expected.difference_update(range(start, stop))
+    assert {x for start, stop in s for x in range(start, stop)} == expected
+    assert all(a[1] < b[0] for a, b in zip(list(s), list(s)[1:]))
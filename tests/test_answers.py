@@ -0,0 +1,60 @@
+from pathlib import Path
+
+import pytest
+
+from aocpy.answers import (
+    CORRECT,
+    INCORRECT,
+    TOO_HIGH,
+    TOO_LOW,
+    AnswerStore,
+)
+from aocpy.puzzle import Puzzle, parse_hint
+
+TEST_DATA_DIR = Path(__file__).resolve().parent / "data"
+
+
+@pytest.fixture
+def store(tmp_path):
+    return AnswerStore(tmp_path / "answers.sqlite3")
+
+
+@pytest.fixture
+def puzzle():
+    return Puzzle(2019, 1, "12345")
+
+
+def test_unknown_answer(store, puzzle):
+    assert store.check(puzzle, 1, "1234") is None
+    assert store.correct_answer(puzzle, 1) is None
+
+
+def test_correct_answer(store, puzzle):
+    store.record(puzzle, 1, "1234", True)
+    assert store.correct_answer(puzzle, 1) == "1234"
+    assert store.check(puzzle, 1, "1234") == CORRECT
+    assert store.check(puzzle, 1, "4321") == INCORRECT
+    # Levels and accounts are independent
+    assert store.check(puzzle, 2, "1234") is None
+    assert store.check(Puzzle(2019, 1, "67890"), 1, "1234") is None
+
+
+def test_incorrect_answer(store, puzzle):
+    store.record(puzzle, 1, "abc", False)
+    assert store.check(puzzle, 1, "abc") == INCORRECT
+    assert store.check(puzzle, 1, "abd") is None
+
+
+def test_bounds(store, puzzle):
+    store.record(puzzle, 1, "100", False, TOO_HIGH)
+    store.record(puzzle, 1, "10", False, TOO_LOW)
+    assert store.check(puzzle, 1, "100") == TOO_HIGH
+    assert store.check(puzzle, 1, "150") == TOO_HIGH
+    assert store.check(puzzle, 1, "5") == TOO_LOW
+    assert store.check(puzzle, 1, "50") is None
+
+
+def test_parse_hint():
+    text = (TEST_DATA_DIR / "submission-responses/incorrect.html").read_text()
+    assert parse_hint(text) == TOO_HIGH
+    assert parse_hint("That's not the right answer.") is None
@@ -0,0 +1,140 @@
+import sqlite3
+
+import pytest
+
+from aocpy.cache import FileCache, InputCache, SQLiteCache
+from aocpy.puzzle import Puzzle
+
+
+@pytest.fixture
+def sqlite_cache(tmp_path):
+    return SQLiteCache(tmp_path / "inputs.sqlite3")
+
+
+def test_sqlite_cache_round_trip(sqlite_cache):
+    p = Puzzle(2019, 1, "12345")
+    assert sqlite_cache.get(p) is None
+    assert p not in sqlite_cache
+    sqlite_cache.put(p, "some text\n")
+    assert p in sqlite_cache
+    assert sqlite_cache.get(p) == "some text\n"
+
+
+def test_sqlite_cache_deduplicates_inputs(sqlite_cache):
+    for cookie in ("12345", "67890"):
+        sqlite_cache.put(Puzzle(2019, 1, cookie), "shared input " * 100)
+    stats = sqlite_cache.stats()
+    assert stats.entries == 2
+    assert stats.blobs == 1
+    assert stats.raw_bytes == len("shared input " * 100)
+    assert stats.stored_bytes < stats.raw_bytes
+
+
+def test_sqlite_cache_replaces_entry(sqlite_cache):
+    p = Puzzle(2019, 1, "12345")
+    sqlite_cache.put(p, "old")
+    sqlite_cache.put(p, "new")
+    assert sqlite_cache.get(p) == "new"
+    assert sqlite_cache.stats().blobs == 1
+
+
+def test_sqlite_cache_prune_evicts_least_recently_used(sqlite_cache, mocker):
+    clock = mocker.patch("aocpy.cache.time.time")
+    puzzles = [Puzzle(2019, day, "12345") for day in range(1, 4)]
+    for i, p in enumerate(puzzles):
+        clock.return_value = i
+        sqlite_cache.put(p, str(i) * 1000)
+    clock.return_value = 10
+    sqlite_cache.get(puzzles[0])
+    one_input = sqlite_cache.stats().stored_bytes // 3
+    assert sqlite_cache.prune(one_input * 2) == 1
+    assert puzzles[0] in sqlite_cache
+    assert puzzles[1] not in sqlite_cache
+    assert puzzles[2] in sqlite_cache
+
+
+def test_sqlite_cache_max_bytes(tmp_path):
+    cache = SQLiteCache(tmp_path / "inputs.sqlite3", max_bytes=0)
+    p = Puzzle(2019, 1, "12345")
+    cache.put(p, "some text")
+    assert p not in cache
+    assert cache.stats().blobs == 0
+
+
+def test_sqlite_cache_verify(sqlite_cache, tmp_path):
+    sqlite_cache.put(Puzzle(2019, 1, "12345"), "some text")
+    assert sqlite_cache.verify() == []
+    with sqlite3.connect(str(tmp_path / "inputs.sqlite3")) as db:
+        db.execute("UPDATE blobs SET data = ?", (b"corrupt",))
+    assert len(sqlite_cache.verify()) == 1
+
+
+def test_file_cache_prune(tmp_path):
+    cache = FileCache(str(tmp_path))
+    puzzles = [Puzzle(2019, day, "12345") for day in range(1, 4)]
+    for p in puzzles:
+        object.__setattr__(
+            p, "input_fname", str(tmp_path / f"12345/2019/{p.day:02}.txt")
+        )
+        cache.put(p, "x" * 10)
+    assert cache.stats().entries == 3
+    assert cache.prune(20) == 1
+    assert cache.stats().raw_bytes == 20
+
+
+def test_file_cache_prune_evicts_least_recently_used(tmp_path, mocker):
+    clock = mocker.patch("aocpy.cache.time.time")
+    cache = FileCache(str(tmp_path))
+    puzzles = [Puzzle(2019, day, "12345") for day in range(1, 4)]
+    for i, p in enumerate(puzzles):
+        object.__setattr__(
+            p, "input_fname", str(tmp_path / f"12345/2019/{p.day:02}.txt")
+        )
+        clock.return_value = 1000 + i
+        cache.put(p, "x" * 10)
+    clock.return_value = 1010
+    assert cache.get(puzzles[0]) == "x" * 10
+    assert cache.prune(20) == 1
+    assert puzzles[0] in cache
+    assert puzzles[1] not in cache
+    assert puzzles[2] in cache
+
+
+def test_input_cache_is_abstract():
+    with pytest.raises(TypeError):
+        InputCache()
+
+
+def test_sqlite_cache_does_not_store_cookies(sqlite_cache, tmp_path):
+    sqlite_cache.put(Puzzle(2019, 1, "12345"), "some text")
+    assert b"12345" not in (tmp_path / "inputs.sqlite3").read_bytes()
+
+
+def test_sqlite_cache_migrates_cookie_keys(tmp_path):
+    path = tmp_path / "inputs.sqlite3"
+    with sqlite3.connect(str(path)) as db:
+        db.executescript(
+            SQLiteCache.SCHEMA.replace("account", "session_cookie")
+            + "INSERT INTO blobs VALUES ('h', 'zlib', x'789c2b2e2e060002b5015a', 3);"
+            + "INSERT INTO entries VALUES ('12345', 2019, 1, 'h', 0);"
+        )
+    cache = SQLiteCache(path)
+    assert cache.get(Puzzle(2019, 1, "12345")) == "sss"
+    assert cache.get(Puzzle(2019, 1, "54321")) is None
+    assert b"12345" not in path.read_bytes()
+
+
+def test_file_cache_prune_tolerates_concurrent_eviction(tmp_path, mocker):
+    cache = FileCache(str(tmp_path))
+    puzzles = [Puzzle(2019, day, "12345") for day in range(1, 4)]
+    for p in puzzles:
+        object.__setattr__(
+            p, "input_fname", str(tmp_path / f"12345/2019/{p.day:02}.txt")
+        )
+        cache.put(p, "x" * 10)
+    files = cache._files()
+    # Another process evicts the first file once it has been listed
+    mocker.patch.object(FileCache, "_files", return_value=files)
+    files[0].unlink()
+    assert cache.prune(10) == 1
+    assert len(list(tmp_path.glob("12345/2019/*.txt"))) == 1
@@ -1,13 +1,16 @@
 import contextlib
+import json
 from datetime import datetime
 from pathlib import Path
 
 import pytest
 import pytz
+import requests
 from click.testing import CliRunner
 from freezegun import freeze_time
 from hypothesis import strategies as st, given
 
+from aocpy import loadtest
 from aocpy.cli import cli
 
 
@@ -46,7 +49,7 @@ def cache_dir(home_dir):
 
 @pytest.fixture
 def runner(home_dir):
-    return Runner(env={"HOME": str(home_dir)})
+    return Runner(env={"HOME": str(home_dir), "AOC_RATE_LIMIT": "1000"})
 
 
 @freeze_time(datetime(2019, 12, 10, hour=1, tzinfo=pytz.timezone("America/New_York")))
@@ -128,9 +131,7 @@ def test_begin_specify_day(day, webbrowser_open, runner, cache_dir, responses):
 
 @freeze_time(datetime(2019, 12, 25, hour=1, tzinfo=pytz.timezone("America/New_York")))
 @given(st.integers().filter(lambda x: not (1 <= x <= 25)))
-def test_begin_specify_fails_if_out_of_range(
-        webbrowser_open, runner, config_dir, day
-):
+def test_begin_specify_fails_if_out_of_range(webbrowser_open, runner, config_dir, day):
     cookie = "12345"
     with runner.isolated_filesystem():
         result = runner.invoke(cli, ["begin", "-d", day, "-c", cookie])
@@ -160,7 +161,7 @@ def test_begin_specify_year(year, webbrowser_open, runner, cache_dir, responses)
 @pytest.mark.parametrize("day", range(1, 25))
 @pytest.mark.parametrize("year", range(2015, 2019))
 def test_begin_specify_day_and_year(
-        year, day, webbrowser_open, runner, cache_dir, responses
+    year, day, webbrowser_open, runner, cache_dir, responses
 ):
     puzzle_url = f"https://adventofcode.com/{year}/day/{day}"
     puzzle_input = "some text"
@@ -199,3 +200,476 @@ def test_begin_cached_input(webbrowser_open, runner, cache_dir, responses):
         assert (p / "10/solution.py").exists()
         # Browser opened to today's puzzle URL
         webbrowser_open.assert_called_once_with(puzzle_url)
+
+
+@freeze_time(datetime(2019, 12, 10, hour=1, tzinfo=pytz.timezone("America/New_York")))
+def test_fetch_all_days(runner, cache_dir, responses):
+    cookie = "12345"
+    for day in range(1, 11):
+        responses.add(
+            responses.GET,
+            f"https://adventofcode.com/2019/day/{day}/input",
+            body=f"input {day}",
+        )
+    with runner.isolated_filesystem():
+        result = runner.invoke(cli, ["fetch", "-y", 2019, "--all-days", "-c", cookie])
+        assert result.exit_code == 0
+        # Only released days are fetched
+        for day in range(1, 11):
+            assert (cache_dir / cookie / f"2019/{day:02}.txt").read_text() == (
+                f"input {day}"
+            )
+        assert not (cache_dir / cookie / "2019/11.txt").exists()
+        assert "Fetched 10 inputs" in result.output
+
+
+def test_fetch_skips_cached_days(runner, cache_dir, responses):
+    cookie = "12345"
+    year_cache_dir = cache_dir / cookie / "2018"
+    year_cache_dir.mkdir(parents=True)
+    (year_cache_dir / "01.txt").write_text("cached")
+    responses.add(
+        responses.GET, "https://adventofcode.com/2018/day/2/input", body="input 2"
+    )
+    with runner.isolated_filesystem():
+        result = runner.invoke(
+            cli, ["fetch", "-y", 2018, "-d", 1, "-d", 2, "-c", cookie]
+        )
+        assert result.exit_code == 0
+        assert len(responses.calls) == 1
+        assert "2018 day 01: cached" in result.output
+        assert (year_cache_dir / "02.txt").read_text() == "input 2"
+
+
+def test_fetch_reports_failures(runner, cache_dir, responses):
+    cookie = "12345"
+    responses.add(
+        responses.GET, "https://adventofcode.com/2018/day/1/input", status=404
+    )
+    with runner.isolated_filesystem():
+        result = runner.invoke(cli, ["fetch", "-y", 2018, "-d", 1, "-c", cookie])
+        assert result.exit_code == 1
+        assert "1 failed" in result.output
+
+
+def test_fetch_reports_connection_errors(runner, cache_dir, responses):
+    cookie = "12345"
+    responses.add(
+        responses.GET,
+        "https://adventofcode.com/2018/day/1/input",
+        body=requests.ConnectionError("connection reset"),
+    )
+    responses.add(
+        responses.GET, "https://adventofcode.com/2018/day/2/input", body="input 2"
+    )
+    with runner.isolated_filesystem():
+        result = runner.invoke(
+            cli, ["fetch", "-y", 2018, "-d", 1, "-d", 2, "-c", cookie]
+        )
+        assert result.exit_code == 1
+        assert "connection reset" in result.output
+        assert "1 failed" in result.output
+        assert (cache_dir / cookie / "2018/02.txt").read_text() == "input 2"
+
+
+def test_fetch_requires_days(runner, config_dir):
+    with runner.isolated_filesystem():
+        result = runner.invoke(cli, ["fetch", "-y", 2018, "-c", "12345"])
+        assert result.exit_code == 2
+
+
+def test_fetch_sqlite_cache(runner, cache_dir, responses):
+    cookie = "12345"
+    responses.add(
+        responses.GET, "https://adventofcode.com/2018/day/1/input", body="input 1"
+    )
+    env = {"AOC_CACHE": "sqlite"}
+    with runner.isolated_filesystem():
+        result = runner.invoke(
+            cli, ["fetch", "-y", 2018, "-d", 1, "-c", cookie], env=env
+        )
+        assert result.exit_code == 0
+        assert (cache_dir / "inputs.sqlite3").exists()
+        assert not (cache_dir / cookie).exists()
+        result = runner.invoke(cli, ["cache", "stats"], env=env)
+        assert "Entries: 1" in result.output
+        result = runner.invoke(cli, ["cache", "verify"], env=env)
+        assert result.exit_code == 0
+        result = runner.invoke(cli, ["cache", "prune", "-m", 0], env=env)
+        assert "Evicted 1 inputs" in result.output
+
+
+def test_bench(runner, config_dir):
+    with runner.isolated_filesystem() as p:
+        (p / "01").mkdir()
+        (p / "01/solution.py").write_text(
+            "def part_1(data):\n    return len(data)\n\n\n"
+            "def part_2(data):\n    return 0\n"
+        )
+        (p / "01/input.txt").write_text("a\nb\n")
+        result = runner.invoke(cli, ["bench", "-n", 2, "-o", "out.json"])
+        assert result.exit_code == 0
+        results = json.loads((p / "out.json").read_text())
+        assert [r["day"] for r in results] == [1]
+        assert "part_1" in results[0]
+
+
+def test_run(runner, config_dir):
+    with runner.isolated_filesystem() as p:
+        for day in (1, 2):
+            (p / f"0{day}").mkdir()
+            (p / f"0{day}/solution.py").write_text(
+                "def part_1(data):\n    return len(data)\n\n\n"
+                "def part_2(data):\n    return data[0]\n"
+            )
+            (p / f"0{day}/input.txt").write_text(f"{day}\nb\n")
+        result = runner.invoke(cli, ["run", "-y", 2020, "-j", 2, "-o", "out.json"])
+        assert result.exit_code == 0
+        assert "day 01: part 1 2, part 2 1" in result.output
+        assert "day 02: part 1 2, part 2 2" in result.output
+        report = json.loads((p / "out.json").read_text())
+        assert report["year"] == 2020
+        assert len(report["days"]) == 2
+
+
+def test_profile(runner, config_dir):
+    with runner.isolated_filesystem() as p:
+        (p / "01").mkdir()
+        (p / "01/solution.py").write_text(
+            "def part_1(data):\n    return len(data)\n\n\n"
+            "def part_2(data):\n    return data[0]\n"
+        )
+        (p / "01/example_input.txt").write_text("a\nb\nc\n")
+        result = runner.invoke(cli, ["profile", "1", "--part", "2"])
+        assert result.exit_code != 0
+        assert "no input file" in result.output
+        result = runner.invoke(cli, ["profile", "1", "-e", "--mode", "cprofile"])
+        assert result.exit_code == 0
+        assert "day 01 part 1: 3" in result.output
+        assert "solution.py:part_1" in result.output
+        assert (p / "01/part_1.pstats").is_file()
+
+
+def test_submit_records_answers(runner, config_dir, responses, mocker):
+    # Skip the cooldown requested by the incorrect answer response
+    mocker.patch("aocpy.web.time.sleep")
+    puzzle_url = "https://adventofcode.com/2019/day/8"
+    data_dir = Path(__file__).resolve().parent / "data/submission-responses"
+    responses.add(
+        responses.POST,
+        puzzle_url + "/answer",
+        body=(data_dir / "incorrect.html").read_text(),
+    )
+    responses.add(
+        responses.POST,
+        puzzle_url + "/answer",
+        body=(data_dir / "correct.html").read_text(),
+    )
+    args = ["-y", 2019, "-d", 8, "-c", "12345"]
+    with runner.isolated_filesystem():
+        result = runner.invoke(cli, ["submit", "1234", "1", *args])
+        assert "too high" in result.output
+        # Known to be too high without submitting
+        result = runner.invoke(cli, ["submit", "2000", "1", *args])
+        assert "not submitted" in result.output
+        assert len(responses.calls) == 1
+        result = runner.invoke(cli, ["submit", "1000", "1", *args])
+        assert "Correct answer" in result.output
+        result = runner.invoke(cli, ["submit", "1000", "1", *args])
+        assert "already complete" in result.output
+        assert len(responses.calls) == 2
+
+
+def test_verify(runner, config_dir, responses):
+    puzzle_url = "https://adventofcode.com/2019/day/1"
+    data_dir = Path(__file__).resolve().parent / "data/submission-responses"
+    responses.add(
+        responses.POST,
+        puzzle_url + "/answer",
+        body=(data_dir / "correct.html").read_text(),
+    )
+    args = ["-y", 2019, "-c", "12345"]
+    with runner.isolated_filesystem() as p:
+        runner.invoke(cli, ["submit", "2", "1", "-d", 1, *args])
+        (p / "01").mkdir()
+        (p / "01/solution.py").write_text(
+            "def part_1(data):\n    return len(data)\n\n\n"
+            "def part_2(data):\n    return 0\n"
+        )
+        (p / "01/input.txt").write_text("a\nb\n")
+        result = runner.invoke(cli, ["verify", *args])
+        assert result.exit_code == 0
+        assert "day 01 level 1: 2 ok" in result.output
+        assert "day 01 level 2: 0 unknown" in result.output
+        (p / "01/input.txt").write_text("a\n")
+        result = runner.invoke(cli, ["verify", *args])
+        assert result.exit_code == 1
+        assert "day 01 level 1: 1 incorrect, expected 2" in result.output
+
+
+def test_verify_without_session_cookie(runner, config_dir, responses):
+    data_dir = Path(__file__).resolve().parent / "data/submission-responses"
+    responses.add(
+        responses.POST,
+        "https://adventofcode.com/2019/day/1/answer",
+        body=(data_dir / "correct.html").read_text(),
+    )
+    no_cookie = {"AOC_SESSION_COOKIE": None}
+    with runner.isolated_filesystem() as p:
+        (p / "01").mkdir()
+        (p / "01/solution.py").write_text(
+            "def part_1(data):\n    return len(data)\n\n\n"
+            "def part_2(data):\n    return 0\n"
+        )
+        (p / "01/input.txt").write_text("a\nb\n")
+        result = runner.invoke(cli, ["verify", "-y", 2019], env=no_cookie)
+        assert result.exit_code == 0
+        assert "day 01 level 1: 2 unknown" in result.output
+        # The only account with recorded answers is checked
+        runner.invoke(cli, ["submit", "2", "1", "-y", 2019, "-d", 1, "-c", "12345"])
+        result = runner.invoke(cli, ["verify", "-y", 2019], env=no_cookie)
+        assert result.exit_code == 0
+        assert "day 01 level 1: 2 ok" in result.output
+
+
+@pytest.fixture
+def profiles(config_dir):
+    (config_dir / "profiles").write_text(
+        "[alice]\ncookie = 12345\n\n[bob]\ncookie = 67890\n"
+    )
+    return {"alice": "12345", "bob": "67890"}
+
+
+def test_fetch_profiles(runner, cache_dir, profiles, responses):
+    responses.add(
+        responses.GET, "https://adventofcode.com/2018/day/1/input", body="input"
+    )
+    with runner.isolated_filesystem():
+        result = runner.invoke(cli, ["fetch", "-y", 2018, "-d", 1, "-p", "all"])
+        assert result.exit_code == 0
+        for cookie in profiles.values():
+            assert (cache_dir / cookie / "2018/01.txt").exists()
+        assert "alice 2018 day 01" in result.output
+        assert "bob 2018 day 01" in result.output
+
+
+def test_fetch_unknown_profile(runner, cache_dir, profiles):
+    with runner.isolated_filesystem():
+        result = runner.invoke(cli, ["fetch", "-y", 2018, "-d", 1, "-p", "carol"])
+        assert result.exit_code == 2
+        assert "Invalid value for --profiles: profile carol not found" in (
+            result.output
+        )
+
+
+def test_run_profiles(runner, cache_dir, profiles):
+    for name, cookie in profiles.items():
+        (cache_dir / cookie / "2018").mkdir(parents=True)
+        (cache_dir / cookie / "2018/01.txt").write_text(f"{name}\n")
+    with runner.isolated_filesystem() as p:
+        (p / "01").mkdir()
+        (p / "01/solution.py").write_text(
+            "def part_1(data):\n    return data[0]\n\n\n"
+            "def part_2(data):\n    return len(data[0])\n"
+        )
+        result = runner.invoke(cli, ["run", "-y", 2018, "-p", "all", "-o", "out.json"])
+        assert result.exit_code == 0
+        assert "alice / 5" in result.output
+        assert "bob / 3" in result.output
+        report = json.loads((p / "out.json").read_text())
+        assert report["accounts"]["bob"][0]["answers"] == {"1": "bob", "2": "3"}
+
+
+@freeze_time(datetime(2019, 12, 10, hour=1, tzinfo=pytz.timezone("America/New_York")))
+def test_begin_writes_examples(webbrowser_open, runner, cache_dir, responses):
+    puzzle_url = "https://adventofcode.com/2019/day/10"
+    responses.add(responses.GET, puzzle_url + "/input", body="some text")
+    responses.add(
+        responses.GET,
+        puzzle_url,
+        body="<article><pre><code>1\n2\n</code></pre><code><em>3</em></code></article>",
+    )
+    with runner.isolated_filesystem() as p:
+        result = runner.invoke(cli, ["begin", "-c", "12345"])
+        assert result.exit_code == 0
+        examples = json.loads((p / "10/examples.json").read_text())
+        assert examples == [{"part": 1, "input": "1\n2\n", "answer": "3"}]
+        assert (p / "10/example_input.txt").read_text() == "1\n2\n"
+
+        (p / "10/solution.py").write_text(
+            "def parse(f):\n    return list(f.ints())\n\n\n"
+            "def part_1(data):\n    return sum(data)\n"
+        )
+        result = runner.invoke(cli, ["test", "10"])
+        assert result.exit_code == 0
+        assert "day 10 part 1: ok" in result.output
+
+
+@freeze_time(datetime(2019, 12, 3, hour=1, tzinfo=pytz.timezone("America/New_York")))
+def test_begin_all(webbrowser_open, runner, cache_dir, responses):
+    for day in (1, 3):
+        puzzle_url = f"https://adventofcode.com/2019/day/{day}"
+        responses.add(responses.GET, puzzle_url + "/input", body=f"input {day}")
+        responses.add(
+            responses.GET,
+            puzzle_url,
+            body="<article><pre><code>x</code></pre><code><em>1</em></code></article>",
+        )
+    with runner.isolated_filesystem() as p:
+        (p / "02").mkdir()
+        (p / "02/solution.py").write_text("# already started\n")
+        result = runner.invoke(cli, ["begin", "-y", 2019, "--all", "-c", "12345"])
+        assert result.exit_code == 0
+        assert "2 days to generate, 1 already generated" in result.output
+        assert (p / "01/input.txt").read_text() == "input 1"
+        assert (p / "03/input.txt").read_text() == "input 3"
+        assert (p / "03/examples.json").exists()
+        assert (p / "02/solution.py").read_text() == "# already started\n"
+        assert not list(p.glob("*/*.tmp"))
+        webbrowser_open.assert_not_called()
+
+        # Running again is a no-op
+        result = runner.invoke(cli, ["begin", "-y", 2019, "--all", "-c", "12345"])
+        assert result.exit_code == 0
+        assert "0 days to generate, 3 already generated" in result.output
+
+
+@freeze_time(datetime(2019, 12, 10, hour=1, tzinfo=pytz.timezone("America/New_York")))
+def test_begin_template(webbrowser_open, runner, home_dir, cache_dir, responses):
+    puzzle_url = "https://adventofcode.com/2019/day/10"
+    responses.add(responses.GET, puzzle_url + "/input", body="some text")
+    responses.add(
+        responses.GET,
+        puzzle_url,
+        body="<article><h2>--- Day 10: Monitoring Station ---</h2></article>",
+    )
+    user_dir = home_dir / ".config/aocpy/templates/mine"
+    user_dir.mkdir(parents=True)
+    (user_dir / "solution.py").write_text("# {{ year }} {{ day }} {{ title }}\n")
+    with runner.isolated_filesystem() as p:
+        result = runner.invoke(cli, ["begin", "-c", "12345", "-t", "missing"])
+        assert result.exit_code == 2
+        assert "unknown template" in result.output
+        result = runner.invoke(cli, ["begin", "-c", "12345", "-t", "mine"])
+        assert result.exit_code == 0
+        assert (p / "10/solution.py").read_text() == "# 2019 10 Monitoring Station\n"
+
+
+def test_leaderboard_watch_once(runner, config_dir, responses):
+    url = "https://adventofcode.com/2020/leaderboard/private/view/42.json"
+    responses.add(responses.GET, url, body=json.dumps({"members": {}}))
+    result = runner.invoke(
+        cli, ["leaderboard", "watch", "42", "-y", 2020, "--once", "-c", "12345"]
+    )
+    assert result.exit_code == 0
+    event = json.loads(result.output)
+    assert event["type"] == "baseline"
+    assert event["board"] == "42"
+    assert (config_dir / "leaderboards/2020/42.json").exists()
+    result = runner.invoke(cli, ["leaderboard", "watch", "42", "-i", 60])
+    assert result.exit_code == 2
+
+
+def test_begin_wait(webbrowser_open, runner, cache_dir, responses, mocker):
+    release = pytz.timezone("America/New_York").localize(datetime(2020, 12, 5))
+    now = [release.timestamp() - 60]
+
+    def time():
+        # Time passes while spinning
+        now[0] += 0.0001
+        return now[0]
+
+    def sleep(seconds):
+        # Overshoot slightly, as real sleeps do
+        now[0] += seconds + 0.001
+
+    # aocpy.cli, aocpy.unlock and aocpy.web share the same time module
+    mocker.patch("aocpy.unlock.time.time", side_effect=time)
+    mocker.patch("aocpy.unlock.time.sleep", side_effect=sleep)
+    puzzle_url = "https://adventofcode.com/2020/day/5"
+    warm = responses.add(responses.HEAD, "https://adventofcode.com/")
+    responses.add(responses.GET, puzzle_url + "/input", status=404)
+    responses.add(responses.GET, puzzle_url + "/input", body="released")
+    with runner.isolated_filesystem() as p:
+        result = runner.invoke(
+            cli, ["begin", "-y", 2020, "-d", 5, "--wait", "-c", "12345"]
+        )
+        assert result.exit_code == 0, result.output
+        assert (p / "05/input.txt").read_text() == "released"
+        assert (p / "05/solution.py").exists()
+        assert warm.call_count == 1
+        assert now[0] >= release.timestamp()
+        for stage in ("scaffold", "warm", "wait", "fetch", "write"):
+            assert f"{stage} " in result.output
+        webbrowser_open.assert_called_once_with(puzzle_url)
+
+
+def test_stats(runner, config_dir):
+    result = runner.invoke(cli, ["stats"])
+    assert result.exit_code == 0, result.output
+    assert "set AOC_METRICS=jsonl" in result.output
+
+    def sample(kind, name, value, **labels):
+        return json.dumps(
+            {"time": 0, "kind": kind, "name": name, "labels": labels, "value": value}
+        )
+
+    lines = [
+        sample("histogram", "aocpy_http_request_duration_seconds", 0.1 * i, **labels)
+        for i, labels in enumerate(
+            [{"endpoint": "input", "method": "GET"}] * 4
+            + [{"endpoint": "answer", "method": "POST"}],
+            start=1,
+        )
+    ]
+    lines += [
+        sample("counter", "aocpy_http_responses", 3, endpoint="input", status="200"),
+        sample("counter", "aocpy_http_responses", 1, endpoint="input", status="404"),
+        sample("counter", "aocpy_http_response_bytes", 120, endpoint="input"),
+        sample("counter", "aocpy_http_retries", 1, endpoint="input"),
+        sample("counter", "aocpy_cache_lookups", 3, cache="input", result="hit"),
+        sample("counter", "aocpy_cache_lookups", 1, cache="input", result="miss"),
+    ]
+    (config_dir / "metrics.jsonl").write_text("\n".join(lines) + "\n")
+    with runner.isolated_filesystem() as p:
+        result = runner.invoke(cli, ["stats", "-o", "metrics.prom"])
+        assert result.exit_code == 0, result.output
+        assert "aocpy_http_retries_total" in (p / "metrics.prom").read_text()
+    rows = {line.split()[0]: line.split()[1:] for line in result.output.splitlines()}
+    assert rows["input"] == ["4", "1", "200ms", "400ms", "400ms", "400ms", "120"]
+    assert rows["answer"] == ["1", "0", "500ms", "500ms", "500ms", "500ms", "0"]
+    assert "Retries: 1" in result.output
+    assert "Input cache: 3/4 hits (75%)" in result.output
+
+
+@pytest.mark.withoutresponses
+def test_loadtest(runner):
+    with runner.isolated_filesystem() as p:
+        result = runner.invoke(
+            cli,
+            ["loadtest", "-n", 30, "-j", 3, "--server-rate", 0.01, "-o", "out.json"],
+        )
+        assert result.exit_code == 0, result.output
+        report = json.loads((p / "out.json").read_text())
+    assert "30 requests at concurrency 3" in result.output
+    assert "latency p50" in result.output
+    assert report["connections"] <= 3
+    # The stand-in allows an initial burst of 10 requests
+    assert report["statuses"] == {"200": 10, "429": 20}
+    assert report["errors"] == {"got 429": 20}
+
+
+@pytest.mark.parametrize(
+    "args,rate",
+    [
+        (["-u", "http://127.0.0.1:8000"], 1000),
+        (["-u", "http://127.0.0.1:8000", "--client-rate", 5], 5),
+        ([], loadtest.UNLIMITED_RATE),
+    ],
+)
+def test_loadtest_rate_limit(args, rate, runner, mocker):
+    run = mocker.patch("aocpy.loadtest.run_load_test")
+    run.return_value = loadtest.LoadTestReport(1, 1, 1.0, [0.1])
+    result = runner.invoke(cli, ["loadtest", "-n", 1, *args])
+    assert result.exit_code == 0, result.output
+    assert run.call_args[1]["limiter"].rate == rate
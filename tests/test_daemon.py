@@ -0,0 +1,125 @@
+import shutil
+import tempfile
+import textwrap
+from pathlib import Path
+
+import pytest
+
+from aocpy import client, daemon
+
+SOLUTION = """
+def parse(f):
+    return [int(x) for x in f.ints()]
+
+
+def part_1(data):
+    return sum(data)
+
+
+def part_2(data):
+    return max(data)
+"""
+
+
+@pytest.fixture
+def home(monkeypatch):
+    # Unix socket paths are limited to ~100 characters, which the pytest
+    # temporary directory may exceed
+    d = Path(tempfile.mkdtemp(prefix="aocpy-"))
+    monkeypatch.setenv("HOME", str(d))
+    monkeypatch.delenv("AOC_NO_DAEMON", raising=False)
+    yield d
+    shutil.rmtree(d)
+
+
+@pytest.fixture
+def running(home):
+    status = daemon.start()
+    yield status
+    if daemon.status() is not None:
+        daemon.stop()
+
+
+@pytest.fixture
+def day_dir(home, monkeypatch):
+    d = home / "2020/01"
+    d.mkdir(parents=True)
+    (d / "solution.py").write_text(textwrap.dedent(SOLUTION))
+    (d / "input.txt").write_text("1\n2\n3\n")
+    monkeypatch.chdir(d.parent)
+    return d
+
+
+def test_status_not_running(home):
+    assert daemon.status() is None
+    with pytest.raises(FileNotFoundError):
+        client.forward(["run", "1"])
+
+
+def test_start_and_stop(running):
+    status = daemon.status()
+    assert status["pid"] == running["pid"]
+    assert status["commands"] == 0
+    daemon.stop()
+    assert daemon.status() is None
+
+
+def test_forward_runs_solutions_in_daemon(running, day_dir, capsys):
+    assert client.forward(["run", "1", "-y", "2020", "--no-cache"]) == 0
+    assert "day 01: part 1 6, part 2 3" in capsys.readouterr().out
+    # The solution is only reloaded once changed
+    assert client.forward(["run", "1", "-y", "2020", "--no-cache"]) == 0
+    (day_dir / "solution.py").write_text(
+        textwrap.dedent(SOLUTION).replace("sum(data)", "sum(data) * 10")
+    )
+    assert client.forward(["run", "1", "-y", "2020", "--no-cache"]) == 0
+    assert "day 01: part 1 60, part 2 3" in capsys.readouterr().out
+    status = daemon.status()
+    assert status["commands"] == 3
+    assert status["solutions"] == 1
+
+
+def test_forward_uses_client_rate_limit(running, day_dir, monkeypatch):
+    assert client.forward(["run", "1", "-y", "2020", "--no-cache"]) == 0
+    assert daemon.status()["session_pools"] == 1
+    monkeypatch.setenv("AOC_RATE_LIMIT", "0.5")
+    assert client.forward(["run", "1", "-y", "2020", "--no-cache"]) == 0
+    assert daemon.status()["session_pools"] == 2
+
+
+def test_session_pools_keyed_by_config(home, monkeypatch):
+    pools = daemon.SessionPools()
+    default = pools.get()
+    assert pools.get() is default
+    monkeypatch.setenv("AOC_RATE_LIMIT", "0.5")
+    limited = pools.get()
+    assert limited is not default
+    assert limited.limiter.rate == 0.5
+    monkeypatch.setenv("HOME", str(home / "other"))
+    assert pools.get() is not limited
+    assert len(pools) == 3
+
+
+def test_forward_reports_failures(running, day_dir, capsys):
+    assert client.forward(["run", "5", "--no-cache"]) == 1
+    assert "no solution found" in capsys.readouterr().err
+    assert client.forward(["run", "--unknown"]) == 2
+    assert "no such option" in capsys.readouterr().err.lower()
+
+
+@pytest.mark.parametrize(
+    "argv,local",
+    [
+        (["run", "1"], False),
+        (["daemon", "start"], True),
+        (["leaderboard", "watch", "1"], True),
+        (["begin", "--wait"], True),
+        (["test", "-w"], True),
+        (["submit", "1234", "1"], False),
+    ],
+)
+def test_runs_locally(argv, local, monkeypatch):
+    monkeypatch.delenv("AOC_NO_DAEMON", raising=False)
+    assert client.runs_locally(argv) == local
+    monkeypatch.setenv("AOC_NO_DAEMON", "1")
+    assert client.runs_locally(argv)
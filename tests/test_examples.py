@@ -0,0 +1,121 @@
+import os
+
+import pytest
+
+from aocpy.examples import (
+    Example,
+    extract_examples,
+    load_examples,
+    run_examples,
+    watch_examples,
+    write_examples,
+)
+
+PAGE = """
+<main>
+<article class="day-desc"><h2>--- Day 1: Report Repair ---</h2>
+<p>For example, suppose your expense report contained the following:</p>
+<pre><code>1721
+979
+366
+</code></pre>
+<p>Multiplying them together produces <code>1721 * 299 = <em>514579</em></code>,
+so the correct answer is <code><em>514579</em></code>.</p>
+</article>
+<p>Your puzzle answer was <code>1234</code>.</p>
+<article class="day-desc"><h2 id="part2">--- Part Two ---</h2>
+<p>Using the above example again, the product is
+<code><em>241861950</em></code>.</p>
+</article>
+</main>
+"""
+
+SOLUTION = """
+def parse(f):
+    return list(f.ints())
+
+
+def part_1(data):
+    return max(data)
+
+
+def part_2(data):
+    return min(data)
+"""
+
+
+def test_extract_examples():
+    assert extract_examples(PAGE) == [
+        Example(1, "1721\n979\n366\n", "514579"),
+        Example(2, "1721\n979\n366\n", "241861950"),
+    ]
+
+
+def test_extract_examples_part_1_only():
+    part_1 = PAGE[: PAGE.index("<p>Your puzzle answer")]
+    assert extract_examples(part_1) == [Example(1, "1721\n979\n366\n", "514579")]
+
+
+def test_extract_examples_without_example():
+    assert extract_examples("<article><p>No examples</p></article>") == []
+
+
+@pytest.fixture
+def day_dir(tmp_path):
+    d = tmp_path / "01"
+    d.mkdir()
+    (d / "solution.py").write_text(SOLUTION)
+    return d
+
+
+def test_write_examples(day_dir):
+    examples = extract_examples(PAGE)
+    write_examples(day_dir, examples)
+    assert load_examples(day_dir) == examples
+    assert (day_dir / "example_input.txt").read_text() == "1721\n979\n366\n"
+
+
+def test_write_examples_is_atomic(day_dir, mocker):
+    examples = extract_examples(PAGE)
+    write_examples(day_dir, examples)
+    mocker.patch("aocpy.utils.os.replace", side_effect=OSError("disk full"))
+    with pytest.raises(OSError):
+        write_examples(day_dir, [Example(1, "1\n", "1")])
+    assert load_examples(day_dir) == examples
+    assert [f.name for f in day_dir.iterdir() if f.suffix == ".tmp"] == []
+
+
+def test_run_examples(day_dir):
+    write_examples(day_dir, [Example(1, "1\n3\n2\n", "3"), Example(2, "1\n3\n", "2")])
+    results = run_examples(day_dir)
+    assert [r.passed for r in results] == [True, False]
+    assert results[1].actual == "1"
+
+
+def test_run_examples_reports_errors(day_dir):
+    (day_dir / "solution.py").write_text("def part_1(data):\n    1 / 0\n")
+    write_examples(day_dir, [Example(1, "1\n", "1")])
+    [result] = run_examples(day_dir)
+    assert not result.passed
+    assert "ZeroDivisionError" in result.error
+
+
+def test_watch_examples_reruns_on_change(day_dir, mocker):
+    write_examples(day_dir, [Example(1, "1\n3\n", "3")])
+    reports = []
+
+    def sleep(_):
+        if len(reports) == 1:
+            (day_dir / "solution.py").write_text(
+                SOLUTION.replace("max(data)", "sum(data)")
+            )
+            # Ensure the modification is visible on coarse mtime filesystems
+            mtime = (day_dir / "solution.py").stat().st_mtime + 1
+            os.utime(day_dir / "solution.py", (mtime, mtime))
+        else:
+            raise KeyboardInterrupt
+
+    mocker.patch("aocpy.examples.time.sleep", side_effect=sleep)
+    with pytest.raises(KeyboardInterrupt):
+        watch_examples([day_dir], lambda d, results: reports.append(results))
+    assert [[r.actual for r in results] for results in reports] == [["3"], ["4"]]
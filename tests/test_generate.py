@@ -0,0 +1,55 @@
+import stat
+
+import pytest
+
+from aocpy.exception import AocpyException
+from aocpy.generate import generate_day, generate_days, load_templates
+from aocpy.utils import atomic_write
+
+
+def test_atomic_write(tmp_path):
+    path = tmp_path / "f.txt"
+    atomic_write(path, "old")
+    atomic_write(path, b"new", 0o644)
+    assert path.read_text() == "new"
+    assert stat.S_IMODE(path.stat().st_mode) == 0o644
+    assert list(tmp_path.iterdir()) == [path]
+
+
+@pytest.mark.parametrize("template", ["default", "stream", "numpy", "multiprocessing"])
+def test_generate_day(home_dir, tmp_path, monkeypatch, template):
+    monkeypatch.chdir(tmp_path)
+    generate_day(7, "some input", template, 2020, "Handy Haversacks")
+    assert (tmp_path / "07/input.txt").read_text() == "some input"
+    solution = (tmp_path / "07/solution.py").read_text()
+    assert solution.startswith('""" 2020 day 7: Handy Haversacks\n')
+    compile(solution, "solution.py", "exec")
+    compile((tmp_path / "07/test_day07.py").read_text(), "test_day07.py", "exec")
+    with pytest.raises(AocpyException):
+        generate_day(7, "some input")
+    with pytest.raises(AocpyException):
+        generate_day(8, "some input", template="missing")
+
+
+@pytest.mark.parametrize("template", ["default", "stream", "numpy", "multiprocessing"])
+def test_generated_parts_are_stubs(home_dir, tmp_path, monkeypatch, template):
+    """ No answer is reported before a part has been solved.
+    """
+    if template == "numpy":
+        pytest.importorskip("numpy")
+    monkeypatch.chdir(tmp_path)
+    generate_day(1, "1\n2\n", template)
+    solution = {}
+    exec((tmp_path / "01/solution.py").read_text(), solution)
+    assert solution["part_1"](["1", "2"]) is None
+    assert solution["part_2"](["1", "2"]) is None
+
+
+def test_generate_days_skips_existing(home_dir, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    generate_day(2, "old")
+    reads = load_templates.cache_info().misses
+    assert generate_days({1: "a", 2: "b", 3: "c"}) == [1, 3]
+    assert (tmp_path / "02/input.txt").read_text() == "old"
+    # Templates were read by the first call and are not read again
+    assert load_templates.cache_info().misses == reads
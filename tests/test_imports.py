@@ -0,0 +1,59 @@
+import subprocess
+import sys
+
+import pytest
+
+HEAVY_MODULES = {"requests", "bs4", "pytz", "click", "numpy", "aiohttp"}
+
+# Generous upper bound on the cumulative import time of `aocpy` for the
+# solution entry point, in microseconds.
+INPUT_CLI_IMPORT_BUDGET = 200000
+
+
+def import_times(statement: str) -> dict:
+    """ Returns the cumulative import time in microseconds of each top level
+    package imported by `statement`, as reported by `python -X importtime`.
+    """
+    p = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+    times = {}
+    for line in p.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        if cumulative.strip().isdigit():
+            package = name.strip().split(".")[0]
+            times[package] = max(times.get(package, 0), int(cumulative))
+    return times
+
+
+@pytest.mark.parametrize(
+    "statement",
+    ["from aocpy import input_cli", "import aocpy", "from aocpy import InputFile"],
+)
+def test_solution_imports_are_light(statement):
+    assert not HEAVY_MODULES & set(import_times(statement))
+
+
+def test_input_cli_import_time():
+    times = import_times("from aocpy import input_cli")
+    assert times["aocpy"] < INPUT_CLI_IMPORT_BUDGET
+
+
+def test_cli_does_not_import_network_dependencies():
+    imported = set(import_times("import aocpy.cli"))
+    assert not {"requests", "bs4", "pytz", "aiohttp"} & imported
+
+
+def test_lazy_attributes():
+    import aocpy
+    from aocpy.puzzle import Puzzle
+
+    assert aocpy.Puzzle is Puzzle
+    assert "input_cli" in dir(aocpy)
+    with pytest.raises(AttributeError):
+        aocpy.missing
@@ -0,0 +1,187 @@
+import json
+
+import pytest
+
+from aocpy import web
+from aocpy.exception import AocpyException
+from aocpy.httpcache import HTTPCache
+from aocpy.leaderboard import (
+    MIN_POLL_INTERVAL,
+    Member,
+    Snapshots,
+    diff,
+    parse_leaderboard,
+    poll,
+    ranks,
+    watch,
+)
+
+BOARD_URL = "https://adventofcode.com/2020/leaderboard/private/view/42.json"
+
+
+def board(**members):
+    """ Leaderboard JSON where each member is given as a list of
+    (day, part, ts) stars, scoring one point per star.
+    """
+    return json.dumps(
+        {
+            "event": "2020",
+            "members": {
+                str(i): {
+                    "name": name,
+                    "local_score": len(stars),
+                    "last_star_ts": max((ts for _, _, ts in stars), default=0),
+                    "completion_day_level": {
+                        str(day): {
+                            str(part): {"get_star_ts": ts}
+                            for d, part, ts in stars
+                            if d == day
+                        }
+                        for day, _, _ in stars
+                    },
+                }
+                for i, (name, stars) in enumerate(members.items())
+            },
+        }
+    )
+
+
+@pytest.fixture
+def clock(mocker):
+    now = [1000.0]
+    mocker.patch("aocpy.web.time.time", side_effect=lambda: now[0])
+    mocker.patch("aocpy.leaderboard.time.time", side_effect=lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def session(tmp_path):
+    return web.session(
+        "12345",
+        limiter=web.RateLimiter(1000, 1000),
+        http_cache=HTTPCache(tmp_path / "http"),
+    )
+
+
+@pytest.fixture
+def snapshots(tmp_path):
+    return Snapshots(tmp_path / "leaderboards")
+
+
+def test_snapshots_default_root(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    assert Snapshots.default().root == tmp_path / ".config/aocpy/leaderboards"
+
+
+def test_parse_leaderboard():
+    members = parse_leaderboard(board(alice=[(1, 1, 10), (1, 2, 20)], bob=[]))
+    assert members["0"] == Member("alice", 2, 20, {"1.1": 10, "1.2": 20})
+    assert members["1"].stars == {}
+    with pytest.raises(AocpyException):
+        parse_leaderboard("<html>login</html>")
+
+
+def test_ranks_break_ties_by_time():
+    members = parse_leaderboard(
+        board(alice=[(1, 1, 30)], bob=[(1, 1, 20)], carol=[(1, 1, 5), (1, 2, 40)])
+    )
+    assert ranks(members) == {"2": 1, "1": 2, "0": 3}
+
+
+def test_diff():
+    old = parse_leaderboard(board(alice=[(1, 1, 10)], bob=[(1, 1, 20)]))
+    new = parse_leaderboard(
+        board(alice=[(1, 1, 10)], bob=[(1, 1, 20), (1, 2, 30), (2, 1, 25)])
+    )
+    assert diff(old, new) == [
+        {"type": "star", "member": "bob", "day": 2, "part": 1, "ts": 25},
+        {"type": "star", "member": "bob", "day": 1, "part": 2, "ts": 30},
+        {"type": "rank", "member": "bob", "old": 2, "new": 1},
+        {"type": "rank", "member": "alice", "old": 1, "new": 2},
+    ]
+    assert diff(new, new) == []
+    joined = dict(new, **{"9": Member("dave")})
+    assert diff(new, joined)[0] == {"type": "join", "member": "dave"}
+    assert diff(joined, new)[0] == {"type": "leave", "member": "dave"}
+
+
+def test_poll_is_conditional(clock, session, snapshots, responses):
+    responses.add(
+        responses.GET,
+        BOARD_URL,
+        body=board(alice=[(1, 1, 10)]),
+        headers={"ETag": '"v1"'},
+    )
+    responses.add(responses.GET, BOARD_URL, status=304)
+    responses.add(responses.GET, BOARD_URL, body=board(alice=[(1, 1, 10), (1, 2, 50)]))
+
+    assert poll(session, 2020, "42", snapshots) == [{"type": "baseline", "members": 1}]
+    # Within the poll interval nothing is requested
+    assert poll(session, 2020, "42", snapshots) == []
+    assert len(responses.calls) == 1
+
+    clock[0] += MIN_POLL_INTERVAL
+    assert poll(session, 2020, "42", snapshots) == []
+    assert responses.calls[1].request.headers["If-None-Match"] == '"v1"'
+
+    clock[0] += MIN_POLL_INTERVAL
+    assert poll(session, 2020, "42", snapshots) == [
+        {"type": "star", "member": "alice", "day": 1, "part": 2, "ts": 50}
+    ]
+
+
+def test_watch(clock, session, snapshots, responses):
+    other_url = BOARD_URL.replace("42", "7")
+    responses.add(responses.GET, BOARD_URL, body=board(alice=[]))
+    responses.add(responses.GET, other_url, status=500)
+    responses.add(responses.GET, BOARD_URL, body=board(alice=[(1, 1, 10)]))
+    sleeps = []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        clock[0] += seconds
+
+    events = list(
+        watch(
+            session,
+            [(2020, "42"), (2020, "7")],
+            interval=1,
+            snapshots=snapshots,
+            rounds=2,
+            sleep=sleep,
+        )
+    )
+    assert sleeps == [MIN_POLL_INTERVAL]
+    assert [(e["board"], e["type"]) for e in events] == [
+        ("42", "baseline"),
+        ("7", "error"),
+        ("42", "star"),
+        ("7", "error"),
+    ]
+    assert events[2]["time"] == 1000 + MIN_POLL_INTERVAL
+
+
+def test_watch_requests_every_round(clock, session, snapshots, responses):
+    def respond(request):
+        # Responses arrive some time after the round started
+        clock[0] += 2
+        if request.headers.get("If-None-Match") == '"v1"':
+            return 304, {}, ""
+        return 200, {"ETag": '"v1"'}, board(alice=[])
+
+    responses.add_callback(responses.GET, BOARD_URL, callback=respond)
+
+    def sleep(seconds):
+        clock[0] += seconds
+
+    rounds = list(
+        watch(session, [(2020, "42")], snapshots=snapshots, rounds=5, sleep=sleep)
+    )
+    assert [e["type"] for e in rounds] == ["baseline"]
+    assert [e["time"] for e in rounds] == [1000]
+    # One request per round, each after the first conditional
+    assert len(responses.calls) == 5
+    assert [c.request.headers.get("If-None-Match") for c in responses.calls] == [
+        None
+    ] + ['"v1"'] * 4
+    assert clock[0] == 1000 + 4 * MIN_POLL_INTERVAL + 2
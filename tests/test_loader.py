@@ -0,0 +1,59 @@
+import pytest
+
+from aocpy.loader import InputFile
+
+
+@pytest.fixture
+def input_file(tmp_path):
+    def make(content: bytes):
+        p = tmp_path / "input.txt"
+        p.write_bytes(content)
+        return InputFile(str(p))
+
+    return make
+
+
+def test_lines(input_file):
+    with input_file(b"  a\nb  \r\n\nc\n") as f:
+        assert list(f.lines()) == ["a", "b", "", "c"]
+
+
+def test_lines_without_trailing_newline(input_file):
+    with input_file(b"a\nb") as f:
+        assert list(f.lines()) == ["a", "b"]
+
+
+def test_ints(input_file):
+    with input_file(b"x=1, y=-20\n300 -> 4\n") as f:
+        assert list(f.ints()) == [1, -20, 300, 4]
+
+
+def test_grid(input_file):
+    with input_file(b"#.#\n.#.\n") as f:
+        rows = list(f.grid())
+        assert [bytes(r) for r in rows] == [b"#.#", b".#."]
+        assert rows[1][1] == ord("#")
+        del rows
+
+
+def test_buffer_is_zero_copy(input_file):
+    with input_file(b"abc\n") as f:
+        view = f.buffer
+        assert view.readonly
+        assert bytes(view) == b"abc\n"
+        del view
+
+
+@pytest.mark.parametrize("content", [b"", b"a\nb\n", b"a\r\nb"])
+def test_file_compatibility(input_file, content):
+    with input_file(content) as f:
+        assert f.read() == content.decode()
+        assert f.readlines() == content.decode().splitlines(keepends=True)
+        assert list(f) == f.readlines()
+    assert f.closed
+
+
+def test_empty_input(input_file):
+    with input_file(b"") as f:
+        assert list(f.lines()) == []
+        assert list(f.ints()) == []
@@ -0,0 +1,114 @@
+import pytest
+
+from aocpy.loader import InputFile
+from aocpy.memo import ResultCache, memoize_main, solution_key
+from aocpy.runner import run_day
+
+SOLUTION = """
+from helpers import double
+
+
+def parse(f):
+    return [int(x) for x in f.ints()]
+
+
+def part_1(data):
+    return sum(data)
+
+
+def part_2(data):
+    return double(max(data))
+"""
+
+
+@pytest.fixture
+def day_dir(tmp_path):
+    d = tmp_path / "01"
+    d.mkdir()
+    (d / "solution.py").write_text(SOLUTION)
+    (d / "helpers.py").write_text("def double(x):\n    return 2 * x\n")
+    (d / "input.txt").write_text("1\n2\n3\n")
+    return d
+
+
+@pytest.fixture
+def results(tmp_path):
+    return ResultCache(tmp_path / "results.sqlite3")
+
+
+def test_solution_key(day_dir):
+    solution = day_dir / "solution.py"
+    key = solution_key(solution, b"1\n")
+    assert solution_key(solution, b"1\n") == key
+    assert solution_key(solution, b"2\n") != key
+    assert solution_key(solution, memoryview(b"1\n")) == key
+
+    # A comment or moving the solution doesn't change the key
+    solution.write_text(SOLUTION + "# a comment\n")
+    assert solution_key(solution, b"1\n") == key
+    moved = day_dir.rename(day_dir.with_name("02"))
+    solution = moved / "solution.py"
+    assert solution_key(solution, b"1\n") == key
+
+    # Changing an imported helper does
+    (moved / "helpers.py").write_text("def double(x):\n    return x + x\n")
+    assert solution_key(solution, b"1\n") != key
+
+
+def test_result_cache_evicts_least_recently_used(tmp_path):
+    results = ResultCache(tmp_path / "results.sqlite3", max_entries=2)
+    results.put("a", 1)
+    results.put("b", 2)
+    assert results.get("a") == 1
+    results.put("c", 3)
+    assert len(results) == 2
+    assert results.get("b") is None
+    assert results.get("a") == 1
+    assert results.get("c") == 3
+
+
+def test_result_cache_default_path(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    assert ResultCache.default().path == tmp_path / ".config/aocpy/results.sqlite3"
+
+
+def test_run_day_cached(day_dir, results, mocker):
+    first = run_day(day_dir, cache=results)
+    assert first["answers"] == {"1": "6", "2": "6"}
+    assert "cached" not in first
+
+    worker = mocker.patch("aocpy.runner._run_worker", return_value={"error": "x"})
+    second = run_day(day_dir, cache=results)
+    assert second["cached"]
+    assert second["answers"] == first["answers"]
+    worker.assert_not_called()
+
+    (day_dir / "input.txt").write_text("1\n2\n")
+    run_day(day_dir, cache=results)
+    worker.assert_called_once()
+
+
+def test_run_day_does_not_cache_errors(day_dir, results):
+    (day_dir / "solution.py").write_text("def part_1(data):\n    1 / 0\n")
+    assert "error" in run_day(day_dir, cache=results)
+    assert len(results) == 0
+
+
+def test_memoize_main(tmp_path, monkeypatch, capsys):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    calls = []
+
+    @memoize_main
+    def main(f):
+        calls.append(f)
+        print("Part 1: ", sum(int(x) for x in f.ints()))
+
+    for _ in range(2):
+        main(InputFile.from_bytes("1\n2\n"))
+        assert capsys.readouterr().out == "Part 1:  3\n"
+    assert len(calls) == 1
+
+    monkeypatch.setenv("AOC_NO_CACHE", "1")
+    main(InputFile.from_bytes("1\n2\n"))
+    assert capsys.readouterr().out == "Part 1:  3\n"
+    assert len(calls) == 2
@@ -0,0 +1,162 @@
+import json
+
+import pytest
+
+from aocpy import metrics, web
+from aocpy.cache import SQLiteCache
+from aocpy.exception import AocpyException
+from aocpy.fetch import fetch_inputs
+from aocpy.httpcache import HTTPCache
+from aocpy.puzzle import Puzzle, get_puzzle_input
+
+
+@pytest.fixture
+def metrics_dir(tmp_path, monkeypatch):
+    """ Enables both sinks of the default registry, writing to a temporary
+    config directory.
+    """
+    monkeypatch.setenv("AOC_METRICS", "jsonl,openmetrics")
+    monkeypatch.setattr(metrics, "get_config_dir", lambda: tmp_path)
+    yield tmp_path
+    metrics._registry.cache_clear()
+
+
+@pytest.mark.parametrize(
+    "url,expected",
+    [
+        ("https://adventofcode.com/2020/day/5/input", "input"),
+        ("https://adventofcode.com/2020/day/5/answer", "answer"),
+        ("https://adventofcode.com/2020/day/15", "puzzle"),
+        (
+            "https://adventofcode.com/2020/leaderboard/private/view/1.json",
+            "leaderboard",
+        ),
+        ("https://adventofcode.com/", "other"),
+    ],
+)
+def test_endpoint(url, expected):
+    assert metrics.endpoint(url) == expected
+
+
+def test_histogram_cumulative():
+    h = metrics.Histogram((0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 2.0):
+        h.observe(value)
+    assert list(h.cumulative()) == [("0.1", 2), ("1.0", 3), ("+Inf", 4)]
+    assert h.sum == pytest.approx(2.65)
+
+
+def test_registry_openmetrics():
+    registry = metrics.Registry(buckets=(0.5,))
+    registry.inc(metrics.RESPONSES, endpoint="input", status="200")
+    registry.inc(metrics.RESPONSES, endpoint="input", status="200")
+    registry.observe(metrics.REQUEST_DURATION, 0.25, endpoint="input")
+    assert registry.to_openmetrics() == (
+        "# TYPE aocpy_http_responses counter\n"
+        'aocpy_http_responses_total{endpoint="input",status="200"} 2\n'
+        "# TYPE aocpy_http_request_duration_seconds histogram\n"
+        'aocpy_http_request_duration_seconds_bucket{endpoint="input",le="0.5"} 1\n'
+        'aocpy_http_request_duration_seconds_bucket{endpoint="input",le="+Inf"} 1\n'
+        'aocpy_http_request_duration_seconds_sum{endpoint="input"} 0.25\n'
+        'aocpy_http_request_duration_seconds_count{endpoint="input"} 1\n'
+        "# EOF\n"
+    )
+
+
+def test_disabled_by_default(monkeypatch):
+    monkeypatch.delenv("AOC_METRICS", raising=False)
+    assert metrics.default_registry() is None
+    # Recording is a no-op
+    metrics.inc(metrics.RETRIES, endpoint="input")
+
+
+def test_invalid_sink(monkeypatch):
+    monkeypatch.setenv("AOC_METRICS", "jsonl,statsd")
+    with pytest.raises(AocpyException, match="statsd"):
+        metrics.default_registry()
+
+
+def test_jsonl_sink_round_trip(tmp_path):
+    path = tmp_path / "metrics.jsonl"
+    registry = metrics.Registry([metrics.JSONLinesSink(path)])
+    for value in (0.3, 0.1, 0.2):
+        registry.observe(metrics.REQUEST_DURATION, value, endpoint="input")
+    registry.inc(metrics.CACHE_LOOKUPS, cache="input", result="hit")
+    # An interrupted write is skipped
+    with open(path, "a") as f:
+        f.write('{"kind": "counter"')
+    summary = metrics.summarize(metrics.read_samples(path))
+    assert summary.latencies == {"input": [0.1, 0.2, 0.3]}
+    assert summary.total(metrics.CACHE_LOOKUPS, cache="input") == 1
+    assert summary.registry.to_openmetrics() == registry.to_openmetrics()
+
+
+@pytest.mark.parametrize(
+    "q,expected", [(0.0, 1), (0.5, 5), (0.95, 10), (0.99, 10), (1.0, 10)]
+)
+def test_quantile(q, expected):
+    assert metrics.quantile(list(range(1, 11)), q) == expected
+
+
+def test_web_requests_instrumented(metrics_dir, responses, tmp_path):
+    s = web.session(
+        "12345",
+        limiter=web.RateLimiter(1000, 1000),
+        http_cache=HTTPCache(tmp_path / "http"),
+    )
+    cache = SQLiteCache(tmp_path / "inputs.sqlite3")
+    puzzle = Puzzle(2020, 5, "12345")
+    responses.add(responses.GET, puzzle.url + "/input", status=404)
+    responses.add(responses.GET, puzzle.url + "/input", body="1\n2\n")
+    web.fetch_puzzle_input(s, puzzle.url, retries=1, retry_delay=0)
+    responses.add(responses.GET, puzzle.url + "/input", body="1\n2\n")
+    assert get_puzzle_input(s, puzzle, cache) == "1\n2\n"
+    assert get_puzzle_input(s, puzzle, cache) == "1\n2\n"
+
+    samples = list(metrics.read_samples(metrics_dir / metrics.JSONL_FNAME))
+    summary = metrics.summarize(samples)
+    assert len(summary.latencies["input"]) == 3
+    assert summary.total(metrics.RESPONSES, status="404") == 1
+    assert summary.total(metrics.RESPONSES, status="200") == 2
+    assert summary.total(metrics.RESPONSE_BYTES, endpoint="input") == 8
+    assert summary.total(metrics.RETRIES) == 1
+    assert summary.total(metrics.CACHE_LOOKUPS, result="miss") == 1
+    assert summary.total(metrics.CACHE_LOOKUPS, result="hit") == 1
+    assert all(s["labels"].get("method", "GET") == "GET" for s in samples)
+
+    metrics.default_registry().flush()
+    exposition = (metrics_dir / metrics.OPENMETRICS_FNAME).read_text()
+    assert 'aocpy_http_responses_total{endpoint="input",status="404"} 1' in exposition
+    assert exposition.endswith("# EOF\n")
+
+
+def test_http_cache_lookups_instrumented(metrics_dir, responses, tmp_path):
+    s = web.session(
+        "12345",
+        limiter=web.RateLimiter(1000, 1000),
+        http_cache=HTTPCache(tmp_path / "http", ttl=60),
+    )
+    puzzle_url = "https://adventofcode.com/2020/day/5"
+    responses.add(responses.GET, puzzle_url, body="<article></article>")
+    web.fetch_puzzle_page(s, puzzle_url)
+    web.fetch_puzzle_page(s, puzzle_url)
+    with open(metrics_dir / metrics.JSONL_FNAME) as f:
+        lookups = [
+            json.loads(line)["labels"]["result"]
+            for line in f
+            if metrics.CACHE_LOOKUPS in line
+        ]
+    assert lookups == ["miss", "hit"]
+
+
+def test_fetch_inputs_cache_lookups_instrumented(metrics_dir, responses, tmp_path):
+    cache = SQLiteCache(tmp_path / "inputs.sqlite3")
+    cached, fetched = Puzzle(2020, 1, "12345"), Puzzle(2020, 2, "12345")
+    cache.put(cached, "1\n")
+    responses.add(responses.GET, fetched.url + "/input", body="2\n")
+    pool = web.SessionPool(limiter=web.RateLimiter(1000, 1000))
+    results = fetch_inputs(pool, [cached, fetched], cache=cache)
+    assert [r.cached for r in results] == [True, False]
+    summary = metrics.summarize(metrics.read_samples(metrics_dir / metrics.JSONL_FNAME))
+    assert summary.total(metrics.CACHE_LOOKUPS, result="hit") == 1
+    assert summary.total(metrics.CACHE_LOOKUPS, result="miss") == 1
@@ -0,0 +1,73 @@
+import pytest
+
+from aocpy import parse
+from aocpy.exception import AocpyException
+from aocpy.loader import InputFile
+
+np = pytest.importorskip("numpy")
+
+
+def test_char_grid():
+    g = parse.char_grid("#.#\n.#.\n")
+    assert g.shape == (2, 3)
+    assert (g == b"#").tolist() == [[True, False, True], [False, True, False]]
+
+
+def test_char_grid_crlf():
+    assert parse.char_grid(b"ab\r\ncd").tolist() == [[b"a", b"b"], [b"c", b"d"]]
+
+
+def test_char_grid_shares_input_memory(tmp_path):
+    p = tmp_path / "input.txt"
+    p.write_bytes(b"ab\ncd\n")
+    with InputFile(str(p)) as f:
+        g = parse.char_grid(f)
+        assert not g.flags.writeable
+        assert not g.flags.owndata
+        del g
+
+
+def test_char_grid_rejects_ragged_rows():
+    with pytest.raises(AocpyException):
+        parse.char_grid("abc\nde\n")
+
+
+@pytest.mark.parametrize("text", ["abc\nd\nefghi", "ab\r\ncde\nfg"])
+def test_char_grid_rejects_ragged_rows_of_matching_total_length(text):
+    with pytest.raises(AocpyException):
+        parse.char_grid(text)
+
+
+def test_digit_grid():
+    assert parse.digit_grid("123\n456\n").tolist() == [[1, 2, 3], [4, 5, 6]]
+
+
+def test_ints():
+    result = parse.ints("x=1, y=-20\n300 -> 4\n")
+    assert result.dtype == np.int64
+    assert result.flags.c_contiguous
+    assert result.tolist() == [1, -20, 300, 4]
+
+
+def test_ints_empty():
+    assert parse.ints("no numbers").tolist() == []
+
+
+def test_ints_signs_and_long_numbers():
+    assert parse.ints(b"5-3--7 a0 007").tolist() == [5, -3, -7, 0, 7]
+    assert parse.ints(b"9223372036854775807 -1").tolist() == [2 ** 63 - 1, -1]
+    assert parse.ints(b"1 2", np.int8).dtype == np.int8
+
+
+@pytest.mark.parametrize(
+    "text,dtype", [(b"99999999999999999999", None), (b"1 300", np.int8)]
+)
+def test_ints_overflow(text, dtype):
+    with pytest.raises(AocpyException):
+        parse.ints(text, dtype)
+
+
+def test_blocks():
+    blocks = parse.blocks("a\nb\n\nc\n\n\nd\n")
+    assert [bytes(b) for b in blocks] == [b"a\nb", b"c", b"d"]
+    assert all(isinstance(b, memoryview) for b in blocks)
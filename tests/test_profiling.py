@@ -0,0 +1,73 @@
+import pstats
+import tracemalloc
+
+import pytest
+
+from aocpy.exception import AocpyException
+from aocpy.profiling import profile_day
+
+SOLUTION = """
+import time
+
+
+def parse(f):
+    return [int(x) for x in f.ints()]
+
+
+def spin(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+def part_1(data):
+    spin(0.05)
+    return sum(data)
+
+
+def part_2(data):
+    return [[x] * 1000 for x in data]
+"""
+
+
+@pytest.fixture
+def day_dir(tmp_path):
+    d = tmp_path / "01"
+    d.mkdir()
+    (d / "solution.py").write_text(SOLUTION)
+    (d / "input.txt").write_text("1\n2\n3\n")
+    return d
+
+
+def test_profile_cprofile(day_dir):
+    report = profile_day(day_dir, day_dir / "input.txt", 1, "cprofile")
+    assert report.answer == 6
+    assert report.output == day_dir / "part_1.pstats"
+    assert pstats.Stats(str(report.output)).total_calls > 0
+    assert report.top[0][0] == "solution.py:spin"
+
+
+def test_profile_sample(day_dir, tmp_path):
+    out = tmp_path / "profiles"
+    report = profile_day(day_dir, day_dir / "input.txt", 1, "sample", out)
+    assert report.output == out / "part_1.collapsed"
+    stacks = report.output.read_text().splitlines()
+    assert any(
+        line.startswith("solution.py:part_1;solution.py:spin") for line in stacks
+    )
+    assert report.top[0][0] == "solution.py:spin"
+
+
+def test_profile_tracemalloc(day_dir):
+    report = profile_day(day_dir, day_dir / "input.txt", 2, "tracemalloc", top=1)
+    assert len(report.answer) == 3
+    assert tracemalloc.Snapshot.load(str(report.output)).traces
+    assert report.unit == "B"
+    ((location, size),) = report.top
+    assert location.startswith("solution.py:")
+    assert size >= 3 * 1000 * 8
+
+
+def test_profile_unknown_mode(day_dir):
+    with pytest.raises(AocpyException):
+        profile_day(day_dir, day_dir / "input.txt", 1, "perf")
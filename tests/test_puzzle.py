@@ -16,7 +16,17 @@ from aocpy.exception import (
     RepeatSubmissionError,
     SubmissionError,
 )
-from aocpy.puzzle import Puzzle, check_submission_response_text
+from aocpy.puzzle import (
+    ALREADY_COMPLETE,
+    CORRECT,
+    INCORRECT,
+    RATE_LIMITED,
+    TOO_HIGH,
+    Puzzle,
+    article_text,
+    check_submission_response_text,
+    parse_submission_response,
+)
 
 TEST_DATA_DIR = Path(__file__).resolve().parent / "data"
 
@@ -99,3 +109,28 @@ def test_check_submission_response_raises_on_known_failures(fname, exc_cls):
 def test_check_submission_response_raises_on_failure(text):
     with pytest.raises(SubmissionError):
         check_submission_response_text(text)
+
+
+@pytest.mark.parametrize(
+    "fname,verdict,wait_seconds,hint",
+    [
+        ("correct.html", CORRECT, None, None),
+        ("already_complete.html", ALREADY_COMPLETE, None, None),
+        ("incorrect.html", INCORRECT, 60, TOO_HIGH),
+        ("rate_limit.html", RATE_LIMITED, 56, None),
+    ],
+)
+def test_parse_submission_response(fname, verdict, wait_seconds, hint):
+    resp_text = (TEST_DATA_DIR / "submission-responses" / fname).read_text()
+    result = parse_submission_response(resp_text)
+    assert result.verdict == verdict
+    assert result.wait_seconds == wait_seconds
+    assert result.hint == hint
+
+
+def test_article_text():
+    text = '<main><article class="day-desc"><p>That&apos;s <em>it</em></p></article>'
+    assert article_text(text) == "That's it"
+    # Unclosed article runs to the end of the document
+    assert article_text("<article><p>a<p>b") == "ab"
+    assert article_text("<p>no article</p>") is None
@@ -0,0 +1,141 @@
+import textwrap
+
+import pytest
+
+from aocpy.exception import AocpyException
+from aocpy import runner
+from aocpy.runner import (
+    SolutionCache,
+    bench_day,
+    find_days,
+    load_solution,
+    run_day,
+    run_days,
+)
+
+SOLUTION = """
+def parse(f):
+    return [int(x) for x in f.ints()]
+
+
+def part_1(data):
+    print("noisy solution")
+    return sum(data)
+
+
+def part_2(data):
+    return max(data)
+"""
+
+
+@pytest.fixture
+def day_dir(tmp_path):
+    def make(day, solution=SOLUTION, puzzle_input="1\n2\n3\n"):
+        d = tmp_path / f"{day:02}"
+        d.mkdir()
+        (d / "solution.py").write_text(textwrap.dedent(solution))
+        (d / "input.txt").write_text(puzzle_input)
+        return d
+
+    return make
+
+
+def test_find_days(tmp_path, day_dir):
+    dirs = [day_dir(day) for day in (3, 1, 12)]
+    (tmp_path / "notes").mkdir()
+    (tmp_path / "05").mkdir()
+    assert find_days(tmp_path) == sorted(dirs)
+    assert find_days(tmp_path, [12]) == [dirs[2]]
+    with pytest.raises(AocpyException):
+        find_days(tmp_path, [5])
+
+
+def test_load_solution(day_dir):
+    module = load_solution(day_dir(1))
+    assert module.part_1([1, 2]) == 3
+
+
+def test_bench_day(day_dir):
+    result = bench_day(day_dir(1), repeat=3)
+    assert result["day"] == 1
+    assert result["repeat"] == 3
+    assert result["peak_rss"] > 0
+    for name in ("parse", "part_1", "part_2"):
+        assert 0 <= result[name]["min"] <= result[name]["median"] <= result[name]["p95"]
+
+
+def test_bench_day_reports_errors(day_dir):
+    result = bench_day(day_dir(1, solution="def part_1(data):\n    1 / 0\n"), 1)
+    assert "ZeroDivisionError" in result["error"]
+
+
+def test_run_days(day_dir):
+    dirs = [day_dir(1), day_dir(2, puzzle_input="5\n")]
+    results = run_days(dirs, jobs=2)
+    assert [r["day"] for r in results] == [1, 2]
+    assert results[0]["answers"] == {"1": "6", "2": "3"}
+    assert results[1]["answers"] == {"1": "5", "2": "5"}
+    assert set(results[0]["times"]) == {"parse", "part_1", "part_2"}
+
+
+def test_run_day_timeout(day_dir):
+    d = day_dir(1, solution="import time\n\n\ndef part_1(data):\n    time.sleep(10)\n")
+    result = run_day(d, timeout=0.5)
+    assert "timed out" in result["error"]
+
+
+def test_run_day_memory_limit(day_dir):
+    d = day_dir(1, solution="def part_1(data):\n    return len(bytearray(2 ** 31))\n")
+    result = run_day(d, memory_limit=2 ** 30)
+    assert "MemoryError" in result["error"]
+
+
+def test_solution_cache_reloads_changed_solutions(day_dir):
+    cache = SolutionCache()
+    d = day_dir(1)
+    module = cache.load(d)
+    assert cache.load(d) is module
+    (d / "solution.py").write_text(SOLUTION.replace("max(data)", "min(data)  # new"))
+    reloaded = cache.load(d)
+    assert reloaded is not module
+    assert reloaded.part_2([1, 2]) == 1
+    assert len(cache) == 1
+
+
+def test_solution_cache_helpers_are_per_day(day_dir):
+    solution = "from helpers import ANSWER\n\ndef part_1(data):\n    return ANSWER\n"
+    days = [day_dir(day, solution) for day in (1, 2)]
+    for day, d in enumerate(days, start=1):
+        (d / "helpers.py").write_text(f"ANSWER = {day}\n")
+    cache = SolutionCache()
+    assert [cache.load(d).part_1(None) for d in days] == [1, 2]
+    (days[0] / "helpers.py").write_text("ANSWER = 10\n")
+    assert cache.load(days[0]).part_1(None) == 10
+
+
+def test_run_day_in_process(day_dir, mocker, capsys):
+    mocker.patch.object(runner, "SOLUTIONS", SolutionCache())
+    worker = mocker.patch("aocpy.runner._run_worker")
+    ok, failed = day_dir(1), day_dir(2, solution="def part_1(data):\n    1 / 0\n")
+    result = run_day(ok)
+    assert result["answers"] == {"1": "6", "2": "3"}
+    # The solution's output is discarded, as it is by a worker
+    assert capsys.readouterr() == ("", "")
+    assert run_day(failed)["error"] == "ZeroDivisionError: division by zero"
+    worker.assert_not_called()
+    assert len(runner.SOLUTIONS) == 2
+    # Limits are only enforced in a separate interpreter
+    run_day(ok, timeout=10)
+    worker.assert_called_once()
+
+
+def test_run_days_in_process_only_without_jobs(day_dir, mocker):
+    mocker.patch.object(runner, "SOLUTIONS", SolutionCache())
+    worker = mocker.patch("aocpy.runner._run_worker", return_value={})
+    dirs = [day_dir(1), day_dir(2)]
+    run_days(dirs, jobs=1)
+    run_days(dirs[:1], jobs=2)
+    worker.assert_not_called()
+    # Several jobs run in separate interpreters so they can use every core
+    run_days(dirs, jobs=2)
+    assert worker.call_count == 2
@@ -0,0 +1,141 @@
+import pytest
+import requests
+
+from aocpy import standin, web
+from aocpy.httpcache import HTTPCache
+from aocpy.loadtest import base_url, run_load_test, unlimited_limiter
+from aocpy.puzzle import (
+    ALREADY_COMPLETE,
+    CORRECT,
+    INCORRECT,
+    RATE_LIMITED,
+    TOO_LOW,
+    Puzzle,
+    parse_submission_response,
+)
+
+# Requests are made to a real local server
+pytestmark = pytest.mark.withoutresponses
+
+
+@pytest.fixture
+def server():
+    with standin.running(standin.StandinConfig(input_lines=10)) as server:
+        yield server
+
+
+@pytest.fixture
+def session(server, tmp_path):
+    with base_url(server.base_url):
+        yield web.session(
+            "12345",
+            limiter=web.RateLimiter(1000, 1000),
+            http_cache=HTTPCache(tmp_path / "http", ttl=0),
+        )
+
+
+def test_base_url(monkeypatch):
+    assert Puzzle(2020, 1, "12345").url == "https://adventofcode.com/2020/day/1"
+    monkeypatch.setenv("AOC_BASE_URL", "http://127.0.0.1:8000/")
+    assert Puzzle(2020, 1, "12345").url == "http://127.0.0.1:8000/2020/day/1"
+
+
+def test_input(server, session):
+    p = Puzzle(2020, 1, "12345")
+    text = web.fetch_puzzle_input(session, p.url)
+    assert text == standin.puzzle_input("12345", 2020, 1, 10)
+    assert len(text.split()) == 10
+    # Inputs differ between accounts and require a session cookie
+    assert text != standin.puzzle_input("54321", 2020, 1, 10)
+    r = requests.get(p.url + "/input")
+    assert r.status_code == 400
+    assert server.statuses() == {200: 1, 400: 1}
+
+
+def test_unreleased(server, session):
+    server.config.released = 5
+    with pytest.raises(Exception, match="404"):
+        web.fetch_puzzle_input(session, Puzzle(2020, 6, "12345").url)
+
+
+def test_submit_answer(server, session, monkeypatch):
+    p = Puzzle(2020, 1, "12345")
+    part_1, part_2 = standin.answers(standin.puzzle_input("12345", 2020, 1, 10))
+
+    def submit(answer, level):
+        text, _ = web.submit_answer(session, p.url, answer, level)
+        # The client would otherwise wait out the cooldown
+        session.limiter._cooldowns.clear()
+        return parse_submission_response(text)
+
+    result = submit("1", 1)
+    assert (result.verdict, result.hint, result.wait_seconds) == (
+        INCORRECT,
+        TOO_LOW,
+        60,
+    )
+    result = submit(part_1, 1)
+    assert result.verdict == RATE_LIMITED
+    assert 0 < result.wait_seconds <= 60
+    monkeypatch.setattr(standin, "WRONG_ANSWER_COOLDOWN", 0)
+    server.account("12345").cooldown_until = 0
+    assert submit(part_1, 1).verdict == CORRECT
+    assert submit(part_1, 1).verdict == ALREADY_COMPLETE
+    assert submit(part_2, 2).verdict == CORRECT
+
+
+def test_page_revalidated(server, session):
+    p = Puzzle(2020, 1, "12345")
+    page = web.fetch_puzzle_page(session, p.url)
+    assert "--- Day 1: Stand-in ---" in page
+    assert web.fetch_puzzle_page(session, p.url) == page
+    server.account("12345").solved[(2020, 1)] = 1
+    assert "--- Part Two ---" in web.fetch_puzzle_page(session, p.url)
+    assert [status for _, _, status in server.requests] == [200, 304, 200]
+
+
+def test_rate_limited(session):
+    with standin.running(standin.StandinConfig(rate=0.01, burst=2)) as server:
+        url = server.base_url + "/2020/day/1/input"
+        statuses = [session.get(url).status_code for _ in range(4)]
+        # Each account has its own limit
+        other = requests.get(url, cookies={"session": "54321"})
+    assert statuses == [200, 200, 429, 429]
+    assert other.status_code == 200
+
+
+def test_warm_connection_reused(server, session):
+    web.warm_connection(session)
+    web.fetch_puzzle_input(session, Puzzle(2020, 1, "12345").url)
+    assert server.requests[0] == ("HEAD", "/", 200)
+    assert server.connections == 1
+
+
+@pytest.mark.parametrize("cached", [False, True])
+def test_load_test(server, cached):
+    report = run_load_test(
+        server.base_url, 60, 4, accounts=2, cached=cached, limiter=unlimited_limiter(4),
+    )
+    assert report.errors == {}
+    assert len(report.latencies) == 60
+    assert report.latencies == sorted(report.latencies)
+    assert report.throughput > 0
+    summary = report.summary()
+    assert summary["p50"] <= summary["p95"] <= summary["p99"] <= summary["max"]
+    assert server.connections <= 4
+    if cached:
+        # Each of 25 days for 2 accounts, plus concurrent misses of a puzzle
+        assert 50 <= len(server.requests) < 60
+    else:
+        assert len(server.requests) == 60
+
+
+@pytest.mark.parametrize("accounts", [1, 2])
+def test_load_test_counts_errors(accounts):
+    config = standin.StandinConfig(rate=0.01, burst=5)
+    with standin.running(config) as server:
+        # 25 requests for each account, which is limited to 5 of them
+        report = run_load_test(
+            server.base_url, 25 * accounts, 2, accounts, limiter=unlimited_limiter(2)
+        )
+    assert report.errors == {"got 429": 20 * accounts}
@@ -0,0 +1,66 @@
+import pytest
+
+from aocpy.generate import generate_day
+from aocpy.runner import run_day
+from aocpy.stream import LineStream, fan_out
+
+
+@pytest.fixture
+def input_file(tmp_path):
+    path = tmp_path / "input.txt"
+    path.write_bytes(b"12 a\r\n-3 bb\n\n45 ccc")
+    return path
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 5, 1 << 16])
+def test_line_stream(input_file, chunk_size):
+    stream = LineStream(str(input_file), chunk_size)
+    assert list(stream) == ["12 a", "-3 bb", "", "45 ccc"]
+    # Re-iterable, each iteration reads the file again
+    assert list(stream.lines()) == list(stream)
+    assert list(stream.ints()) == [12, -3, 45]
+    assert all(len(b) <= chunk_size + 1 for b in stream.raw_batches())
+
+
+def test_line_stream_from_bytes():
+    with LineStream.from_bytes("a\nb\n") as stream:
+        assert list(stream) == ["a", "b"]
+    with pytest.raises(ValueError):
+        list(stream)
+
+
+def test_fan_out_reads_input_once(input_file, mocker):
+    stream = LineStream(str(input_file), chunk_size=4)
+    batches = mocker.spy(stream, "batches")
+    total, longest = fan_out(
+        stream, lambda ls: sum(len(l) for l in ls), lambda ls: max(ls, key=len)
+    )
+    assert total == 15
+    assert longest == "45 ccc"
+    batches.assert_called_once()
+
+
+def test_fan_out_early_exit_and_errors():
+    lines = [str(i) for i in range(10000)]
+    first, count = fan_out(lines, next, lambda ls: sum(1 for _ in ls), max_pending=1)
+    assert (first, count) == ("0", 10000)
+
+    def fail(ls):
+        raise ValueError("bad line")
+
+    with pytest.raises(ValueError, match="bad line"):
+        fan_out(lines, fail, list)
+
+
+def test_stream_template(home_dir, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    generate_day(1, "1\n2\n3\n", template="stream")
+    day_dir = tmp_path / "01"
+    solution = day_dir / "solution.py"
+    solution.write_text(
+        solution.read_text()
+        .replace("for line in lines:\n        pass", "return sum(map(int, lines))", 1)
+        .replace("for line in lines:\n        pass", "return max(lines)", 1)
+    )
+    result = run_day(day_dir)
+    assert result["answers"] == {"1": "6", "2": "3"}
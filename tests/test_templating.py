@@ -0,0 +1,60 @@
+import pytest
+
+from aocpy.exception import AocpyException
+from aocpy.templating import (
+    available_templates,
+    compile_template,
+    load_template,
+    renderer,
+)
+
+
+def test_render(home_dir):
+    render = renderer("day {{ day }}: {{ title }}\n{{ [e * 2 for e in examples] }}")
+    assert render({"day": 1, "title": "T", "examples": [1, 2]}) == "day 1: T\n[2, 4]"
+    assert renderer("no placeholders")({}) == "no placeholders"
+
+
+def test_render_errors(home_dir):
+    with pytest.raises(AocpyException):
+        renderer("{{ 1 + }}")
+    with pytest.raises(AocpyException):
+        renderer("{{ missing }}")({})
+
+
+def test_compiled_templates_are_cached(home_dir, mocker):
+    code = compile_template("{{ day }}")
+    cached = list((home_dir / ".config/aocpy/compiled-templates").iterdir())
+    assert len(cached) == 1
+    compile_ = mocker.patch("aocpy.templating.compile")
+    assert compile_template("{{ day }}") == code
+    compile_.assert_not_called()
+    # Compiled templates are not mistaken for user templates
+    assert set(available_templates()) == {
+        "default",
+        "stream",
+        "numpy",
+        "multiprocessing",
+    }
+
+
+def test_user_templates(home_dir):
+    assert set(available_templates()) == {
+        "default",
+        "stream",
+        "numpy",
+        "multiprocessing",
+    }
+    user_dir = home_dir / ".config/aocpy/templates"
+    (user_dir / "mine").mkdir(parents=True)
+    (user_dir / "mine/solution.py").write_text("# {{ year }}/{{ day }}\n")
+    (user_dir / "incomplete").mkdir()
+    assert "mine" in available_templates()
+    assert "incomplete" not in available_templates()
+
+    template = load_template("mine")
+    assert template["solution"]({"year": 2020, "day": 3}) == "# 2020/3\n"
+    # The built in test template is used if the user template has none
+    assert "def test_part_1" in template["test"]({})
+    with pytest.raises(AocpyException):
+        load_template("incomplete")
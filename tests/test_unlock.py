@@ -0,0 +1,51 @@
+import time
+from datetime import datetime
+
+import pytest
+import pytz
+from freezegun import freeze_time
+
+from aocpy.unlock import StageTimer, sleep_until
+from aocpy.utils import next_unlock, unlock_time
+
+EST = pytz.timezone("America/New_York")
+
+
+def test_sleep_until_is_precise():
+    deadline = time.time() + 0.05
+    sleep_until(deadline)
+    assert 0 <= time.time() - deadline < 0.02
+    # A deadline in the past returns immediately
+    sleep_until(deadline - 1)
+
+
+def test_stage_timer():
+    timer = StageTimer()
+    with timer.stage("first"):
+        pass
+    with pytest.raises(ValueError):
+        with timer.stage("second"):
+            raise ValueError
+    assert list(timer.timings) == ["first", "second"]
+    assert timer.summary().startswith("first ")
+
+
+def test_unlock_time():
+    release = unlock_time(2020, 1)
+    assert release == EST.localize(datetime(2020, 12, 1))
+    assert release.timestamp() == datetime(2020, 12, 1, 5, tzinfo=pytz.utc).timestamp()
+
+
+@pytest.mark.parametrize(
+    "now,expected",
+    [
+        (datetime(2020, 11, 30, 23, 59), (2020, 1)),
+        (datetime(2020, 12, 1, 0, 0, 1), (2020, 2)),
+        (datetime(2020, 12, 24, 12), (2020, 25)),
+        (datetime(2020, 12, 25, 12), (2021, 1)),
+        (datetime(2021, 3, 1), (2021, 1)),
+    ],
+)
+def test_next_unlock(now, expected):
+    with freeze_time(EST.localize(now)):
+        assert next_unlock() == expected
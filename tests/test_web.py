@@ -0,0 +1,165 @@
+from pathlib import Path
+
+import pytest
+
+from aocpy import web
+from aocpy.httpcache import HTTPCache
+
+TEST_DATA_DIR = Path(__file__).resolve().parent / "data"
+
+
+@pytest.fixture
+def clock(mocker):
+    """ Fake `time.time`/`time.sleep` pair for aocpy.web where sleeping
+    advances the clock.
+    """
+    now = [1000.0]
+
+    def sleep(seconds):
+        now[0] += seconds
+
+    mocker.patch("aocpy.web.time.time", side_effect=lambda: now[0])
+    mocker.patch("aocpy.web.time.sleep", side_effect=sleep)
+    return now
+
+
+def test_rate_limiter_allows_burst(clock):
+    limiter = web.RateLimiter(rate=1, burst=3)
+    assert [limiter.reserve() for _ in range(3)] == [0, 0, 0]
+    assert limiter.reserve() == pytest.approx(1)
+    assert limiter.reserve() == pytest.approx(2)
+
+
+def test_rate_limiter_refills(clock):
+    limiter = web.RateLimiter(rate=2, burst=2)
+    limiter.reserve(2)
+    clock[0] += 0.5
+    assert limiter.reserve() == 0
+    assert limiter.reserve() == pytest.approx(0.5)
+
+
+def test_rate_limiter_acquire_sleeps(clock):
+    limiter = web.RateLimiter(rate=1, burst=1)
+    assert limiter.acquire() == 0
+    assert limiter.acquire() == pytest.approx(1)
+    assert clock[0] == pytest.approx(1001)
+
+
+def test_rate_limiter_state_shared_between_instances(clock, tmp_path):
+    state_file = tmp_path / "ratelimit.json"
+    first = web.RateLimiter(rate=1, burst=2, state_file=state_file)
+    second = web.RateLimiter(rate=1, burst=2, state_file=state_file)
+    first.reserve(2)
+    assert second.reserve() == pytest.approx(1)
+    first.set_cooldown("account", 60)
+    assert second.cooldown("account") == pytest.approx(60)
+
+
+def test_rate_limiter_cooldown_expires(clock):
+    limiter = web.RateLimiter()
+    limiter.set_cooldown("account", 30)
+    clock[0] += 10
+    assert limiter.cooldown("account") == pytest.approx(20)
+    clock[0] += 30
+    assert limiter.cooldown("account") == 0
+
+
+@pytest.mark.parametrize(
+    "fname,seconds",
+    [
+        ("correct.html", None),
+        ("already_complete.html", None),
+        ("incorrect.html", 60),
+        ("rate_limit.html", 56),
+    ],
+)
+def test_parse_wait_time(fname, seconds):
+    text = (TEST_DATA_DIR / "submission-responses" / fname).read_text()
+    assert web.parse_wait_time(text) == seconds
+
+
+@pytest.mark.parametrize(
+    "text,seconds",
+    [
+        ("You have 4m 32s left to wait.", 272),
+        ("please wait 5 minutes before trying again.", 300),
+    ],
+)
+def test_parse_wait_time_variants(text, seconds):
+    assert web.parse_wait_time(text) == seconds
+
+
+def test_submit_answer_records_cooldown(clock, responses, tmp_path):
+    puzzle_url = "https://adventofcode.com/2016/day/8"
+    responses.add(
+        responses.POST,
+        puzzle_url + "/answer",
+        body=(TEST_DATA_DIR / "submission-responses/rate_limit.html").read_text(),
+    )
+    s = web.session(
+        "12345",
+        limiter=web.RateLimiter(),
+        http_cache=HTTPCache(tmp_path / "http"),
+    )
+    web.submit_answer(s, puzzle_url, "1234", 1)
+    assert web.submission_cooldown(s) == pytest.approx(56)
+    # The next submission waits out the cooldown before sending the request
+    web.submit_answer(s, puzzle_url, "1234", 1)
+    assert clock[0] == pytest.approx(1056)
+
+
+@pytest.fixture
+def cached_session(tmp_path):
+    return web.session(
+        "12345",
+        limiter=web.RateLimiter(1000, 1000),
+        http_cache=HTTPCache(tmp_path / "http", ttl=60),
+    )
+
+
+def test_fetch_puzzle_page_served_from_cache(clock, cached_session, responses):
+    puzzle_url = "https://adventofcode.com/2019/day/1"
+    responses.add(responses.GET, puzzle_url, body="<article>part 1</article>")
+    assert web.fetch_puzzle_page(cached_session, puzzle_url) == (
+        "<article>part 1</article>"
+    )
+    clock[0] += 30
+    assert web.fetch_puzzle_page(cached_session, puzzle_url) == (
+        "<article>part 1</article>"
+    )
+    assert len(responses.calls) == 1
+
+
+def test_fetch_puzzle_page_revalidates(clock, cached_session, responses):
+    puzzle_url = "https://adventofcode.com/2019/day/1"
+    responses.add(
+        responses.GET,
+        puzzle_url,
+        body="page",
+        headers={"ETag": '"v1"', "Last-Modified": "Sun, 01 Dec 2019 05:00:00 GMT"},
+    )
+    responses.add(responses.GET, puzzle_url, status=304)
+    web.fetch_puzzle_page(cached_session, puzzle_url)
+    clock[0] += 120
+    assert web.fetch_puzzle_page(cached_session, puzzle_url) == "page"
+    request = responses.calls[1].request
+    assert request.headers["If-None-Match"] == '"v1"'
+    assert request.headers["If-Modified-Since"] == "Sun, 01 Dec 2019 05:00:00 GMT"
+    # Revalidation restarts the TTL
+    clock[0] += 30
+    web.fetch_puzzle_page(cached_session, puzzle_url)
+    assert len(responses.calls) == 2
+
+
+def test_submit_answer_invalidates_puzzle_page(clock, cached_session, responses):
+    puzzle_url = "https://adventofcode.com/2019/day/1"
+    responses.add(responses.GET, puzzle_url, body="part 1")
+    responses.add(
+        responses.POST,
+        puzzle_url + "/answer",
+        body=(TEST_DATA_DIR / "submission-responses/correct.html").read_text(),
+    )
+    responses.add(responses.GET, puzzle_url, body="part 1 part 2")
+    web.fetch_puzzle_page(cached_session, puzzle_url)
+    web.submit_answer(cached_session, puzzle_url, "1234", 1)
+    assert web.fetch_puzzle_page(cached_session, puzzle_url) == "part 1 part 2"